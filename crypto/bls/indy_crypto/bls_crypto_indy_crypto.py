@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from logging import getLogger
 from typing import Sequence, Optional
 
@@ -66,11 +67,17 @@ class BlsCryptoVerifierIndyCrypto(BlsCryptoVerifier):
         self._generator = \
             IndyCryptoBlsUtils.bls_from_str(params.g, Generator)  # type: Generator
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _ver_key_from_str(pk: str) -> Optional[VerKey]:
+        # Same keys of pool nodes are used to verify all signatures
+        return IndyCryptoBlsUtils.bls_from_str(pk, VerKey)
+
     def verify_sig(self, signature: str, message: bytes, pk: str) -> bool:
         bls_signature = IndyCryptoBlsUtils.bls_from_str(signature, Signature)
         if bls_signature is None:
             return False
-        bls_pk = IndyCryptoBlsUtils.bls_from_str(pk, VerKey)
+        bls_pk = self._ver_key_from_str(pk)
         if bls_pk is None:
             return False
         return Bls.verify(bls_signature,
@@ -79,7 +86,7 @@ class BlsCryptoVerifierIndyCrypto(BlsCryptoVerifier):
                           self._generator)
 
     def verify_multi_sig(self, signature: str, message: bytes, pks: Sequence[str]) -> bool:
-        epks = [IndyCryptoBlsUtils.bls_from_str(p, VerKey) for p in pks]
+        epks = [self._ver_key_from_str(p) for p in pks]
         if None in epks:
             return False
 
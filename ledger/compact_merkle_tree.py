@@ -1,6 +1,6 @@
 import functools
 from binascii import hexlify
-from typing import List, Tuple, Sequence
+from typing import List, Optional, Tuple, Sequence
 
 import ledger.merkle_tree as merkle_tree
 from ledger.hash_stores.hash_store import HashStore
@@ -159,30 +159,68 @@ class CompactMerkleTree(merkle_tree.MerkleTree):
         self._push_subtree([new_leaf])
         return auditPath
 
-    def extend(self, new_leaves: List[bytes]):
-        """Extend this tree with new_leaves on the end.
+    def append_hash(self, leaf_hash: bytes) -> List[bytes]:
+        """Append a leaf whose hash (as returned by `hash_leaf`) has already
+        been calculated and return the audit path"""
+        return self.extend_hashes([leaf_hash])[0]
 
-        The algorithm works by using _push_subtree() as a primitive, calling
-        it with the maximum number of allowed leaves until we can add the
-        remaining leaves as a valid entire (non-full) subtree in one go.
+    def hash_leaf(self, leaf: bytes) -> bytes:
+        return self.__hasher.hash_leaf(leaf)
+
+    def extend(self, new_leaves: List[bytes]) -> List[List[bytes]]:
+        """Extend this tree with new_leaves on the end and return the audit
+        path of each of the new leaves.
+
+        See `extend_hashes`.
         """
-        size = len(new_leaves)
-        final_size = self.tree_size + size
-        idx = 0
-        while True:
-            # keep pushing subtrees until mintree_size > remaining
-            max_h = self.__mintree_height
-            max_size = 1 << (max_h - 1) if max_h > 0 else 0
-            if max_h > 0 and size - idx >= max_size:
-                self._push_subtree(new_leaves[idx:idx + max_size])
-                idx += max_size
-            else:
-                break
-        # fill in rest of tree in one go, now that we can
-        if idx < size:
-            root_hash, hashes = self.__hasher._hash_full(new_leaves, idx, size)
-            self._update(final_size, self.hashes + hashes)
-        assert self.tree_size == final_size
+        return self.extend_hashes([self.__hasher.hash_leaf(leaf)
+                                   for leaf in new_leaves])
+
+    def extend_hashes(self, leaf_hashes: List[bytes],
+                      with_audit_paths: bool = True) -> List[List[bytes]]:
+        """Extend this tree with leaves whose hashes have already been
+        calculated and return the audit path of each of the new leaves.
+
+        Leaf and node hashes are accumulated while the tree is extended and
+        then written to the hash store with one bulk write for leaves and
+        one for nodes, instead of a write per hash. Audit paths are not
+        collected, and an empty list is returned, if `with_audit_paths` is
+        False.
+        """
+        proofs = self._extend_hashes(leaf_hashes, with_audit_paths, with_root_hashes=False)
+        return [audit_path for audit_path, _ in proofs]
+
+    def extend_hashes_with_roots(self, leaf_hashes: List[bytes]) -> List[Tuple[List[bytes], bytes]]:
+        """Same as `extend_hashes` but return the audit path of each of the
+        new leaves along with the root hash of the tree right after the leaf
+        was added.
+
+        Root hashes are folded from the subtree hashes the tree has after
+        the leaf is added, so subtrees merged when the leaf was pushed are
+        not hashed again.
+        """
+        return self._extend_hashes(leaf_hashes, with_audit_paths=True, with_root_hashes=True)
+
+    def _extend_hashes(self, leaf_hashes: List[bytes], with_audit_paths: bool,
+                       with_root_hashes: bool) -> List[Tuple[List[bytes], Optional[bytes]]]:
+        proofs = []
+        nodes = []
+        root_hash = None
+        for leaf_hash in leaf_hashes:
+            audit_path = list(reversed(self.__hashes)) if with_audit_paths else None
+            new_node_hashes = self.__push_subtree_hash(1, leaf_hash)
+            nodes.extend((self.tree_size, height, h)
+                         for h, height in new_node_hashes)
+            if with_root_hashes:
+                root_hash = self.__hasher._hash_fold(self.__hashes)
+            if with_audit_paths:
+                proofs.append((audit_path, root_hash))
+        if root_hash is not None:
+            self.__root_hash = root_hash
+        if self.hashStore:
+            self.hashStore.writeLeafs(leaf_hashes)
+            self.hashStore.writeNodes(nodes)
+        return proofs
 
     def extended(self, new_leaves: List[bytes]):
         """Returns a new tree equal to this tree extended with new_leaves."""
@@ -44,6 +44,20 @@ class FileHashStore(HashStore):
                     size, dataSize))
         store.put(key=None, value=data)
 
+    @staticmethod
+    def write_many(data, store, size):
+        # Entries are of fixed size without line separators, so all of them
+        # can be written to the file at once
+        data = [d if isinstance(d, bytes) else d.encode() for d in data]
+        for d in data:
+            if len(d) != size:
+                raise ValueError(
+                    "Data size not allowed. Size of the data should be "
+                    "{} but instead was {}".format(
+                        size, len(d)))
+        if data:
+            store.put(key=None, value=b''.join(data))
+
     @staticmethod
     def read(store: KeyValueStorageFile, entryNo, size):
         store.db_file.seek((entryNo - 1) * size)
@@ -72,6 +86,12 @@ class FileHashStore(HashStore):
     def writeLeaf(self, leafHash):
         self.write(leafHash, self.leavesFile, self.leafSize)
 
+    def writeNodes(self, nodes):
+        self.write_many([node[2] for node in nodes], self.nodesFile, self.nodeSize)
+
+    def writeLeafs(self, leafHashes):
+        self.write_many(leafHashes, self.leavesFile, self.leafSize)
+
     def readNode(self, pos):
         data = self.read(self.nodesFile, pos, self.nodeSize)
         if len(data) < self.nodeSize:
@@ -29,6 +29,24 @@ class HashStore:
         :param node: tuple of start, height and nodeHash
         """
 
+    def writeLeafs(self, leafHashes):
+        """
+        append multiple leafHashes to the leaf hash store
+
+        :param leafHashes: list of hashes of the leaves
+        """
+        for leafHash in leafHashes:
+            self.writeLeaf(leafHash)
+
+    def writeNodes(self, nodes):
+        """
+        append multiple nodes to the node hash store.
+
+        :param nodes: list of tuples of start, height and nodeHash
+        """
+        for node in nodes:
+            self.writeNode(node)
+
     @abstractmethod
     def readLeaf(self, pos):
         """
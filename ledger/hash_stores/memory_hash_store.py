@@ -16,6 +16,12 @@ class MemoryHashStore(HashStore):
     def writeNode(self, nodeHash):
         self._nodes.append(nodeHash)
 
+    def writeLeafs(self, leafHashes):
+        self._leafs.extend(leafHashes)
+
+    def writeNodes(self, nodes):
+        self._nodes.extend(nodes)
+
     def readLeaf(self, pos):
         return self._leafs[pos - 1]
 
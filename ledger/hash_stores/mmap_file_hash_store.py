@@ -0,0 +1,87 @@
+import mmap
+
+from ledger.hash_stores.file_hash_store import FileHashStore
+from storage.kv_store_file import KeyValueStorageFile
+
+
+class MmapFileHashStore(FileHashStore):
+    """
+    A FileHashStore which serves reads from memory mapped leaf and node
+    files, so reading a hash is a slice of the page cache instead of a `seek`
+    and a `read` syscall. The files have the same format as the ones of
+    FileHashStore, so both can be used over the same data.
+
+    The mapping only covers the file as it was when mapped, it is re-created
+    when an entry appended after that is requested.
+    """
+
+    def __init__(self, dataDir, fileNamePrefix="", leafSize=32, nodeSize=32):
+        self._maps = {}
+        super().__init__(dataDir, fileNamePrefix=fileNamePrefix,
+                         leafSize=leafSize, nodeSize=nodeSize)
+
+    def _map(self, store: KeyValueStorageFile, min_size):
+        mm = self._maps.get(store.db_path)
+        if mm is not None and len(mm) >= min_size:
+            return mm
+        self._unmap(store)
+        if store.db_file.seek(0, 2) < max(min_size, 1):
+            return None
+        mm = mmap.mmap(store.db_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[store.db_path] = mm
+        return mm
+
+    def _unmap(self, store: KeyValueStorageFile):
+        mm = self._maps.pop(store.db_path, None)
+        if mm is not None:
+            mm.close()
+
+    def read(self, store: KeyValueStorageFile, entryNo, size):
+        if entryNo < 1:
+            return b''
+        end = entryNo * size
+        mm = self._map(store, end)
+        if mm is None:
+            return b''
+        return mm[end - size:end]
+
+    def read_range(self, store: KeyValueStorageFile, startpos, endpos, size):
+        """
+        Read entries from `startpos` to `endpos` (both inclusive) as one
+        contiguous slice of the mapped file.
+        """
+        self._validatePos(startpos)
+        if endpos < startpos:
+            raise IndexError(
+                "start ({}) index must not be greater than end ({}) index"
+                .format(startpos, endpos))
+        mm = self._map(store, endpos * size)
+        if mm is None:
+            raise IndexError("No entries at positions {}-{}".format(startpos, endpos))
+        with memoryview(mm) as view:
+            with view[(startpos - 1) * size:endpos * size] as chunk:
+                return [chunk[i:i + size].tobytes()
+                        for i in range(0, len(chunk), size)]
+
+    def readLeafs(self, startpos, endpos):
+        return self.read_range(self.leavesFile, startpos, endpos, self.leafSize)
+
+    def readNodes(self, startpos, endpos):
+        return self.read_range(self.nodesFile, startpos, endpos, self.nodeSize)
+
+    def open(self):
+        self._unmap_all()
+        super().open()
+
+    def close(self):
+        self._unmap_all()
+        super().close()
+
+    def reset(self):
+        self._unmap_all()
+        return super().reset()
+
+    def _unmap_all(self):
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
@@ -1,5 +1,7 @@
 import logging
+import multiprocessing
 import time
+from collections import deque
 
 from common.exceptions import PlenumValueError
 from common.serializers.mapping_serializer import MappingSerializer
@@ -12,6 +14,26 @@ from ledger.util import F, ConsistencyVerificationFailed
 from storage.kv_store import KeyValueStorage
 from storage.helper import initKeyValueStorageIntKeys
 from plenum.common.config_util import getConfig
+from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollector, MetricsName
+
+
+def hash_txn_log_entries(entries, serializers=None, hasher=TreeHasher()):
+    """
+    Leaf hashes of transactions read from a transaction log. If serializers
+    are given as a (txn serializer, hash serializer) pair, transactions are
+    serialized for the tree first. This is a module level function so that
+    it can be run by worker processes.
+    """
+    leaf_hashes = []
+    for entry in entries:
+        if serializers:
+            txn_serializer, hash_serializer = serializers
+            entry = hash_serializer.serialize(txn_serializer.deserialize(entry),
+                                              toBytes=True)
+        if isinstance(entry, str):
+            entry = entry.encode()
+        leaf_hashes.append(hasher.hash_leaf(entry))
+    return leaf_hashes
 
 
 class Ledger(ImmutableStore):
@@ -38,7 +60,8 @@ class Ledger(ImmutableStore):
                  transactionLogStore: KeyValueStorage = None,
                  genesis_txn_initiator: GenesisTxnInitiator = None,
                  config=None,
-                 read_only=False):
+                 read_only=False,
+                 metrics: MetricsCollector = None):
         """
         :param tree: an implementation of MerkleTree
         :param dataDir: the directory where the transaction log is stored
@@ -46,6 +69,7 @@ class Ledger(ImmutableStore):
         it and storing it in the MerkleTree
         :param fileName: the name of the transaction log file
         :param genesis_txn_initiator: file or dir to use for initialization of transaction log store
+        :param metrics: collector of merkle tree recovery time and progress
         """
         self.genesis_txn_initiator = genesis_txn_initiator
 
@@ -53,6 +77,7 @@ class Ledger(ImmutableStore):
         self.tree = tree
         self.config = config or getConfig()
         self._read_only = read_only
+        self.metrics = metrics or NullMetricsCollector()
         self.txn_serializer = txn_serializer or ledger_txn_serializer  # type: MappingSerializer
         # type: MappingSerializer
         self.hash_serializer = hash_serializer or ledger_hash_serializer
@@ -89,6 +114,7 @@ class Ledger(ImmutableStore):
 
         end = time.perf_counter()
         t = end - start
+        self.metrics.add_event(MetricsName.LEDGER_RECOVERY_TIME, t)
         logging.info("Recovered tree in {} seconds".format(t))
 
     def recoverTreeFromTxnLog(self):
@@ -96,13 +122,48 @@ class Ledger(ImmutableStore):
         if not self._read_only:
             self.tree.reset()
         self.seqNo = 0
-        for key, entry in self._transactionLog.iterator():
-            if self.txn_serializer != self.hash_serializer:
-                entry = self.serialize_for_tree(
-                    self.txn_serializer.deserialize(entry))
-            if isinstance(entry, str):
-                entry = entry.encode()
-            self._addToTreeSerialized(entry)
+        log_size = self._transaction_log_size()
+        for leaf_hashes in self._hash_txn_log_chunks(log_size):
+            # Leaves and nodes of every chunk are written to hash store at once
+            self.tree.extend_hashes(leaf_hashes, with_audit_paths=False)
+            self.seqNo += len(leaf_hashes)
+            self.metrics.add_event(MetricsName.LEDGER_RECOVERY_TXNS_HASHED, len(leaf_hashes))
+            logging.info("Recovered {} of {} txns from transaction log".format(self.seqNo, log_size))
+
+    def _txn_log_chunks(self, chunk_size):
+        chunk = []
+        for _, entry in self._transactionLog.iterator():
+            chunk.append(entry)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _hash_txn_log_chunks(self, log_size):
+        chunk_size = self.config.LEDGER_RECOVERY_CHUNK_SIZE
+        processes = self.config.LEDGER_RECOVERY_PROCESSES
+        serializers = (self.txn_serializer, self.hash_serializer) \
+            if self.txn_serializer != self.hash_serializer else None
+        chunks = self._txn_log_chunks(chunk_size)
+
+        if not processes or log_size <= chunk_size:
+            for chunk in chunks:
+                yield hash_txn_log_entries(chunk, serializers, self.hasher)
+            return
+
+        # Workers are spawned rather than forked since ledgers can be
+        # recovered from several threads at once
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(hash_txn_log_entries,
+                                                (chunk, serializers, self.hasher)))
+                # Only a few chunks are read ahead of the tree being extended
+                if len(pending) > 2 * processes:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
 
     def recoverTreeFromHashStore(self):
         treeSize = self.tree.leafCount
@@ -110,7 +171,17 @@ class Ledger(ImmutableStore):
         hashes = list(reversed(self.tree.inclusion_proof(treeSize,
                                                          treeSize + 1)))
         self.tree._update(self.tree.leafCount, hashes)
-        self.tree.verify_consistency(self._transactionLog.size)
+        self.tree.verify_consistency(self._transaction_log_size())
+
+    def _transaction_log_size(self) -> int:
+        # Transactions are stored by consecutive seq nos starting from 1, so
+        # the last key is the number of them, which int keyed stores can
+        # tell without iterating over the whole log
+        try:
+            last_key = self._transactionLog.get_last_key()
+        except NotImplementedError:
+            return self._transactionLog.size
+        return int(last_key) if last_key is not None else 0
 
     def add(self, leaf):
         """
@@ -131,6 +202,43 @@ class Ledger(ImmutableStore):
 
         return merkle_info
 
+    def add_many(self, leaves):
+        """
+        Add multiple leaves (transactions) to the log and the merkle tree.
+
+        The transaction log is written with a single `setBatch` and the
+        merkle tree is extended at once, so the hash store gets one write for
+        all the leaves and one for all the nodes.
+
+        :return: list of merkle info of each of the leaves
+        """
+        serz_leaves = [self.serialize_for_txn_log(leaf) for leaf in leaves]
+        leaf_hashes = [self.tree.hash_leaf(self.serialize_for_tree(leaf))
+                       for leaf in leaves]
+        return self._add_many_serialized(serz_leaves, leaf_hashes)
+
+    def _add_many_serialized(self, serz_leaves, leaf_hashes):
+        start = self.seqNo + 1
+        self._transactionLog.setBatch(
+            [(str(seq_no), value)
+             for seq_no, value in enumerate(serz_leaves, start=start)])
+        proofs = self.tree.extend_hashes_with_roots(leaf_hashes)
+        # Consecutive leaves share most of their audit paths, so every
+        # distinct hash is encoded once for the whole batch
+        encoded = {}
+
+        def hash_to_str(h):
+            s = encoded.get(h)
+            if s is None:
+                s = encoded[h] = self.hashToStr(h)
+            return s
+
+        merkle_infos = []
+        for audit_path, root_hash in proofs:
+            self.seqNo += 1
+            merkle_infos.append(self._build_merkle_proof(audit_path, root_hash, hash_to_str))
+        return merkle_infos
+
     def _addToTree(self, leafData, serialized=False):
         serializedLeafData = self.serialize_for_tree(leafData) if \
             not serialized else leafData
@@ -146,11 +254,12 @@ class Ledger(ImmutableStore):
         self.seqNo += 1
         return self._build_merkle_proof(audit_path)
 
-    def _build_merkle_proof(self, audit_path):
+    def _build_merkle_proof(self, audit_path, root_hash=None, hash_to_str=None):
+        hash_to_str = hash_to_str or self.hashToStr
         return {
             F.seqNo.name: self.seqNo,
-            F.rootHash.name: self.hashToStr(self.tree.root_hash),
-            F.auditPath.name: [self.hashToStr(h) for h in audit_path]
+            F.rootHash.name: hash_to_str(root_hash or self.tree.root_hash),
+            F.auditPath.name: [hash_to_str(h) for h in audit_path]
         }
 
     def append(self, txn):
@@ -240,6 +349,17 @@ class Ledger(ImmutableStore):
             else:
                 break
 
+    def get_txns_with_size(self, frm: int = None, to: int = None):
+        """
+        Same as `getAllTxn`, but every txn comes along with the length of
+        its serialized form in the transaction log
+        """
+        for seq_no, txn in self._transactionLog.iterator(start=frm, end=to):
+            if to is None or int(seq_no) <= to:
+                yield (int(seq_no), self.txn_serializer.deserialize(txn), len(txn))
+            else:
+                break
+
     @staticmethod
     def hashToStr(h):
         if h is None:
@@ -165,6 +165,16 @@ class CompactMerkleTreeTest(unittest.TestCase):
             self.tree.extend(test_vector)
             self.assertEqual(self.tree.root_hash_hex, expected_hash)
 
+    def test_append_hash(self):
+        for i in range(len(TreeHasherTest.test_vector_leaves)):
+            test_vector = TreeHasherTest.test_vector_leaves[:i + 1]
+            expected_hash = TreeHasherTest.test_vector_hashes[i]
+            self.tree = compact_merkle_tree.CompactMerkleTree()
+            for leaf in test_vector:
+                self.tree.append_hash(self.tree.hash_leaf(leaf))
+            self.assertEqual(self.tree.root_hash_hex, expected_hash)
+            self.assertEqual(self.tree.leafCount, len(test_vector))
+
 
 class MerkleVerifierTest(unittest.TestCase):
     # (old_tree_size, new_tree_size, old_root, new_root, proof)
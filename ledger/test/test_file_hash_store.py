@@ -99,3 +99,20 @@ def testRandomAndRepeatedReads(nodesLeaves, tempdir):
     fhs.writeLeaf(leaves[-1])
     fhs.writeLeaf(leaves[0])
     assert leaves[idx] == fhs.readLeaf(idx + 1)
+
+
+def testBulkWrites(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = FileHashStore(tempdir)
+    fhs.writeLeafs(leaves)
+    fhs.writeNodes(nodes)
+
+    assert fhs.leafCount == len(leaves)
+    assert fhs.nodeCount == len(nodes)
+    for i, leaf in enumerate(leaves):
+        assert leaf == fhs.readLeaf(i + 1)
+    for i, node in enumerate(nodes):
+        assert node[2] == fhs.readNode(i + 1)
+
+    with pytest.raises(ValueError):
+        fhs.writeLeafs([leaves[0], b"less than 32"])
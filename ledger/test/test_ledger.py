@@ -8,11 +8,15 @@ from common.exceptions import PlenumValueError
 from common.serializers.compact_serializer import CompactSerializer
 from common.serializers.msgpack_serializer import MsgPackSerializer
 from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.ledger import Ledger
 from ledger.test.conftest import orderedFields
 from ledger.test.helper import NoTransactionRecoveryLedger, \
     check_ledger_generator, create_ledger_text_file_storage, create_default_ledger, random_txn
 from ledger.test.test_file_hash_store import generateHashes
 from ledger.util import ConsistencyVerificationFailed, F
+from plenum.common.metrics_collector import MetricsName
+from plenum.test.metrics.helper import MockMetricsCollector
 
 
 def b64e(s):
@@ -84,6 +88,22 @@ def test_query_merkle_info(ledger, genesis_txns, genesis_txn_file):
             sorted(ledger.merkleInfo(i + 1 + offset).items())
 
 
+def test_add_many_txns(ledger, genesis_txns, genesis_txn_file):
+    offset = len(genesis_txns) if genesis_txn_file else 0
+    ledger.add(random_txn(0))
+    txns = [random_txn(i) for i in range(1, 20)]
+    merkle_infos = ledger.add_many(txns)
+
+    assert ledger.size == 20 + offset
+    assert ledger.tree.hashStore.is_consistent
+    assert ledger.tree.root_hash == ledger.tree.merkle_tree_hash(0, ledger.size)
+    for i, (txn, mi) in enumerate(zip(txns, merkle_infos)):
+        seqNo = mi.pop(F.seqNo.name)
+        assert i + 2 + offset == seqNo
+        assert sorted(txn.items()) == sorted(ledger[seqNo].items())
+        assert sorted(mi.items()) == sorted(ledger.merkleInfo(seqNo).items())
+
+
 """
 If the server holding the ledger restarts, the ledger should be fully rebuilt
 from persisted data. Any incoming commands should be stashed. (Does this affect
@@ -117,6 +137,39 @@ def test_recover_merkle_tree_from_txn_log(create_ledger_callable, tempdir,
     assert tree_size_before == restartedLedger.tree.tree_size
 
 
+@pytest.mark.parametrize('processes', [0, 2])
+def test_recover_merkle_tree_from_txn_log_in_chunks(tempdir, monkeypatch, processes):
+    ledger = create_default_ledger(tempdir)
+    for d in range(20):
+        ledger.add(random_txn(d))
+    root_hash_before = ledger.root_hash
+    hashes_before = ledger.tree.hashes
+    ledger.tree.hashStore.reset()
+    ledger.stop()
+
+    monkeypatch.setattr(ledger.config, 'LEDGER_RECOVERY_CHUNK_SIZE', 3)
+    monkeypatch.setattr(ledger.config, 'LEDGER_RECOVERY_PROCESSES', processes)
+    metrics = MockMetricsCollector()
+    restarted_ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=tempdir)),
+                              dataDir=tempdir,
+                              metrics=metrics)
+
+    assert restarted_ledger.size == 20
+    assert restarted_ledger.root_hash == root_hash_before
+    assert restarted_ledger.tree.hashes == hashes_before
+    assert restarted_ledger.tree.leafCount == 20
+    assert restarted_ledger.tree.nodeCount == restarted_ledger.tree.get_expected_node_count(20)
+
+    metrics.flush_accumulated()
+    hashed = [event for event in metrics.events
+              if event.name == MetricsName.LEDGER_RECOVERY_TXNS_HASHED]
+    assert len(hashed) == 1
+    assert hashed[0].count == 7
+    assert hashed[0].sum == 20
+    assert any(event.name == MetricsName.LEDGER_RECOVERY_TIME for event in metrics.events)
+    restarted_ledger.stop()
+
+
 def test_recover_merkle_tree_from_hash_store(create_ledger_callable, tempdir,
                                              txn_serializer, hash_serializer, genesis_txn_file):
     ledger = create_ledger_callable(
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from ledger.test.helper import create_default_ledger
+
+"""
+Compares time of adding transactions to a ledger one by one and in batches
+(as committing does) for different batch sizes. Every measurement starts
+with a ledger having `INITIAL_SIZE` transactions, so that audit paths are of
+realistic length. These tests should only be run when a perf check is
+required by setting `SkipTests` to False.
+"""
+SkipTests = True
+skipper = pytest.mark.skipif(SkipTests, reason='Benchmark, run manually')
+
+INITIAL_SIZE = 100000
+BATCH_SIZES = (10, 100, 1000, 10000)
+
+
+def txn(i):
+    return {'identifier': 'cli{}'.format(i), 'reqId': i + 1, 'op': 'op{}'.format(i)}
+
+
+def measure_add(tempdir, batch_size, batched):
+    ledger = create_default_ledger(tempdir)
+    ledger.add_many([txn(i) for i in range(INITIAL_SIZE)])
+    txns = [txn(INITIAL_SIZE + i) for i in range(batch_size)]
+    start = time.perf_counter()
+    if batched:
+        merkle_infos = ledger.add_many(txns)
+    else:
+        merkle_infos = [ledger.add(txn) for txn in txns]
+    elapsed = time.perf_counter() - start
+    ledger.stop()
+    return elapsed, merkle_infos
+
+
+@skipper
+@pytest.mark.parametrize('batch_size', BATCH_SIZES)
+def test_batched_add_time(tmpdir_factory, batch_size, capsys):
+    one_by_one_time, one_by_one_infos = measure_add(tmpdir_factory.mktemp('').strpath,
+                                                    batch_size, batched=False)
+    batched_time, batched_infos = measure_add(tmpdir_factory.mktemp('').strpath,
+                                              batch_size, batched=True)
+    with capsys.disabled():
+        print('\nAdding {} txns to a ledger of {}: one by one {:.3f} s, '
+              'batched {:.3f} s'.format(batch_size, INITIAL_SIZE,
+                                        one_by_one_time, batched_time))
+    assert batched_infos == one_by_one_infos
+    assert batched_time < one_by_one_time
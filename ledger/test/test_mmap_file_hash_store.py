@@ -0,0 +1,95 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.hash_stores.mmap_file_hash_store import MmapFileHashStore
+from ledger.ledger import Ledger
+from ledger.test.helper import random_txn
+from ledger.test.test_file_hash_store import nodesLeaves, generateHashes
+
+
+def testReadWrite(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    hs = MmapFileHashStore(tempdir)
+    assert hs.is_persistent
+
+    hs.writeLeafs(leaves[:5])
+    hs.writeNodes(nodes[:5])
+    for i in range(5):
+        assert leaves[i] == hs.readLeaf(i + 1)
+        assert nodes[i][2] == hs.readNode(i + 1)
+
+    # Entries written after the files were mapped can be read too
+    hs.writeLeafs(leaves[5:])
+    hs.writeNodes(nodes[5:])
+    for i in range(len(leaves)):
+        assert leaves[i] == hs.readLeaf(i + 1)
+    for i in range(len(nodes)):
+        assert nodes[i][2] == hs.readNode(i + 1)
+
+    with pytest.raises(IndexError):
+        hs.readLeaf(len(leaves) + 1)
+    with pytest.raises(IndexError):
+        hs.readNode(0)
+
+
+def testReadRanges(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    hs = MmapFileHashStore(tempdir)
+    hs.writeLeafs(leaves)
+    hs.writeNodes(nodes)
+
+    assert hs.readLeafs(1, len(leaves)) == leaves
+    assert hs.readLeafs(3, 7) == leaves[2:7]
+    assert hs.readLeafs(4, 4) == [leaves[3]]
+    assert hs.readNodes(2, 5) == [n[2] for n in nodes[1:5]]
+
+    with pytest.raises(IndexError):
+        hs.readLeafs(5, len(leaves) + 1)
+    with pytest.raises(IndexError):
+        hs.readLeafs(5, 4)
+
+
+def testCompatibleWithFileHashStore(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = FileHashStore(tempdir)
+    fhs.writeLeafs(leaves)
+    fhs.writeNodes(nodes)
+    fhs.close()
+
+    hs = MmapFileHashStore(tempdir)
+    assert hs.leafCount == len(leaves)
+    assert hs.nodeCount == len(nodes)
+    assert hs.readLeafs(1, len(leaves)) == leaves
+    assert hs.readNodes(1, len(nodes)) == [n[2] for n in nodes]
+
+
+def testReset(tempdir):
+    hs = MmapFileHashStore(tempdir)
+    leaves = generateHashes(4)
+    hs.writeLeafs(leaves)
+    assert hs.readLeaf(4) == leaves[3]
+
+    hs.reset()
+    assert hs.leafCount == 0
+    with pytest.raises(IndexError):
+        hs.readLeaf(1)
+
+    hs.writeLeafs(leaves[:2])
+    assert hs.readLeafs(1, 2) == leaves[:2]
+
+
+def testLedgerWithMmapFileHashStore(tempdir):
+    ledger = Ledger(CompactMerkleTree(hashStore=MmapFileHashStore(tempdir)),
+                    dataDir=tempdir)
+    merkle_infos = ledger.add_many([random_txn(i) for i in range(20)])
+    for mi in merkle_infos:
+        seq_no = mi.pop('seqNo')
+        assert ledger.merkleInfo(seq_no) == mi
+    root_hash = ledger.root_hash
+    ledger.stop()
+
+    restarted = Ledger(CompactMerkleTree(hashStore=MmapFileHashStore(tempdir)),
+                       dataDir=tempdir)
+    assert restarted.size == 20
+    assert restarted.root_hash == root_hash
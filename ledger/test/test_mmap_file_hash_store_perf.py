@@ -0,0 +1,89 @@
+import os
+import random
+import time
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.hash_stores.mmap_file_hash_store import MmapFileHashStore
+
+"""
+Compares proof generation and range reads of FileHashStore and
+MmapFileHashStore over the same hash store files. Creating a hash store of
+`LEAF_COUNT` leaves takes several GB of disk space, so these tests
+should only be run when a perf check is required by setting `SkipTests` to
+False.
+"""
+SkipTests = True
+skipper = pytest.mark.skipif(SkipTests, reason='Benchmark, run manually')
+
+LEAF_COUNT = 10 * 1000 * 1000
+PROOF_COUNT = 1000
+RANGE_SIZE = 1000
+WRITE_CHUNK = 1000 * 1000
+
+
+@pytest.fixture(scope="module")
+def hash_store_dir(tmpdir_factory):
+    data_dir = tmpdir_factory.mktemp('').strpath
+    hs = FileHashStore(data_dir)
+    node_count = CompactMerkleTree.get_expected_node_count(LEAF_COUNT)
+    # Hashes are not consistent with each other, it does not matter for
+    # measuring the reads
+    for count, write in ((LEAF_COUNT, hs.writeLeafs),
+                         (node_count, lambda hashes: hs.writeNodes([(0, 0, h) for h in hashes]))):
+        written = 0
+        while written < count:
+            chunk = min(WRITE_CHUNK, count - written)
+            data = os.urandom(chunk * 32)
+            write([data[i:i + 32] for i in range(0, len(data), 32)])
+            written += chunk
+    hs.close()
+    return data_dir
+
+
+def measure_proofs(hash_store):
+    tree = CompactMerkleTree(hashStore=hash_store)
+    CompactMerkleTree.merkle_tree_hash.cache_clear()
+    rnd = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(PROOF_COUNT):
+        seq_no = rnd.randint(1, LEAF_COUNT)
+        tree.inclusion_proof(seq_no - 1, LEAF_COUNT)
+        tree.consistency_proof(seq_no, LEAF_COUNT)
+    return time.perf_counter() - start
+
+
+def measure_ranges(hash_store):
+    rnd = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(PROOF_COUNT):
+        frm = rnd.randint(1, LEAF_COUNT - RANGE_SIZE)
+        if isinstance(hash_store, MmapFileHashStore):
+            hash_store.readLeafs(frm, frm + RANGE_SIZE - 1)
+        else:
+            [hash_store.readLeaf(pos) for pos in range(frm, frm + RANGE_SIZE)]
+    return time.perf_counter() - start
+
+
+@skipper
+def test_proof_generation_time(hash_store_dir, capsys):
+    file_time = measure_proofs(FileHashStore(hash_store_dir))
+    mmap_time = measure_proofs(MmapFileHashStore(hash_store_dir))
+    with capsys.disabled():
+        print('\n{} inclusion and consistency proofs over {} leaves: '
+              'FileHashStore {:.3f} s, MmapFileHashStore {:.3f} s'
+              .format(PROOF_COUNT, LEAF_COUNT, file_time, mmap_time))
+    assert mmap_time < file_time
+
+
+@skipper
+def test_range_read_time(hash_store_dir, capsys):
+    file_time = measure_ranges(FileHashStore(hash_store_dir))
+    mmap_time = measure_ranges(MmapFileHashStore(hash_store_dir))
+    with capsys.disabled():
+        print('\n{} reads of {} consecutive leaves: '
+              'FileHashStore {:.3f} s, MmapFileHashStore {:.3f} s'
+              .format(PROOF_COUNT, RANGE_SIZE, file_time, mmap_time))
+    assert mmap_time < file_time
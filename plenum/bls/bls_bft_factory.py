@@ -26,7 +26,8 @@ class BlsFactoryBftPlenum(BlsFactoryBft):
         return BlsBftReplicaPlenum(self._node.name,
                                    self._node.bls_bft,
                                    is_master,
-                                   self._node.metrics)
+                                   self._node.metrics,
+                                   self._node.config.BLS_OPTIMISTIC_COMMIT_VALIDATION)
 
 
 def create_default_bls_bft_factory(node):
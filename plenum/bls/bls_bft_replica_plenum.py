@@ -19,13 +19,20 @@ class BlsBftReplicaPlenum(BlsBftReplica):
                  node_id,
                  bls_bft: BlsBft,
                  is_master,
-                 metrics: MetricsCollector = NullMetricsCollector()):
+                 metrics: MetricsCollector = NullMetricsCollector(),
+                 optimistic_commit_validation: bool = False):
         super().__init__(bls_bft, is_master)
         self.node_id = node_id
         self._signatures = {}
+        # Serialized values signed for batches, the same value is signed
+        # and verified for every COMMIT of a batch
+        self._signed_values = {}  # {key_3PC: (value params, serialized value)}
         self._bls_latest_multi_sig = None  # MultiSignature
         self.state_root_serializer = state_roots_serializer
         self.metrics = metrics
+        # Whether signatures of COMMITs are verified at once as a
+        # multi-signature when ordering rather than one by one
+        self._optimistic_commit_validation = optimistic_commit_validation
 
     def _can_process_ledger(self, ledger_id):
         # enable BLS for all ledgers
@@ -52,6 +59,10 @@ class BlsBftReplicaPlenum(BlsBftReplica):
             # TODO: It's optional for now
             return
 
+        if self._optimistic_commit_validation:
+            # Checked along with signatures of other COMMITs when ordering
+            return
+
         if not self._validate_signature(sender, commit.blsSig, pre_prepare):
             return BlsBftReplica.CM_BLS_SIG_WRONG
 
@@ -129,6 +140,12 @@ class BlsBftReplicaPlenum(BlsBftReplica):
         if not self._is_master:
             return
 
+        if self._optimistic_commit_validation:
+            # Only multi signatures to be saved are worth validating
+            bls_multi_sig = self._validate_calculated_multi_sig(key, quorums, pre_prepare, bls_multi_sig)
+            if bls_multi_sig is None:
+                return
+
         self._save_multi_sig_local(bls_multi_sig)
 
         self._bls_latest_multi_sig = bls_multi_sig
@@ -136,12 +153,13 @@ class BlsBftReplicaPlenum(BlsBftReplica):
     # ----GC----
 
     def gc(self, key_3PC):
-        keys_to_remove = []
-        for key in self._signatures.keys():
-            if compare_3PC_keys(key, key_3PC) >= 0:
-                keys_to_remove.append(key)
-        for key in keys_to_remove:
-            self._signatures.pop(key, None)
+        for collection in (self._signatures, self._signed_values):
+            keys_to_remove = []
+            for key in collection.keys():
+                if compare_3PC_keys(key, key_3PC) >= 0:
+                    keys_to_remove.append(key)
+            for key in keys_to_remove:
+                collection.pop(key, None)
 
     # ----MULT_SIG----
 
@@ -153,6 +171,18 @@ class BlsBftReplicaPlenum(BlsBftReplica):
                                               timestamp=pre_prepare.ppTime)
         return multi_sig_value
 
+    def _get_signed_value(self, pre_prepare: PrePrepare, pool_root_hash_ser) -> bytes:
+        key_3PC = (pre_prepare.viewNo, pre_prepare.ppSeqNo)
+        params = (pre_prepare.ledgerId, pre_prepare.stateRootHash, pool_root_hash_ser,
+                  pre_prepare.txnRootHash, pre_prepare.ppTime)
+        cached = self._signed_values.get(key_3PC)
+        if cached is not None and cached[0] == params:
+            return cached[1]
+        value = self._create_multi_sig_value_for_pre_prepare(pre_prepare,
+                                                             pool_root_hash_ser).as_single_value()
+        self._signed_values[key_3PC] = (params, value)
+        return value
+
     def validate_key_proof_of_possession(self, key_proof, pk):
         return self._bls_bft.bls_crypto_verifier\
             .verify_key_proof_of_possession(key_proof, pk)
@@ -164,9 +194,8 @@ class BlsBftReplicaPlenum(BlsBftReplica):
         if not pk:
             return False
         pool_root_hash_ser = self._get_pool_root_hash(pre_prepare)
-        message = self._create_multi_sig_value_for_pre_prepare(pre_prepare,
-                                                               pool_root_hash_ser)
-        result = self._bls_bft.bls_crypto_verifier.verify_sig(bls_sig, message.as_single_value(), pk)
+        message = self._get_signed_value(pre_prepare, pool_root_hash_ser)
+        result = self._bls_bft.bls_crypto_verifier.verify_sig(bls_sig, message, pk)
         if not result:
             logger.info("Incorrect bls signature {} in commit for "
                         "{} public key: '{}' and message: '{}' from "
@@ -189,10 +218,33 @@ class BlsBftReplicaPlenum(BlsBftReplica):
                                                                   value,
                                                                   public_keys)
 
+    def _validate_calculated_multi_sig(self, key_3PC, quorums, pre_prepare,
+                                       multi_sig: MultiSignature) -> Optional[MultiSignature]:
+        """
+        Verifies multi-signature calculated from signatures of COMMITs which
+        were not verified one by one. If it is wrong, every signature is
+        verified to find and drop the wrong ones, and multi-signature is
+        calculated once more if there are still enough of them.
+        """
+        if self._validate_multi_sig(multi_sig):
+            self.metrics.add_event(MetricsName.BLS_COMMIT_SIGS_FALLBACK, 0)
+            return multi_sig
+        self.metrics.add_event(MetricsName.BLS_COMMIT_SIGS_FALLBACK, 1)
+
+        sigs_for_request = self._signatures[key_3PC]
+        for node_name, bls_sig in list(sigs_for_request.items()):
+            if not self._validate_signature(node_name, bls_sig, pre_prepare):
+                logger.warning("{}{} found wrong BLS signature in COMMIT {} from {}"
+                               .format(BLS_PREFIX, self, key_3PC, node_name))
+                del sigs_for_request[node_name]
+
+        if not self._can_calculate_multi_sig(key_3PC, quorums):
+            return None
+        return self._calculate_multi_sig(key_3PC, pre_prepare)
+
     def _sign_state(self, pre_prepare: PrePrepare):
         pool_root_hash = self._get_pool_root_hash(pre_prepare)
-        message = self._create_multi_sig_value_for_pre_prepare(pre_prepare,
-                                                               pool_root_hash).as_single_value()
+        message = self._get_signed_value(pre_prepare, pool_root_hash)
         return self._bls_bft.bls_crypto_signer.sign(message)
 
     def _can_calculate_multi_sig(self,
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from logging import getLogger
 
 from crypto.bls.bls_key_register import BlsKeyRegister
@@ -8,12 +9,21 @@ logger = getLogger()
 
 
 class BlsKeyRegisterPoolManager(BlsKeyRegister):
+    # Number of pool states keys are cached for. Keys for a few states are
+    # needed at the same time, e.g. for the committed one and the one of the
+    # batch multi-signature was calculated for
+    KEYS_CACHE_SIZE = 8
+
     def __init__(self, node):
         self._node = node
         # since pool state isn't changed very often, we cache keys corresponded
-        # to the pool_state to not get them from the state trie each time
-        self._current_bls_keys = {}  # {node_name : BLS key}
-        self._current_pool_state_root_hash = None
+        # to the recent pool states to not get them from the state trie each time
+        self._bls_keys = OrderedDict()  # {pool_state_root_hash: {node_name : BLS key}}
+
+    @property
+    def _current_bls_keys(self):
+        # keys for the most recently used pool state
+        return next(reversed(self._bls_keys.values()), {})
 
     def get_pool_root_hash_committed(self):
         return self._node.poolManager.state.committedHeadHash
@@ -22,14 +32,16 @@ class BlsKeyRegisterPoolManager(BlsKeyRegister):
         if not pool_state_root_hash:
             pool_state_root_hash = self.get_pool_root_hash_committed()
 
-        if self._current_pool_state_root_hash != pool_state_root_hash:
-            self._current_pool_state_root_hash = pool_state_root_hash
-            self._load_keys_for_root(pool_state_root_hash)
+        keys = self._bls_keys.get(pool_state_root_hash)
+        if keys is None:
+            keys = self._load_keys_for_root(pool_state_root_hash)
+        else:
+            self._bls_keys.move_to_end(pool_state_root_hash)
 
-        return self._current_bls_keys.get(node_name, None)
+        return keys.get(node_name, None)
 
     def _load_keys_for_root(self, pool_state_root_hash):
-        self._current_bls_keys = {}
+        keys = {}
         for data in self._node.write_manager.get_all_node_data_for_root_hash(
                 pool_state_root_hash):
             node_name = data[ALIAS]
@@ -37,6 +49,12 @@ class BlsKeyRegisterPoolManager(BlsKeyRegister):
                 if not self._node.poolManager.config.VALIDATE_BLS_SIGNATURE_WITHOUT_KEY_PROOF and \
                         data.get(BLS_KEY_PROOF, None) is None:
                     logger.warning("{} has no proof of possession for BLS public key.".format(node_name))
-                    self._current_bls_keys[node_name] = None
+                    keys[node_name] = None
                 else:
-                    self._current_bls_keys[node_name] = data[BLS_KEY]
+                    keys[node_name] = data[BLS_KEY]
+
+        self._bls_keys.pop(pool_state_root_hash, None)
+        self._bls_keys[pool_state_root_hash] = keys
+        if len(self._bls_keys) > self.KEYS_CACHE_SIZE:
+            self._bls_keys.popitem(last=False)
+        return keys
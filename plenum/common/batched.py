@@ -1,4 +1,5 @@
 from collections import deque
+from functools import partial
 from typing import Any, Iterable, Dict
 
 from plenum.common.util import z85_to_friendly
@@ -13,6 +14,7 @@ from plenum.common.messages.node_messages import Batch
 from plenum.common.message_processor import MessageProcessor
 from stp_core.validators.message_length_validator import MessageLenValidator
 from stp_core.common.config.util import getConfig
+from stp_zmq.wire_codec import MsgPackWireCodec
 
 logger = getlogger()
 
@@ -70,21 +72,23 @@ class Batched(MessageProcessor):
         """
         # Signing (if required) and serializing before enqueueing otherwise
         # each call to `_enqueue` will have to sign it and `transmit` will try
-        # to serialize it which is waste of resources
-        message_parts, err_msg = \
-            self.prepare_for_sending(msg, signer, message_splitter)
-
-        # TODO: returning breaks contract of super class
-        if err_msg is not None:
-            return False, err_msg
-
-        if rids:
-            for r in rids:
-                for part in message_parts:
-                    self._enqueue(part, r, signer)
-        else:
-            for part in message_parts:
-                self._enqueueIntoAllRemotes(part, signer)
+        # to serialize it which is waste of resources. Remotes can use
+        # different codecs, so it is done once per codec.
+        rids = rids or list(self.remotes.keys())
+        parts_by_codec = {}
+        for codec in {self.codec_for(r) for r in rids} or {None}:
+            message_parts, err_msg = \
+                self.prepare_for_sending(msg, signer, message_splitter,
+                                         codec=codec)
+
+            # TODO: returning breaks contract of super class
+            if err_msg is not None:
+                return False, err_msg
+            parts_by_codec[codec] = message_parts
+
+        for r in rids:
+            for part in parts_by_codec[self.codec_for(r)]:
+                self._enqueue(part, r, signer)
         return True, None
 
     def flushOutBoxes(self) -> None:
@@ -94,20 +98,27 @@ class Batched(MessageProcessor):
         removedRemotes = []
         for rid, msgs in self.outBoxes.items():
             try:
-                dest = self.remotes[rid].name
+                remote = self.remotes[rid]
             except KeyError:
                 removedRemotes.append(rid)
                 continue
+            dest = remote.name
             if msgs:
+                codec = self.codec_for(rid)
+                if self.wire_codecs and codec is None:
+                    self._reencode_to_json(msgs)
                 if self._should_batch(msgs):
                     logger.trace(
                         "{} batching {} msgs to {} into fewer transmissions".
                         format(self, len(msgs), dest))
                     logger.trace("    messages: {}".format(msgs))
-                    batches = split_messages_on_batches(list(msgs),
-                                                        self._make_batch,
-                                                        self._test_batch_len,
-                                                        )
+                    if self.BINARY_BATCH_FEATURE in remote.features:
+                        batches = self._make_binary_batches(list(msgs))
+                    else:
+                        batches = split_messages_on_batches(list(msgs),
+                                                            partial(self._make_batch, codec=codec),
+                                                            self._test_batch_len,
+                                                            )
                     msgs.clear()
                     if batches:
                         for batch, size in batches:
@@ -146,14 +157,50 @@ class Batched(MessageProcessor):
                              logMethod=logger.debug)
             del self.outBoxes[rid]
 
-    def _make_batch(self, msgs):
+    def _make_batch(self, msgs, codec=None):
         if len(msgs) > 1:
             batch = Batch(msgs, None)
-            serialized_batch = self.sign_and_serialize(batch)
+            serialized_batch = self.sign_and_serialize(batch, codec=codec)
         else:
             serialized_batch = msgs[0]
         return serialized_batch
 
+    def _make_binary_batches(self, msgs):
+        """
+        Split serialized messages into binary batches not exceeding
+        the message length limit, each message is copied only once.
+
+        :return: list of tuples of a batch and number of messages in it
+        """
+        batches = []
+        batch_msgs = []
+        batch_msgs_len = 0
+        for msg in msgs:
+            if batch_msgs and not self._test_batch_len(
+                    self.binary_batch_len(batch_msgs_len + len(msg), len(batch_msgs) + 1)):
+                batches.append(batch_msgs)
+                batch_msgs = []
+                batch_msgs_len = 0
+            batch_msgs.append(msg)
+            batch_msgs_len += len(msg)
+        if batch_msgs:
+            batches.append(batch_msgs)
+        return [(self.pack_binary_batch(batch) if len(batch) > 1 else batch[0], len(batch))
+                for batch in batches]
+
+    def _reencode_to_json(self, msgs: deque):
+        """
+        Messages could have been serialized with another codec before
+        the remote stopped supporting it, e.g. after a reconnection
+        """
+        if not any(MsgPackWireCodec.is_encoded(m) for m in msgs):
+            return
+        reencoded = [self.serializeMsg(self.deserializeMsg(m))
+                     if MsgPackWireCodec.is_encoded(m) else m
+                     for m in msgs]
+        msgs.clear()
+        msgs.extend(reencoded)
+
     def _test_batch_len(self, batch_len):
         return self.msg_len_val.is_len_less_than_limit(batch_len)
 
@@ -163,7 +210,12 @@ class Batched(MessageProcessor):
                 # Removing ping and pong messages from Batch
                 relevantMsgs = []
                 for m in msg[f.MSGS.nm]:
-                    r = self.handlePingPong(m, frm, ident)
+                    if isinstance(m, bytes):
+                        # Batches serialized with a binary codec carry
+                        # messages as bytes
+                        m = self._decode_frame(m)
+                    r = self.handlePingPong(m, frm, ident) or \
+                        self.handleFeatures(m, ident)
                     if not r:
                         relevantMsgs.append(m)
 
@@ -173,12 +225,12 @@ class Batched(MessageProcessor):
         return msg
 
     def prepare_for_sending(self, msg, signer,
-                            message_splitter=lambda x: None):
+                            message_splitter=lambda x: None, codec=None):
         large_msg_parts = [msg]
         fine_msg_parts = []
         while len(large_msg_parts):
             part = large_msg_parts.pop()
-            part_bytes = self.sign_and_serialize(part, signer)
+            part_bytes = self.sign_and_serialize(part, signer, codec=codec)
             if self.msg_len_val.is_len_less_than_limit(len(part_bytes)):
                 fine_msg_parts.append(part_bytes)
                 continue
@@ -196,9 +248,9 @@ class Batched(MessageProcessor):
 
         return fine_msg_parts, None
 
-    def sign_and_serialize(self, msg, signer=None):
+    def sign_and_serialize(self, msg, signer=None, codec=None):
         payload = self.prepForSending(msg, signer)
-        msg_bytes = self.serializeMsg(payload)
+        msg_bytes = codec.encode(payload) if codec else self.serializeMsg(payload)
         return msg_bytes
 
     def _should_batch(self, msgs):
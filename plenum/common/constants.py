@@ -235,6 +235,7 @@ NODE_TXN_STORE_SUFFIX = "TS"
 NODE_HASH_STORE_SUFFIX = "HS"
 
 HS_FILE = "file"
+HS_MMAP_FILE = "mmap_file"
 HS_MEMORY = "memory"
 HS_LEVELDB = 'leveldb'
 HS_ROCKSDB = 'rocksdb'
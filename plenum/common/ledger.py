@@ -18,6 +18,16 @@ class Ledger(_Ledger):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        # Serialized form and leaf hash of every uncommitted txn, so that
+        # neither reverting nor committing has to serialize and hash them again
+        self._uncommitted_serialized = []
+        self._uncommitted_leaf_hashes = []
+        # Stack of (offset in `uncommittedTxns`, uncommitted tree before the
+        # txns starting at that offset were applied), one per appended batch
+        self._uncommitted_checkpoints = []
+        # Offset in `uncommittedTxns` of the first txn appended since
+        # `start_txns_batch`, None if no batch is started
+        self._txns_batch_start = None
 
     @property
     def uncommitted_size(self) -> int:
@@ -47,10 +57,11 @@ class Ledger(_Ledger):
             )
 
         uncommittedSize = self.size + len(self.uncommittedTxns)
-        self.uncommittedTree = self.treeWithAppliedTxns(txns,
-                                                        self.uncommittedTree)
-        self.uncommittedRootHash = self.uncommittedTree.root_hash
-        self.uncommittedTxns.extend(txns)
+        if self._txns_batch_start is None:
+            self._apply_uncommitted_txns(txns)
+        else:
+            # The tree is updated when the batch is finished
+            self.uncommittedTxns.extend(txns)
         if txns:
             return (uncommittedSize + 1, uncommittedSize + len(txns)), txns
         else:
@@ -64,6 +75,64 @@ class Ledger(_Ledger):
         merkle_info.pop(F.seqNo.name, None)
         return merkle_info
 
+    def add_many(self, txns):
+        for seq_no, txn in enumerate(txns, start=self.seqNo + 1):
+            if get_seq_no(txn) is None:
+                append_txn_metadata(txn, seq_no=seq_no)
+        merkle_infos = super().add_many(txns)
+        for merkle_info in merkle_infos:
+            merkle_info.pop(F.seqNo.name, None)
+        return merkle_infos
+
+    def start_txns_batch(self):
+        """
+        Start appending txns of a 3PC batch. Txns appended with `appendTxns`
+        get their seq nos and are in `uncommittedTxns` right away, but are
+        serialized and added to the uncommitted tree all at once by
+        `finish_txns_batch`, uncommitted root hash is not updated till then.
+        """
+        if self._txns_batch_start is not None:
+            raise LogicError("txns batch is already started")
+        self._txns_batch_start = len(self.uncommittedTxns)
+
+    def finish_txns_batch(self):
+        if self._txns_batch_start is None:
+            raise LogicError("txns batch is not started")
+        txns = self.uncommittedTxns[self._txns_batch_start:]
+        del self.uncommittedTxns[self._txns_batch_start:]
+        self._txns_batch_start = None
+        self._apply_uncommitted_txns(txns)
+
+    def _apply_uncommitted_txns(self, txns: List):
+        serialized = [self.serialize_for_tree(txn) for txn in txns]
+        leaf_hashes = [self.tree.hash_leaf(s) for s in serialized]
+        if txns:
+            self._uncommitted_checkpoints.append(
+                (len(self.uncommittedTxns), self.uncommittedTree or copy(self.tree)))
+        self.uncommittedTree = self.tree_with_applied_hashes(leaf_hashes,
+                                                              self.uncommittedTree)
+        self.uncommittedRootHash = self.uncommittedTree.root_hash
+        self.uncommittedTxns.extend(txns)
+        self._uncommitted_serialized.extend(serialized)
+        self._uncommitted_leaf_hashes.extend(leaf_hashes)
+
+    def add_many_hashed(self, txns: List, serialized: List, leaf_hashes: List):
+        """
+        Add txns having seq nos which were already serialized for the tree
+        and hashed, so that neither is done again.
+
+        :param serialized: txns serialized with `serialize_for_tree`
+        :param leaf_hashes: leaf hashes of `serialized`
+        :return: list of merkle info of each of the txns
+        """
+        if type(self.txn_serializer) is not type(self.hash_serializer) \
+                or not self._transactionLog.is_byte:
+            serialized = [self.serialize_for_txn_log(txn) for txn in txns]
+        merkle_infos = self._add_many_serialized(serialized, leaf_hashes)
+        for merkle_info in merkle_infos:
+            merkle_info.pop(F.seqNo.name, None)
+        return merkle_infos
+
     def _append_seq_no(self, txns, start_seq_no):
         # TODO: Fix name `start_seq_no`, it is misleading. The seq no start from `start_seq_no`+1
         seq_no = start_seq_no
@@ -80,16 +149,26 @@ class Ledger(_Ledger):
         numbers of the committed txns
         """
         committedSize = self.size
-        committedTxns = []
-        for txn in self.uncommittedTxns[:count]:
-            txn.update(self.append(txn))
-            committedTxns.append(txn)
+        committedTxns = self.uncommittedTxns[:count]
+        merkle_infos = self.add_many_hashed(committedTxns,
+                                            self._uncommitted_serialized[:count],
+                                            self._uncommitted_leaf_hashes[:count])
+        for txn, merkle_info in zip(committedTxns, merkle_infos):
+            txn.update(merkle_info)
         self.uncommittedTxns = self.uncommittedTxns[count:]
+        self._uncommitted_serialized = self._uncommitted_serialized[count:]
+        self._uncommitted_leaf_hashes = self._uncommitted_leaf_hashes[count:]
+        # Checkpoints of committed batches are not needed anymore, the
+        # committed tree is the base for the rest
+        self._uncommitted_checkpoints = [(offset - count, tree)
+                                         for offset, tree in self._uncommitted_checkpoints
+                                         if offset >= count]
         logger.debug('Committed {} txns, {} are uncommitted'.
                      format(len(committedTxns), len(self.uncommittedTxns)))
         if not self.uncommittedTxns:
             self.uncommittedTree = None
             self.uncommittedRootHash = None
+            self._uncommitted_checkpoints = []
         # Do not change `uncommittedTree` or `uncommittedRootHash`
         # if there are any `uncommittedTxns` since the ledger still has a
         # valid uncommittedTree and a valid root hash which are
@@ -106,26 +185,49 @@ class Ledger(_Ledger):
         :param count:
         :return:
         """
-        # TODO: This can be optimised if multiple discards are combined
-        # together since merkle root computation will be done only once.
         if count == 0:
             return
         if count > len(self.uncommittedTxns):
             raise LogicError("expected to revert {} txns while there are only {}".
                              format(count, len(self.uncommittedTxns)))
         old_hash = self.uncommittedRootHash
-        self.uncommittedTxns = self.uncommittedTxns[:-count]
+        new_len = len(self.uncommittedTxns) - count
+        self.uncommittedTxns = self.uncommittedTxns[:new_len]
+        self._uncommitted_serialized = self._uncommitted_serialized[:new_len]
+        self._uncommitted_leaf_hashes = self._uncommitted_leaf_hashes[:new_len]
         if not self.uncommittedTxns:
-            self.uncommittedTree = None
-            self.uncommittedRootHash = None
+            self.reset_uncommitted()
         else:
-            self.uncommittedTree = self.treeWithAppliedTxns(
-                self.uncommittedTxns)
+            self.uncommittedTree = self._restore_uncommitted_tree(new_len)
             self.uncommittedRootHash = self.uncommittedTree.root_hash
         logger.info('Discarding {} txns and root hash {} and new root hash is {}. {} are still uncommitted'.
                     format(count, Ledger.hashToStr(old_hash), Ledger.hashToStr(self.uncommittedRootHash),
                            len(self.uncommittedTxns)))
 
+    def _restore_uncommitted_tree(self, size):
+        """
+        Return the uncommitted tree containing the first `size` uncommitted
+        txns. The closest batch checkpoint is used, so only txns appended
+        after it (if any) have to be re-applied using cached leaf hashes.
+        """
+        checkpoints = self._uncommitted_checkpoints
+        while checkpoints and checkpoints[-1][0] > size:
+            checkpoints.pop()
+        if checkpoints and checkpoints[-1][0] == size:
+            return checkpoints.pop()[1]
+        offset, tree = checkpoints[-1] if checkpoints else (0, self.tree)
+        return self.tree_with_applied_hashes(self._uncommitted_leaf_hashes[offset:size], tree)
+
+    def tree_with_applied_hashes(self, leaf_hashes: List, currentTree=None):
+        """
+        Return a copy of merkle tree after applying leaves with the given
+        hashes (as returned by `tree.hash_leaf`)
+        """
+        currentTree = currentTree or self.tree
+        tempTree = copy(currentTree)
+        tempTree.extend_hashes(leaf_hashes)
+        return tempTree
+
     def treeWithAppliedTxns(self, txns: List, currentTree=None):
         """
         Return a copy of merkle tree after applying the txns
@@ -146,6 +248,10 @@ class Ledger(_Ledger):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        self._uncommitted_serialized = []
+        self._uncommitted_leaf_hashes = []
+        self._uncommitted_checkpoints = []
+        self._txns_batch_start = None
 
     def get_uncommitted_txns(self):
         return self.uncommittedTxns
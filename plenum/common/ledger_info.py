@@ -8,7 +8,8 @@ class LedgerInfo:
                  preCatchupStartClbk,
                  postCatchupCompleteClbk,
                  postTxnAddedToLedgerClbk,
-                 verifier):
+                 verifier,
+                 postTxnsAddedToLedgerClbk=None):
 
         self.id = id
         self.ledger = ledger
@@ -16,6 +17,9 @@ class LedgerInfo:
         self.preCatchupStartClbk = preCatchupStartClbk
         self.postCatchupCompleteClbk = postCatchupCompleteClbk
         self.postTxnAddedToLedgerClbk = postTxnAddedToLedgerClbk
+        # Optional, notifies of all txns of a catchup reply at once instead
+        # of calling `postTxnAddedToLedgerClbk` for each of them
+        self.postTxnsAddedToLedgerClbk = postTxnsAddedToLedgerClbk
         self.verifier = verifier
 
     @property
@@ -43,10 +43,10 @@ class LedgerManager:
         provider = CatchupNodeDataProvider(owner)
 
         self._client_seeder_inbox, rx = create_direct_channel()
-        self._client_seeder = ClientSeederService(rx, provider)
+        self._client_seeder = ClientSeederService(rx, provider, config)
 
         self._node_seeder_inbox, rx = create_direct_channel()
-        self._node_seeder = NodeSeederService(rx, provider)
+        self._node_seeder = NodeSeederService(rx, provider, config)
 
         leecher_outbox_tx, leecher_outbox_rx = create_direct_channel()
         router = Router(leecher_outbox_rx)
@@ -77,7 +77,8 @@ class LedgerManager:
     def addLedger(self, ledger_id: int, ledger: Ledger,
                   preCatchupStartClbk: Optional[Callable] = None,
                   postCatchupCompleteClbk: Optional[Callable] = None,
-                  postTxnAddedToLedgerClbk: Optional[Callable] = None):
+                  postTxnAddedToLedgerClbk: Optional[Callable] = None,
+                  postTxnsAddedToLedgerClbk: Optional[Callable] = None):
 
         if ledger_id in self.ledgerRegistry:
             logger.error("{} already present in ledgers so cannot replace that ledger".format(ledger_id))
@@ -90,6 +91,7 @@ class LedgerManager:
             postCatchupCompleteClbk=postCatchupCompleteClbk,
             postTxnAddedToLedgerClbk=postTxnAddedToLedgerClbk,
             verifier=MerkleVerifier(ledger.hasher),
+            postTxnsAddedToLedgerClbk=postTxnsAddedToLedgerClbk,
         )
 
         self._node_leecher.register_ledger(ledger_id)
@@ -1,7 +1,9 @@
 import ipaddress
 import json
+import math
 import re
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
 from typing import Iterable, Type
 
 import base58
@@ -79,11 +81,9 @@ class FieldBase(FieldValidator, metaclass=ABCMeta):
         """
 
     def __type_check(self, val):
-        if self._base_types is None:
-            return  # type check is disabled
-        for t in self._base_types:
-            if isinstance(val, t):
-                return
+        # type check is disabled when base types are None
+        if self._base_types is None or isinstance(val, self._base_types):
+            return
         return self._wrong_type_msg(val)
 
     def _wrong_type_msg(self, val):
@@ -350,6 +350,17 @@ class LedgerIdField(ChooseField):
         return VALID_LEDGER_IDS + tuple(PLUGIN_LEDGER_IDS)
 
 
+@lru_cache(maxsize=1024)
+def b58_decoded_length(val: str) -> int:
+    # Same roots, identifiers and keys are received in many messages
+    return len(base58.b58decode(val))
+
+
+def b58_max_encoded_length(byte_length: int) -> int:
+    # Leading zero bytes are encoded with a char each, the rest take less
+    return math.ceil(byte_length * math.log(256, 58))
+
+
 class Base58Field(FieldBase):
     _base_types = (str,)
     _alphabet = set(base58.alphabet.decode("utf-8"))
@@ -357,18 +368,23 @@ class Base58Field(FieldBase):
     def __init__(self, byte_lengths=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.byte_lengths = byte_lengths
+        # Longer values can not be valid, so they are not cached
+        self._max_cached_length = b58_max_encoded_length(max(byte_lengths, default=0)) \
+            if byte_lengths is not None else None
 
     def _specific_validation(self, val):
-        invalid_chars = set(val) - self._alphabet
-        if invalid_chars:
+        if not self._alphabet.issuperset(val):
+            invalid_chars = set(val) - self._alphabet
             # only 10 chars to shorten the output
             # TODO: Why does it need to be sorted
             to_print = sorted(invalid_chars)[:10]
             return 'should not contain the following chars {}{}'.format(
                 to_print, ' (truncated)' if len(to_print) < len(invalid_chars) else '')
         if self.byte_lengths is not None:
-            # TODO could impact performance, need to check
-            b58len = len(base58.b58decode(val))
+            if len(val) <= self._max_cached_length:
+                b58len = b58_decoded_length(val)
+            else:
+                b58len = len(base58.b58decode(val))
             if b58len not in self.byte_lengths:
                 return 'b58 decoded value length {} should be one of {}' \
                     .format(b58len, list(self.byte_lengths))
@@ -1,6 +1,5 @@
 from collections import OrderedDict
-from operator import itemgetter
-from typing import Mapping, Dict
+from typing import Mapping, Dict, Iterable, Tuple
 
 from plenum.common.types import f
 
@@ -9,12 +8,29 @@ from plenum.common.exceptions import MissingProtocolVersionError
 from plenum.common.messages.fields import FieldValidator
 
 
+class CompiledSchema:
+    """
+    Schema prepared for validation of messages: names of fields, required
+    ones and validators by field name are found once per schema rather than
+    for every validated message.
+    """
+
+    __slots__ = ('schema', 'names', 'required', 'validators')
+
+    def __init__(self, schema: Iterable[Tuple[str, FieldValidator]]):
+        self.schema = schema
+        self.names = tuple(name for name, _ in schema)
+        self.required = frozenset(name for name, field in schema if not field.optional)
+        self.validators = {name: field.validate for name, field in schema}
+
+
 class MessageValidator(FieldValidator):
     # the schema has to be an ordered iterable because the message class
     # can be create with positional arguments __init__(*args)
 
     schema = ()
     schema_is_strict = SCHEMA_IS_STRICT
+    _compiled_schema = None  # type: CompiledSchema
 
     def __init__(self, schema_is_strict=SCHEMA_IS_STRICT, optional: bool = False):
         self.schema_is_strict = schema_is_strict
@@ -25,21 +41,32 @@ class MessageValidator(FieldValidator):
         self._validate_fields_with_schema(dct, self.schema)
         self._validate_message(dct)
 
+    @property
+    def compiled_schema(self) -> CompiledSchema:
+        # Compiled schema is kept where the schema is: on the class, or on
+        # the instance if the schema was replaced in `__init__`
+        compiled = self._compiled_schema
+        if compiled is None or compiled.schema is not self.schema:
+            compiled = CompiledSchema(self.schema)
+            owner = type(self) if self.schema is type(self).schema else self
+            owner._compiled_schema = compiled
+        return compiled
+
     def _validate_fields_with_schema(self, dct, schema):
         if not isinstance(dct, dict):
             self._raise_invalid_type(dct)
-        schema_dct = dict(schema)
-        required_fields = filter(lambda x: not x[1].optional, schema)
-        required_field_names = map(lambda x: x[0], required_fields)
-        missed_required_fields = set(required_field_names) - set(dct)
+        compiled = self.compiled_schema if schema is self.schema else CompiledSchema(schema)
+        missed_required_fields = compiled.required.difference(dct)
         if missed_required_fields:
             self._raise_missed_fields(*missed_required_fields)
+        validators = compiled.validators
         for k, v in dct.items():
-            if k not in schema_dct:
+            validate = validators.get(k)
+            if validate is None:
                 if self.schema_is_strict:
                     self._raise_unknown_fields(k, v)
             else:
-                validation_error = schema_dct[k].validate(v)
+                validation_error = validate(v)
                 if validation_error:
                     self._raise_invalid_fields(k, v, validation_error)
 
@@ -105,11 +132,11 @@ class MessageBase(Mapping, MessageValidator):
 
         self._fields = OrderedDict(
             (name, input_as_dict[name])
-            for name, _ in self.schema
+            for name in self.compiled_schema.names
             if name in input_as_dict)
 
     def _join_with_schema(self, args):
-        return dict(zip(map(itemgetter(0), self.schema), args))
+        return dict(zip(self.compiled_schema.names, args))
 
     def _post_process(self, input_as_dict: Dict) -> Dict:
         return input_as_dict
@@ -1,5 +1,6 @@
 import functools
 import struct
+import threading
 import time
 
 from abc import ABC, abstractmethod
@@ -51,6 +52,12 @@ class MetricsName(IntEnum):
     CATCHUP_TXNS_SENT = 15
     # Number of txns received through catchup
     CATCHUP_TXNS_RECEIVED = 16
+    # Time request waited in replica queue before put in 3PC batch on master instance
+    REQUEST_QUEUE_WAIT_TIME = 17
+    # Time request waited in replica queue before put in 3PC batch on backup instances
+    BACKUP_REQUEST_QUEUE_WAIT_TIME = 18
+    # Time the oldest request in master replica queues has been waiting for
+    REQUEST_QUEUE_OLDEST_AGE = 19
 
     # Average throughput measured by monitor on backup instances
     BACKUP_MONITOR_AVG_THROUGHPUT = 20
@@ -96,6 +103,18 @@ class MetricsName(IntEnum):
     PROPAGATES_PHASE_REQ_TIMEOUTS = 75
     ORDERING_PHASE_REQ_TIMEOUTS = 76
     AUTH_RULES_FROM_STATE_COUNT = 77
+    # Decoded trie node cache hits and misses since previous flush
+    POOL_STATE_NODE_CACHE_HITS = 78
+    POOL_STATE_NODE_CACHE_MISSES = 79
+    DOMAIN_STATE_NODE_CACHE_HITS = 80
+    DOMAIN_STATE_NODE_CACHE_MISSES = 81
+    CONFIG_STATE_NODE_CACHE_HITS = 82
+    CONFIG_STATE_NODE_CACHE_MISSES = 83
+    # Time spent recovering merkle tree of a ledger on start
+    LEDGER_RECOVERY_TIME = 84
+    # Number of transactions hashed while rebuilding merkle tree of a
+    # ledger from its transaction log, reported for every chunk of them
+    LEDGER_RECOVERY_TXNS_HASHED = 85
 
     # Node service statistics
     NODE_PROD_TIME = 100
@@ -111,6 +130,10 @@ class MetricsName(IntEnum):
     SERVICE_CLIENT_STACK_TIME = 111
     SERVICE_MONITOR_ACTIONS_TIME = 112
     SERVICE_TIMERS_TIME = 113
+    # Delay between scheduled and actual run of timer callback, seconds
+    TIMER_CALLBACK_DELAY = 114
+    # Time spent running timer callback
+    TIMER_CALLBACK_TIME = 115
 
     # Node specific metrics
     SERVICE_NODE_STACK_TIME = 200
@@ -175,6 +198,9 @@ class MetricsName(IntEnum):
     BLS_VALIDATE_COMMIT_TIME = 4002
     BLS_UPDATE_PREPREPARE_TIME = 4010
     BLS_UPDATE_COMMIT_TIME = 4012
+    # Whether multi-signature of COMMITs verified when ordering was wrong
+    # and signatures were verified one by one (1) or not (0)
+    BLS_COMMIT_SIGS_FALLBACK = 4020
 
     # Obsolete metrics
     DESERIALIZE_DURING_UNPACK_TIME = 206
@@ -387,6 +413,31 @@ class NullMetricsCollector(MetricsCollector):
         pass
 
 
+class BufferedMetricsCollector(MetricsCollector):
+    """
+    Keeps events, which can be added from several threads at once, to be
+    added to another collector by a single thread with `flush_to`
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._events = []
+        self._lock = threading.Lock()
+
+    def add_event(self, name: MetricsName, value: float):
+        with self._lock:
+            self._events.append((name, value))
+
+    def store_event(self, name: MetricsName, value: Union[float, ValueAccumulator]):
+        self.add_event(name, value)
+
+    def flush_to(self, metrics: MetricsCollector):
+        with self._lock:
+            events, self._events = self._events, []
+        for name, value in events:
+            metrics.add_event(name, value)
+
+
 class KvStoreMetricsFormat:
     key_bits = 64
     ts_bits = 53
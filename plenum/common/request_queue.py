@@ -0,0 +1,67 @@
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Iterable, Optional, Tuple
+
+
+class RequestQueue:
+    """
+    Digests of requests waiting to be put in a 3PC batch, in order they
+    became ready for 3PC. Adding, checking, removing a digest and taking
+    the oldest one are all O(1), time a request was added at is kept to
+    tell how long it waits.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), get_current_time: Callable[[], float] = None):
+        self._get_current_time = get_current_time or time.perf_counter
+        self._keys = OrderedDict()  # digest -> time it was added at
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: str):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self._keys)
+        if not 0 <= index < len(self._keys):
+            raise IndexError('request queue index out of range')
+        return next(islice(self._keys, index, None))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, list(self._keys))
+
+    def add(self, key: str):
+        if key not in self._keys:
+            self._keys[key] = self._get_current_time()
+
+    def remove(self, key: str):
+        del self._keys[key]
+
+    def discard(self, key: str):
+        self._keys.pop(key, None)
+
+    def discard_many(self, keys: Iterable[str]):
+        for key in keys:
+            self._keys.pop(key, None)
+
+    def pop(self) -> Tuple[str, float]:
+        """
+        Remove the oldest request, returns its digest and time it waited for
+        """
+        key, added_at = self._keys.popitem(last=False)
+        return key, self._get_current_time() - added_at
+
+    def oldest_age(self) -> Optional[float]:
+        if not self._keys:
+            return None
+        return self._get_current_time() - next(iter(self._keys.values()))
+
+    def clear(self):
+        self._keys.clear()
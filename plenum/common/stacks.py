@@ -15,6 +15,7 @@ from stp_core.common.constants import CONNECTION_PREFIX
 from stp_core.types import HA
 from stp_zmq.kit_zstack import KITZStack
 from stp_zmq.simple_zstack import SimpleZStack
+from stp_zmq.wire_codec import MsgPackWireCodec
 
 # conf_ = getConfigOnce()
 conf_ = get_global_config_else_read_config()
@@ -178,6 +179,10 @@ class NodeZStack(Batched, KITZStack):
         MessageProcessor.__init__(self, allowDictOnly=False)
         self.listenerQuota = config.NODE_TO_NODE_STACK_QUOTA
         self.listenerSize = config.NODE_TO_NODE_STACK_SIZE
+        if config.ENABLE_BINARY_BATCHES:
+            self.supported_features.add(self.BINARY_BATCH_FEATURE)
+        if config.ENABLE_MSGPACK_WIRE_CODEC:
+            self.add_wire_codec(MsgPackWireCodec())
 
     # TODO: Reconsider defaulting `reSetupAuth` to True.
     def start(self, restricted=None, reSetupAuth=True):
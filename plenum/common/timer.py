@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 from functools import wraps
-from typing import Callable, NamedTuple
+from heapq import heappush, heappop, heapify
+from itertools import count
+from typing import Callable, Dict, List, Optional
 
 import time
 
-from sortedcontainers import SortedListWithKey
+from plenum.common.metrics_collector import MetricsCollector, NullMetricsCollector, MetricsName
 
 
 class TimerService(ABC):
@@ -13,7 +15,7 @@ class TimerService(ABC):
         pass
 
     @abstractmethod
-    def schedule(self, delay: int, callback: Callable):
+    def schedule(self, delay: int, callback: Callable, coalesce: bool = False):
         pass
 
     @abstractmethod
@@ -21,37 +23,129 @@ class TimerService(ABC):
         pass
 
 
+class TimerEvent:
+    """
+    Callback scheduled by `QueueTimer`, serves as a handle to cancel it.
+    Events are ordered by timestamp, events with same timestamp are run
+    in order they were scheduled. Cancelling an event which has already
+    fired does nothing.
+    """
+
+    __slots__ = ('timestamp', 'callback', 'cancelled', 'fired', '_seq_no', '_timer')
+
+    def __init__(self, timestamp: float, callback: Callable, seq_no: int, timer: 'QueueTimer'):
+        self.timestamp = timestamp
+        self.callback = callback
+        self.cancelled = False
+        self.fired = False
+        self._seq_no = seq_no
+        self._timer = timer
+
+    def cancel(self):
+        if not (self.cancelled or self.fired):
+            self._timer._cancel_event(self)
+
+    def __lt__(self, other: 'TimerEvent'):
+        return (self.timestamp, self._seq_no) < (other.timestamp, other._seq_no)
+
+    def __repr__(self):
+        return 'TimerEvent(timestamp={}, callback={}, cancelled={}, fired={})' \
+            .format(self.timestamp, self.callback, self.cancelled, self.fired)
+
+
 class QueueTimer(TimerService):
-    TimerEvent = NamedTuple('TimerEvent', [('timestamp', float), ('callback', Callable)])
+    # Cancelled events are left in queue until popped, queue is rebuilt
+    # once they make up most of it
+    COMPACT_MIN_SIZE = 64
 
-    def __init__(self, get_current_time=time.perf_counter):
+    def __init__(self, get_current_time=time.perf_counter,
+                 metrics: MetricsCollector = NullMetricsCollector()):
         self._get_current_time = get_current_time
-        self._events = SortedListWithKey(key=lambda v: v.timestamp)
+        self._metrics = metrics
+        self._events = []  # type: List[TimerEvent]
+        self._pending = {}  # type: Dict[Callable, List[TimerEvent]]
+        self._cancelled_count = 0
+        self._seq_no = count()
 
     def queue_size(self):
-        return len(self._events)
+        return len(self._events) - self._cancelled_count
 
     def service(self):
-        while len(self._events) and self._next_timestamp() <= self._get_current_time():
-            self._pop_event().callback()
+        while self.queue_size():
+            now = self._get_current_time()
+            if self._next_timestamp() > now:
+                break
+            event = self._pop_event()
+            self._metrics.add_event(MetricsName.TIMER_CALLBACK_DELAY, now - event.timestamp)
+            with self._metrics.measure_time(MetricsName.TIMER_CALLBACK_TIME):
+                event.callback()
 
     def get_current_time(self) -> float:
         return self._get_current_time()
 
-    def schedule(self, delay: float, callback: Callable):
+    def schedule(self, delay: float, callback: Callable, coalesce: bool = False) -> TimerEvent:
+        """
+        Schedule callback to be run after delay, returned event can be used
+        to cancel it. When `coalesce` is set and same callback is already
+        scheduled no later than requested it is not scheduled once more,
+        otherwise already scheduled ones are replaced by the new one.
+        """
         timestamp = self._get_current_time() + delay
-        self._events.add(self.TimerEvent(timestamp=timestamp, callback=callback))
+        pending = self._pending.get(callback)
+        if coalesce and pending:
+            earliest = min(pending)
+            if earliest.timestamp <= timestamp:
+                return earliest
+            self.cancel(callback)
+
+        event = TimerEvent(timestamp, callback, next(self._seq_no), self)
+        heappush(self._events, event)
+        self._pending.setdefault(callback, []).append(event)
+        return event
 
     def cancel(self, callback: Callable):
-        indexes = [i for i, ev in enumerate(self._events) if ev.callback == callback]
-        for i in reversed(indexes):
-            del self._events[i]
+        for event in self._pending.pop(callback, ()):
+            self._mark_cancelled(event)
+        self._compact()
+
+    def _cancel_event(self, event: TimerEvent):
+        self._unlink_event(event)
+        self._mark_cancelled(event)
+        self._compact()
+
+    def _mark_cancelled(self, event: TimerEvent):
+        event.cancelled = True
+        self._cancelled_count += 1
+
+    def _unlink_event(self, event: TimerEvent):
+        pending = self._pending[event.callback]
+        pending.remove(event)
+        if not pending:
+            del self._pending[event.callback]
+
+    def _compact(self):
+        if len(self._events) < self.COMPACT_MIN_SIZE or \
+                2 * self._cancelled_count < len(self._events):
+            return
+        self._events = [ev for ev in self._events if not ev.cancelled]
+        heapify(self._events)
+        self._cancelled_count = 0
+
+    def _drop_cancelled_head(self):
+        while self._events and self._events[0].cancelled:
+            heappop(self._events)
+            self._cancelled_count -= 1
 
-    def _next_timestamp(self):
-        return self._events[0].timestamp
+    def _next_timestamp(self) -> Optional[float]:
+        self._drop_cancelled_head()
+        return self._events[0].timestamp if self._events else None
 
     def _pop_event(self) -> TimerEvent:
-        return self._events.pop(0)
+        self._drop_cancelled_head()
+        event = heappop(self._events)
+        event.fired = True
+        self._unlink_event(event)
+        return event
 
 
 class RepeatingTimer:
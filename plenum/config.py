@@ -46,11 +46,16 @@ stateSignatureDbName = 'state_signature'
 # There is only one seqNoDB as it maintain the mapping of
 # request id to sequence numbers
 seqNoDbName = 'seq_no_db'
+# Number of recently looked up or added payload digests kept in memory
+# by seqNoDB
+seqNoDbCacheSize = 10000
 
 nodeStatusDbName = 'node_status_db'
 
 clientBootStrategy = ClientBootStrategy.PoolTxn
 
+# One of HS_ROCKSDB, HS_LEVELDB, HS_FILE or HS_MMAP_FILE (the file hash
+# store serving reads from memory mapped files)
 hashStore = {
     "type": HS_ROCKSDB
 }
@@ -65,6 +70,10 @@ nodeStatusStorage = KeyValueStorageType.Rocksdb
 
 stateSignatureStorage = KeyValueStorageType.Rocksdb
 
+# Number of decoded trie nodes kept in memory by each of pool, domain and
+# config states, 0 disables the cache
+stateTrieNodeCacheSize = 10000
+
 transactionLogDefaultStorage = KeyValueStorageType.Rocksdb
 
 rocksdb_default_config = {
@@ -227,6 +236,10 @@ logRotationMaxBytes = 100 * 1024 * 1024
 logRotationCompression = "xz"
 logFormat = '{asctime:s}|{levelname:s}|{filename:s}|{message:s}'
 logFormatStyle = '{'
+# Write log records in a background thread, records logged while
+# logAsyncQueueSize of them are waiting to be written are dropped
+logAsync = False
+logAsyncQueueSize = 10000
 logLevel = logging.NOTSET
 enableStdOutLogging = True
 
@@ -244,6 +257,19 @@ ExpectedConnectTime = 3.3 if sys.platform == 'win32' else 2
 # repository
 EnsureLedgerDurability = False
 
+# Ledgers are independent, so they are opened and their merkle trees are
+# recovered concurrently on node start
+LEDGER_RECOVERY_PARALLEL = True
+# Number of transactions read, deserialized and hashed at once when a
+# merkle tree is rebuilt from a transaction log
+LEDGER_RECOVERY_CHUNK_SIZE = 10000
+# Number of worker processes hashing transactions when a merkle tree is
+# rebuilt from a transaction log, 0 to hash them in the node process. Every
+# ledger being rebuilt gets its own processes, which are spawned, so they
+# import the main module of the node process: it has to start the node only
+# under `if __name__ == '__main__'`.
+LEDGER_RECOVERY_PROCESSES = 0
+
 log_override_tags = dict(cli={}, demo={})
 
 # Number of messages zstack accepts at once
@@ -280,6 +306,35 @@ CLIENT_REPLY_TIMEOUT = 15
 CLIENT_MAX_RETRY_ACK = 5
 CLIENT_MAX_RETRY_REPLY = 5
 
+# Number of threads verifying signatures of client requests off the looper,
+# 0 means signatures are verified on the looper right when received.
+# Requests are given to the threads in batches of at most
+# CLIENT_SIG_VERIFICATION_BATCH_SIZE requests. Once
+# CLIENT_SIG_VERIFICATION_MAX_PENDING requests wait for verification,
+# signatures of new ones are verified on the looper.
+CLIENT_SIG_VERIFICATION_WORKERS = 0
+CLIENT_SIG_VERIFICATION_BATCH_SIZE = 100
+CLIENT_SIG_VERIFICATION_MAX_PENDING = 10000
+
+# Number of processes serving GET_TXN and other read requests off the looper
+# from read only views of ledgers, states and storages, 0 means reads are
+# served by the node itself. Only views a request needs are opened, they are
+# reopened once node has committed more to their ledger, but at most once in
+# READ_REPLICA_REFRESH_INTERVAL seconds, so replies can lag behind committed
+# data by that much. A process with READ_REPLICA_MAX_PENDING requests in
+# progress gets no more requests, they are served by the node meanwhile.
+# Needs storages which can be opened read only by several processes at once,
+# that is RocksDB.
+READ_REPLICAS = 0
+READ_REPLICA_REFRESH_INTERVAL = 1
+READ_REPLICA_MAX_PENDING = 100
+
+# Number of recently committed transactions of every ledger kept in memory
+# to reply to resent requests and GET_TXN for them without reading ledger,
+# each is kept for at most REPLY_CACHE_TTL seconds. 0 disables the cache.
+REPLY_CACHE_SIZE = 1000
+REPLY_CACHE_TTL = 600
+
 # Connections tracking and stack restart parameters.
 # NOTE: TRACK_CONNECTED_CLIENTS_NUM_ENABLED must be set to True
 # if CLIENT_STACK_RESTART_ENABLED is set to True as stack restart
@@ -338,6 +393,12 @@ ENABLED_PLUGINS = []
 # 2 during replay
 STACK_COMPANION = 0
 
+# Recorder keeps up to RECORDER_BUFFER_SIZE recorded messages in memory
+# and writes them in background every RECORDER_FLUSH_INTERVAL seconds,
+# 0 makes it write every message to disk when it is recorded
+RECORDER_BUFFER_SIZE = 100000
+RECORDER_FLUSH_INTERVAL = 1
+
 ENABLE_INCONSISTENCY_WATCHER_NETWORK = True
 
 METRICS_COLLECTOR_TYPE = None  # None or 'kv'
@@ -362,6 +423,12 @@ ACC_MONITOR_INPUT_RATE_REACTION_HALF_TIME = 300
 
 VALIDATE_BLS_SIGNATURE_WITHOUT_KEY_PROOF = True
 
+# Whether BLS signatures of COMMITs are not verified one by one, but all at
+# once as a multi-signature when a batch is ordered. Signatures are verified
+# one by one only when the multi-signature turns out to be wrong, wrong ones
+# are dropped then.
+BLS_OPTIMISTIC_COMMIT_VALIDATION = False
+
 VALIDATOR_INFO_USE_DB = False
 VALIDATOR_INFO_UPGRADE_LOG_SIZE = 10
 
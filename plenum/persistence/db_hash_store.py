@@ -44,6 +44,15 @@ class DbHashStore(HashStore):
         seqNo = self.getNodePosition(start, height)
         self.nodesDb.put(str(seqNo), nodeHash)
 
+    def writeLeafs(self, leafHashes):
+        self.leavesDb.setBatch([(str(seqNo), leafHash)
+                                for seqNo, leafHash in enumerate(leafHashes, start=self.leafCount + 1)])
+        self.leafCount += len(leafHashes)
+
+    def writeNodes(self, nodes):
+        self.nodesDb.setBatch([(str(self.getNodePosition(start, height)), nodeHash)
+                               for start, height, nodeHash in nodes])
+
     def readLeaf(self, seqNo):
         return self._readOne(seqNo, self.leavesDb)
 
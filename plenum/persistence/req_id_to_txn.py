@@ -1,8 +1,7 @@
-import string
+import struct
+from collections import OrderedDict
+from typing import Optional, Tuple
 
-from collections import Iterable
-
-from common.exceptions import LogicError
 from storage.kv_store import KeyValueStorage
 
 
@@ -13,57 +12,104 @@ class ReqIdrToTxn:
     """
     delimiter = "~"
 
-    def __init__(self, keyValueStorage: KeyValueStorage):
+    # Values are stored as a version byte followed by big-endian ledger id
+    # and seq no. Values written in the older `ledger_id~seq_no` format
+    # always start with an ASCII digit, so both can be told apart.
+    VALUE_VERSION = b'\x01'
+    VALUE_FORMAT = struct.Struct('>IQ')
+
+    CACHE_SIZE = 10000
+
+    def __init__(self, keyValueStorage: KeyValueStorage, cache_size: int = CACHE_SIZE):
         self._keyValueStorage = keyValueStorage
+        # Recently added or looked up payload digests, including ones not
+        # found, since most of lookups are duplicate checks for new requests
+        self._cache = OrderedDict()  # {payload_digest: (ledger_id, seq_no)}
+        self._cache_size = cache_size
+        # Number of keys in storage, counted on first request of size
+        self._size = None
 
     def add(self, payload_digest, ledger_id, seq_no, digest):
-        self._keyValueStorage.put(payload_digest, self._create_value(ledger_id, seq_no))
-        if digest is not None:
-            self._keyValueStorage.put(self._full_digest_key(digest), payload_digest)
+        self.addBatch([(payload_digest, ledger_id, seq_no, digest)])
 
     def addBatch(self, batch, full_digest: bool = True):
-        payload = []
-        full = []
+        values = OrderedDict()
+        added = []
+        new_keys = 0
         for payload_digest, ledger_id, seq_no, digest in batch:
-            payload.append((payload_digest, self._create_value(ledger_id,
-                                                               seq_no)))
-            if digest is not None:
-                full.append((self._full_digest_key(digest), str(payload_digest)))
-        self._keyValueStorage.setBatch(payload)
-        if full_digest:
-            self._keyValueStorage.setBatch(full)
-
-    def get_by_payload_digest(self, payload_digest):
+            payload_digest = str(payload_digest)
+            ledger_id, seq_no = int(ledger_id), int(seq_no)
+            # Keys of a digest are new unless it is known to be stored
+            is_new = payload_digest not in values and not self._is_stored(payload_digest)
+            values[payload_digest] = self._create_value(ledger_id, seq_no)
+            added.append((payload_digest, (ledger_id, seq_no)))
+            if full_digest and digest is not None:
+                values[self._full_digest_key(digest)] = payload_digest
+                new_keys += is_new
+            new_keys += is_new
+        if self._size is not None:
+            self._size += new_keys
+        # Both kinds of keys are written at once
+        self._keyValueStorage.setBatch(values.items())
+        for payload_digest, value in added:
+            self._cache_put(payload_digest, value)
+
+    def get_by_payload_digest(self, payload_digest) -> Tuple[Optional[int], Optional[int]]:
+        result = self._cache.get(payload_digest)
+        if result is not None:
+            self._cache.move_to_end(payload_digest)
+            return result
         try:
             val = self._keyValueStorage.get(payload_digest)
-            val = val.decode()
             result = self._parse_value(val)
-            if not isinstance(result, Iterable) or len(result) != 2:
-                raise LogicError('SeqNoDB must store payload_digest => ledger_id and seq_no')
-            return result
-        except (KeyError, ValueError):
-            return None, None
+        except (KeyError, ValueError, struct.error):
+            result = None, None
+        else:
+            if val[:1] != self.VALUE_VERSION:
+                # Value in the older format is rewritten the first time it is read
+                self._keyValueStorage.put(payload_digest, self._create_value(*result))
+        self._cache_put(payload_digest, result)
+        return result
 
     def get_by_full_digest(self, full_digest):
         try:
             val = self._keyValueStorage.get(self._full_digest_key(full_digest))
-            result = val.decode()
-            if not isinstance(result, str):
-                raise LogicError('SeqNoDB must store full_digest => payload_digest')
-            return result
+            return val.decode()
         except (KeyError, ValueError):
             return None
 
-    def _parse_value(self, val: string):
-        parse_data = val.split(self.delimiter)
+    def _parse_value(self, val: bytes) -> Tuple[int, int]:
+        if val[:1] == self.VALUE_VERSION:
+            return self.VALUE_FORMAT.unpack_from(val, 1)
+        parse_data = val.decode().split(self.delimiter)
+        if len(parse_data) != 2:
+            raise ValueError('SeqNoDB must store payload_digest => ledger_id and seq_no')
         return int(parse_data[0]), int(parse_data[1])
 
-    def _create_value(self, ledger_id, seq_no):
-        return str(ledger_id) + self.delimiter + str(seq_no)
+    def _create_value(self, ledger_id: int, seq_no: int) -> bytes:
+        return self.VALUE_VERSION + self.VALUE_FORMAT.pack(ledger_id, seq_no)
+
+    def _cache_put(self, payload_digest, value):
+        self._cache[payload_digest] = value
+        self._cache.move_to_end(payload_digest)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _is_stored(self, payload_digest):
+        # Only the cache is checked, so that writes do not read the storage
+        cached = self._cache.get(payload_digest)
+        return cached is not None and cached != (None, None)
 
     @property
     def size(self):
-        return self._keyValueStorage.size
+        """
+        Number of keys in storage. It is counted once and then increased on
+        writes by keys of digests not cached as stored, so keys rewritten
+        after they left the cache are counted again.
+        """
+        if self._size is None:
+            self._size = self._keyValueStorage.size
+        return self._size
 
     def close(self):
         self._keyValueStorage.close()
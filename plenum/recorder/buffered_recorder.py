@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import deque
+
+import msgpack
+
+from plenum.recorder.recorder import Recorder
+from storage.kv_store import KeyValueStorage
+
+
+class BufferedRecorder(Recorder):
+    """
+    Recorder which does not touch its store when a message is added. Records
+    are put to an in-memory ring buffer of `buffer_size` and written to the
+    store in batches by a background thread every `flush_interval` seconds.
+    If the thread falls behind, the oldest records not written yet are
+    overwritten and counted in `dropped`.
+
+    Every record is stored under its own key, which is the time it was added
+    at (as for `Recorder`) but increased where needed to be unique, and its
+    value is in binary format (see `pack_record`).
+    """
+
+    def __init__(self, kv_store: KeyValueStorage, buffer_size: int,
+                 flush_interval: float, skip_metadata_write=False):
+        super().__init__(kv_store, skip_metadata_write=skip_metadata_write)
+        self.dropped = 0
+        self._buffer = deque(maxlen=buffer_size)
+        self._last_key = 0
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(target=self._write_periodically, daemon=True)
+        self._writer.start()
+
+    def get_now_key(self):
+        self._last_key = max(int(time.perf_counter() * self.TIME_FACTOR), self._last_key + 1)
+        return str(self._last_key)
+
+    def add_to_store(self, key, val):
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append((key, val))
+
+    def flush(self):
+        # Write all buffered records to the store
+        with self._lock:
+            records = list(self._buffer)
+            self._buffer.clear()
+        if records:
+            self.store.setBatch((key, self.pack_record(val)) for key, val in records)
+
+    def start_playing(self):
+        self.flush()
+        super().start_playing()
+
+    def stop(self):
+        if not self._stopped.is_set():
+            self._stopped.set()
+            self._writer.join()
+            self.flush()
+        super().stop()
+
+    def _write_periodically(self):
+        while not self._stopped.wait(self._flush_interval):
+            self.flush()
+
+    @staticmethod
+    def pack_record(val) -> bytes:
+        return Recorder.BINARY_RECORD_PREFIX + msgpack.packb(val, use_bin_type=True)
@@ -1,4 +1,6 @@
+import heapq
 import time
+from itertools import groupby
 
 from plenum.recorder.recorder import Recorder
 from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
@@ -31,11 +33,32 @@ class CombinedRecorder(Recorder):
 
             self.store.put(k, existing + self.c_prefix + v)
 
+    def iter_combined(self):
+        """
+        Values of both recorders in order of their keys, with values under
+        the same key given together as a tuple of node and client values.
+        Stores of the recorders are read while iterating, so they need not
+        be combined or loaded in memory first.
+        """
+        n_items = ((int(k), 0, v) for k, v in self.recorders[0].store.iterator(include_value=True))
+        c_items = ((int(k), 1, v) for k, v in self.recorders[1].store.iterator(include_value=True))
+        for key, items in groupby(heapq.merge(n_items, c_items, key=lambda item: item[:2]),
+                                  key=lambda item: item[0]):
+            vals = [None, None]
+            for _, idx, v in items:
+                vals[idx] = v
+            yield key, tuple(vals)
+
     def start_playing(self):
         assert not self.is_playing
         self.is_playing = True
         self.play_started_at = time.perf_counter()
-        self.store_iterator = self.store.iterator(include_value=True)
+        if self.recorders:
+            for recorder in self.recorders:
+                recorder.flush()
+            self.store_iterator = self.iter_combined()
+        else:
+            self.store_iterator = self.store.iterator(include_value=True)
 
     @staticmethod
     def get_parsed(msg, only_incoming=None, only_outgoing=None):
@@ -43,9 +66,13 @@ class CombinedRecorder(Recorder):
         assert only_incoming is None
         assert only_outgoing is None
 
-        n_msgs, c_msgs = msg.split(CombinedRecorder.separator)
-        n_msgs = n_msgs.lstrip(CombinedRecorder.n_prefix)
-        c_msgs = c_msgs.lstrip(CombinedRecorder.c_prefix)
+        if isinstance(msg, tuple):
+            # Values from `iter_combined`
+            n_msgs, c_msgs = msg
+        else:
+            n_msgs, c_msgs = msg.split(CombinedRecorder.separator)
+            n_msgs = n_msgs.lstrip(CombinedRecorder.n_prefix)
+            c_msgs = c_msgs.lstrip(CombinedRecorder.c_prefix)
 
         return [Recorder.get_parsed(n_msgs) if n_msgs else [],
                 Recorder.get_parsed(c_msgs) if c_msgs else []]
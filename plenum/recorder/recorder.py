@@ -2,6 +2,8 @@ import os
 import time
 from typing import Callable
 
+import msgpack
+
 from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
 
 try:
@@ -16,6 +18,9 @@ class Recorder:
     DISCONN_FLAG = 2
     TIME_FACTOR = 100000000
     RECORDER_METADATA_FILENAME = 'recorder_metadata.json'
+    # Values holding a single msgpack encoded record start with this byte,
+    # while values holding a JSON list of records start with `[`
+    BINARY_RECORD_PREFIX = b'\x01'
 
     def __init__(self, kv_store: KeyValueStorageRocksdbIntKeys,
                  skip_metadata_write=False):
@@ -52,6 +57,10 @@ class Recorder:
             existing = []
         self.store.put(key, json.dumps([*existing, val]))
 
+    def flush(self):
+        # Every record is written to store right when added
+        pass
+
     def register_replay_target(self, id, target: Callable):
         assert id not in self.replay_targets
         self.replay_targets[id] = target
@@ -113,8 +122,12 @@ class Recorder:
     def get_parsed(msg, only_incoming=None, only_outgoing=None):
         assert not (only_incoming and only_outgoing)
         if isinstance(msg, (bytes, bytearray)):
-            msg = msg.decode()
-        msg = json.loads(msg)
+            if msg[:1] == Recorder.BINARY_RECORD_PREFIX:
+                msg = [msgpack.unpackb(msg[1:], encoding='utf-8')]
+            else:
+                msg = json.loads(msg.decode())
+        else:
+            msg = json.loads(msg)
         if only_incoming:
             return Recorder.filter_incoming(msg)
         if only_outgoing:
@@ -18,6 +18,7 @@ from storage.helper import initKeyValueStorageIntKeys
 def to_bytes(v):
     if not isinstance(v, bytes):
         return v.encode()
+    return v
 
 
 def get_recorders_from_node_data_dir(node_data_dir, node_name) -> Tuple[Recorder, Recorder]:
@@ -53,7 +54,7 @@ def patch_sent_prepreapres(replaying_node, node_recorder):
     for k, v in node_recorder.store.iterator(include_value=True):
         max_msg_time = max(max_msg_time, int(k))
         min_msg_time = min(min_msg_time, int(k))
-        parsed = Recorder.get_parsed(v.decode())
+        parsed = Recorder.get_parsed(v)
         msg_count += len(parsed)
 
         outgoings = Recorder.filter_outgoing(parsed)
@@ -95,9 +96,9 @@ def get_combined_recorder(replaying_node, node_recorder, client_recorder):
                                           replaying_node.dataLocation,
                                           'combined_recorder')
     cr = CombinedRecorder(kv_store)
-    # Always add node recorder first and then client recorder
+    # Always add node recorder first and then client recorder. Recorders
+    # are read while playing, so they are not combined in `kv_store`
     cr.add_recorders(node_recorder, client_recorder)
-    cr.combine_recorders()
     return cr
 
 
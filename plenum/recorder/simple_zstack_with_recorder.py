@@ -5,6 +5,8 @@ from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
 
 from stp_core.common.log import getlogger
 
+from plenum.common.config_util import get_global_config_else_read_config
+from plenum.recorder.buffered_recorder import BufferedRecorder
 from plenum.recorder.recorder import Recorder
 from stp_zmq.simple_zstack import SimpleZStack
 
@@ -23,7 +25,12 @@ class SimpleZStackWithRecorder(SimpleZStack):
             db_path = os.path.join(parent_dir, 'data', name[:-1], 'recorder')
         os.makedirs(db_path, exist_ok=True)
         db = KeyValueStorageRocksdbIntKeys(db_path, name)
-        self.recorder = Recorder(db)
+        config = get_global_config_else_read_config()
+        if config.RECORDER_BUFFER_SIZE > 0:
+            self.recorder = BufferedRecorder(db, config.RECORDER_BUFFER_SIZE,
+                                             config.RECORDER_FLUSH_INTERVAL)
+        else:
+            self.recorder = Recorder(db)
         super().__init__(*args, **kwargs)
 
     def _verifyAndAppend(self, msg, ident):
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from heapq import merge
 from random import shuffle
-from typing import Optional, List, Tuple, Any, Dict
+from typing import Optional, List, Tuple, Any, Dict, NamedTuple
 
 from plenum.common.channel import RxChannel, TxChannel, Router
 from plenum.common.constants import CATCH_UP_PREFIX
@@ -14,6 +14,16 @@ from stp_core.common.log import getlogger
 
 logger = getlogger()
 
+# Transactions of a catchup reply as received and as transformed for the
+# ledger, along with the latter serialized for the tree and their leaf
+# hashes, which are computed once to both verify the consistency proof and
+# add the transactions to the ledger
+CatchupTxns = NamedTuple('CatchupTxns',
+                         [('received', List),
+                          ('txns', List),
+                          ('serialized', List),
+                          ('leaf_hashes', List)])
+
 
 class CatchupRepService:
     def __init__(self,
@@ -43,6 +53,9 @@ class CatchupRepService:
 
         self._received_catchup_replies_from = defaultdict(list)  # type: Dict[int, List]
         self._received_catchup_txns = []  # type: List[Tuple[int, Any]]
+        # Seq no to the first received catchup reply (and its sender)
+        # containing it, so that replies are not scanned for every seq no
+        self._catchup_reply_index = {}  # type: Dict[int, Tuple[str, CatchupRep]]
 
     def __repr__(self):
         return "{}:CatchupRepService:{}".format(self._provider.node_name(), self._ledger_id)
@@ -75,7 +88,7 @@ class CatchupRepService:
         reqs = self._send_catchup_reqs(self._provider.eligible_nodes(),
                                        self._catchup_till.start_size + 1, self._catchup_till.final_size)
         timeout = self._catchup_timeout(reqs)
-        self._timer.schedule(timeout, self._request_txns_if_needed)
+        self._timer.schedule(timeout, self._request_txns_if_needed, coalesce=True)
 
     def process_catchup_rep(self, rep: CatchupRep, frm: str):
         if not self._can_process_catchup_rep(rep):
@@ -87,20 +100,25 @@ class CatchupRepService:
         if len(txns) == 0:
             return
 
-        logger.info("{} found {} interesting transactions in the catchup from {}".format(self, len(txns), frm))
+        logger.info("%s found %s interesting transactions in the catchup from %s", self, len(txns), frm)
         self.metrics.add_event(MetricsName.CATCHUP_TXNS_RECEIVED, len(txns))
 
         self._received_catchup_replies_from[frm].append(rep)
+        for seq_no, _ in txns:
+            self._catchup_reply_index.setdefault(seq_no, (frm, rep))
 
         txns_already_rcvd_in_catchup = self._merge_catchup_txns(self._received_catchup_txns, txns)
-        logger.info("{} merged catchups, there are {} of them now, from {} to {}".
-                    format(self, len(txns_already_rcvd_in_catchup), txns_already_rcvd_in_catchup[0][0],
-                           txns_already_rcvd_in_catchup[-1][0]))
+        logger.info("%s merged catchups, there are %s of them now, from %s to %s",
+                    self, len(txns_already_rcvd_in_catchup), txns_already_rcvd_in_catchup[0][0],
+                    txns_already_rcvd_in_catchup[-1][0])
 
         num_processed = self._process_catchup_txns(txns_already_rcvd_in_catchup)
-        logger.info("{} processed {} catchup replies with sequence numbers {}".
-                    format(self, num_processed,
-                           [seq_no for seq_no, _ in txns_already_rcvd_in_catchup[:num_processed]]))
+        # Processed transactions are the first ones of sorted received ones,
+        # so only bounds of their sequence numbers are logged
+        if num_processed:
+            logger.info("%s processed %s catchup replies with sequence numbers from %s to %s",
+                        self, num_processed, txns_already_rcvd_in_catchup[0][0],
+                        txns_already_rcvd_in_catchup[num_processed - 1][0])
 
         self._received_catchup_txns = txns_already_rcvd_in_catchup[num_processed:]
 
@@ -115,6 +133,7 @@ class CatchupRepService:
         self._is_working = False
         self._received_catchup_txns.clear()
         self._received_catchup_replies_from.clear()
+        self._catchup_reply_index.clear()
         self._provider.notify_catchup_complete(self._ledger_id)
 
         logger.info("{}{} completed catching up ledger {}, caught up {} in total"
@@ -286,7 +305,7 @@ class CatchupRepService:
                                      start, end, last_seen_seq_no))
 
         timeout = int(self._catchup_timeout(reqs))
-        self._timer.schedule(timeout, self._request_txns_if_needed)
+        self._timer.schedule(timeout, self._request_txns_if_needed, coalesce=True)
 
     def _can_process_catchup_rep(self, rep: CatchupRep) -> bool:
         if rep.ledgerId != self._ledger_id:
@@ -345,18 +364,18 @@ class CatchupRepService:
         # match since list is already sorted
         num_processed = sum(1 for s, _ in txns if s <= self._ledger.size)
         if num_processed:
-            logger.info("{} found {} already processed transactions in the catchup replies".
-                        format(self, num_processed))
+            logger.info("%s found %s already processed transactions in the catchup replies",
+                        self, num_processed)
 
         # If `catchUpReplies` has any transaction that has not been applied
         # to the ledger
         txns = txns[num_processed:]
         while txns and txns[0][0] - self._ledger.seqNo == 1:
             seq_no = txns[0][0]
-            result, node_name, to_be_processed = self._has_valid_catchup_replies(seq_no, txns)
+            result, node_name, catchup_txns = self._has_valid_catchup_replies(seq_no, txns)
+            to_be_processed = len(catchup_txns.txns)
             if result:
-                for _, txn in txns[:to_be_processed]:
-                    self._add_txn(txn)
+                self._apply_catchup_txns(catchup_txns)
                 self._remove_processed_catchup_reply(node_name, seq_no)
                 num_processed += to_be_processed
                 txns = txns[to_be_processed:]
@@ -372,14 +391,15 @@ class CatchupRepService:
 
         return num_processed
 
-    def _has_valid_catchup_replies(self, seq_no: int, txns_to_process: List[Tuple[int, Any]]) -> Tuple[bool, str, int]:
+    def _has_valid_catchup_replies(self, seq_no: int,
+                                   txns_to_process: List[Tuple[int, Any]]) -> Tuple[bool, str, CatchupTxns]:
         """
         Transforms transactions for ledger!
 
         Returns:
             Whether catchup reply corresponding to seq_no
             Name of node from which txns came
-            Number of transactions ready to be processed
+            Transactions ready to be processed
         """
 
         # TODO: Remove after stop passing seqNo here
@@ -396,14 +416,14 @@ class CatchupRepService:
         # Add only those transaction in the temporary tree from the above
         # batch which are not present in the ledger
         # Integer keys being converted to strings when marshaled to JSON
-        txns = [self._provider.transform_txn_for_ledger(txn)
-                for s, txn in txns_to_process[:len(txns)]
-                if str(s) in txns]
+        received = [txn for s, txn in txns_to_process[:len(txns)]
+                    if str(s) in txns]
+        catchup_txns = self._make_catchup_txns(received)
 
         # Creating a temporary tree which will be used to verify consistency
         # proof, by inserting transactions. Duplicating a merkle tree is not
         # expensive since we are using a compact merkle tree.
-        temp_tree = self._ledger.treeWithAppliedTxns(txns)
+        temp_tree = self._ledger.tree_with_applied_hashes(catchup_txns.leaf_hashes)
 
         proof = catchup_rep.consProof
         final_size = self._catchup_till.final_size
@@ -423,25 +443,34 @@ class CatchupRepService:
         except Exception as ex:
             logger.info("{} could not verify catchup reply {} since {}".format(self, catchup_rep, ex))
             verified = False
-        return bool(verified), node_name, len(txns)
+        return bool(verified), node_name, catchup_txns
 
     def _find_catchup_reply_for_seq_no(self, seq_no: int) -> Tuple[str, CatchupRep]:
-        # This is inefficient if we have large number of nodes but since
-        # number of node are always between 60-120, this is ok.
-        for frm, reps in self._received_catchup_replies_from.items():
-            for rep in reps:
-                if str(seq_no) in rep.txns:
-                    return frm, rep
-
-    def _add_txn(self, txn):
-        self._ledger.add(self._provider.transform_txn_for_ledger(txn))
-        self._provider.notify_transaction_added_to_ledger(self._ledger_id, txn)
-
-    def _remove_processed_catchup_reply(self, node: str, seq_no: str):
-        for i, rep in enumerate(self._received_catchup_replies_from[node]):
-            if str(seq_no) in rep.txns:
+        return self._catchup_reply_index[seq_no]
+
+    def _make_catchup_txns(self, received: List) -> CatchupTxns:
+        txns = [self._provider.transform_txn_for_ledger(txn) for txn in received]
+        serialized = [self._ledger.serialize_for_tree(txn) for txn in txns]
+        leaf_hashes = [self._ledger.tree.hash_leaf(s) for s in serialized]
+        return CatchupTxns(received, txns, serialized, leaf_hashes)
+
+    def _apply_catchup_txns(self, catchup_txns: CatchupTxns):
+        self._ledger.add_many_hashed(catchup_txns.txns,
+                                     catchup_txns.serialized,
+                                     catchup_txns.leaf_hashes)
+        self._provider.notify_transactions_added_to_ledger(self._ledger_id,
+                                                           catchup_txns.received)
+
+    def _remove_processed_catchup_reply(self, node: str, seq_no: int):
+        _, rep = self._catchup_reply_index[int(seq_no)]
+        reps = self._received_catchup_replies_from[node]
+        for i, r in enumerate(reps):
+            if r is rep:
+                reps.pop(i)
                 break
-        self._received_catchup_replies_from[node].pop(i)
+        for s in rep.txns:
+            if self._catchup_reply_index.get(int(s), (None, None))[1] is rep:
+                del self._catchup_reply_index[int(s)]
 
     def _reset(self):
         self._is_working = False
@@ -450,3 +479,4 @@ class CatchupRepService:
         self._wait_catchup_rep_from.clear()
         self._received_catchup_replies_from.clear()
         self._received_catchup_txns.clear()
+        self._catchup_reply_index.clear()
@@ -1,7 +1,8 @@
 from abc import abstractmethod
-from typing import Any, Tuple, Optional
+from typing import Any, Tuple, Optional, Iterator
 
 from plenum.common.channel import RxChannel, Router
+from plenum.common.config_util import getConfig
 from plenum.common.ledger import Ledger
 from plenum.common.messages.node_messages import CatchupReq, CatchupRep, ConsistencyProof, LedgerStatus
 from plenum.common.util import SortedDict
@@ -12,11 +13,20 @@ logger = getlogger()
 
 
 class SeederService:
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
+    # Upper bound of the size of a CATCHUP_REP without txns and proof
+    CATCHUP_REP_OVERHEAD = 256
+    # Upper bound of the size of a hash in a consistency proof
+    PROOF_HASH_SIZE = 48
+    # Ratio of the size of a txn in a CATCHUP_REP to its size in the txn
+    # log, the former being JSON and the latter usually MsgPack
+    TXN_SIZE_FACTOR = 1.3
+
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider, config=None):
         router = Router(input)
         router.add(LedgerStatus, self.process_ledger_status)
         router.add(CatchupReq, self.process_catchup_req)
         self._provider = provider
+        self._config = config or getConfig()
 
     def __repr__(self):
         return self._provider.node_name()
@@ -82,17 +92,44 @@ class SeederService:
                                    .format(req.catchupTill, ledger.size), logMethod=logger.warning)
             return
 
-        cons_proof = ledger.tree.consistency_proof(end, req.catchupTill)
-        cons_proof = [Ledger.hashToStr(p) for p in cons_proof]
+        # Splitting is not expected to happen since replies are built small
+        # enough, it is kept in case a reply gets larger than estimated
+        message_splitter = self._make_splitter_for_catchup_rep(ledger, req.catchupTill)
+        for rep in self._build_catchup_reps(ledger_id, ledger, start, end, req.catchupTill):
+            self._provider.send_to(rep, frm, message_splitter)
+
+    def _build_catchup_reps(self, ledger_id: int, ledger: Ledger,
+                            start: int, end: int, catchup_till: int) -> Iterator[CatchupRep]:
+        """
+        Stream txns from `start` to `end` into CATCHUP_REPs fitting into
+        the message length limit, each with a consistency proof from its
+        last txn to `catchup_till`. Size of each txn in a reply is estimated
+        from its size in the txn log, so txns are not serialized for that.
+        """
+        max_proof_len = 2 * catchup_till.bit_length()
+        max_txns_size = self._config.MSG_LEN_LIMIT - self.CATCHUP_REP_OVERHEAD - \
+            max_proof_len * self.PROOF_HASH_SIZE
 
         txns = {}
-        for seq_no, txn in ledger.getAllTxn(start, end):
-            txns[seq_no] = self._provider.update_txn_with_extra_data(txn)
-
+        txns_size = 0
+        for seq_no, txn, stored_size in ledger.get_txns_with_size(start, end):
+            txn = self._provider.update_txn_with_extra_data(txn)
+            # Serialized txn along with its seq no key
+            txn_size = int(stored_size * self.TXN_SIZE_FACTOR) + len(str(seq_no)) + 4
+            if txns and txns_size + txn_size > max_txns_size:
+                yield self._make_catchup_rep(ledger_id, ledger, txns, catchup_till)
+                txns = {}
+                txns_size = 0
+            txns[seq_no] = txn
+            txns_size += txn_size
+
+        if txns:
+            yield self._make_catchup_rep(ledger_id, ledger, txns, catchup_till)
+
+    def _make_catchup_rep(self, ledger_id: int, ledger: Ledger, txns: dict, catchup_till: int):
+        cons_proof = self._make_consistency_proof(ledger, max(txns), catchup_till)
         txns = SortedDict(txns)  # TODO: Do we really need them sorted on the sending side?
-        rep = CatchupRep(ledger_id, txns, cons_proof)
-        message_splitter = self._make_splitter_for_catchup_rep(ledger, req.catchupTill)
-        self._provider.send_to(rep, frm, message_splitter)
+        return CatchupRep(ledger_id, txns, cons_proof)
 
     def _get_ledger_and_id(self, req: Any) -> Tuple[int, Optional[Ledger]]:
         ledger_id = req.ledgerId
@@ -182,8 +219,8 @@ class SeederService:
 
 
 class ClientSeederService(SeederService):
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
-        SeederService.__init__(self, input, provider)
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider, config=None):
+        SeederService.__init__(self, input, provider, config)
 
     def _on_ledger_status_up_to_date(self, ledger_id: int, frm: str):
         ledger_status = build_ledger_status(ledger_id, self._provider)
@@ -191,8 +228,8 @@ class ClientSeederService(SeederService):
 
 
 class NodeSeederService(SeederService):
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
-        SeederService.__init__(self, input, provider)
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider, config=None):
+        SeederService.__init__(self, input, provider, config)
 
     def _on_ledger_status_up_to_date(self, ledger_id: int, frm: str):
         pass
@@ -14,6 +14,7 @@ from plenum.common.exceptions import EmptySignature, \
     InsufficientSignatures, InsufficientCorrectSignatures
 from plenum.common.types import f
 from plenum.common.verifier import DidVerifier, Verifier
+from plenum.server.client_sig_verifier import DeferredSignatureChecks
 from plenum.server.request_handlers.handler_interfaces.request_handler import RequestHandler
 from plenum.server.request_handlers.utils import get_nym_details, get_request_type, nym_ident_is_dest, get_target_verkey
 from stp_core.common.log import getlogger
@@ -90,6 +91,10 @@ class NaclAuthNr(ClientAuthNr):
         if threshold is not None:
             if num_sigs < threshold:
                 raise InsufficientSignatures(num_sigs, threshold)
+            if isinstance(verifier, DeferredSignatureChecks):
+                # Which signatures are correct matters, so they can not be
+                # taken as correct to be checked later
+                verifier = verifier.verifier_cls
         else:
             threshold = num_sigs
         correct_sigs_from = []
@@ -0,0 +1,141 @@
+"""
+Verification of client request signatures in worker threads, so that
+ed25519 checks (done by libsodium which does not hold the GIL) do not block
+the looper.
+"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from plenum.common.exceptions import InsufficientCorrectSignatures
+from plenum.common.verifier import DidVerifier, Verifier
+
+
+class DeferredSignatureChecks:
+    """
+    Verifier factory to be passed to authenticators instead of a verifier
+    class. Authenticators do all the work except for the signature checks
+    themselves (verkeys lookup, serialization, ...), the checks are only
+    recorded to be done later by `verify`.
+
+    Since every recorded check is taken as passed, authenticators needing
+    only some of signatures to be correct have to use `verifier_cls`.
+    """
+
+    def __init__(self, verifier=DidVerifier):
+        self.verifier_cls = verifier
+        self.checks = []  # type: List[Tuple[Verifier, bytes, bytes]]
+        self.identifiers = None
+
+    def __call__(self, verkey, identifier=None):
+        return _RecordingVerifier(self.verifier_cls(verkey, identifier=identifier),
+                                  self.checks)
+
+    def verify(self) -> Optional[Exception]:
+        """
+        Do the recorded checks
+
+        :return: None if all signatures are correct, an exception to be
+        reported to the client otherwise
+        """
+        correct = sum(1 for vr, sig, ser in self.checks if vr.verify(sig, ser))
+        if correct < len(self.checks):
+            return InsufficientCorrectSignatures(correct, len(self.checks))
+
+
+class _RecordingVerifier(Verifier):
+    def __init__(self, verifier: Verifier, checks: list):
+        self._vr = verifier
+        self._checks = checks
+
+    def verify(self, sig, msg) -> bool:
+        self._checks.append((self._vr, sig, msg))
+        return True
+
+
+class ClientSignatureVerifier:
+    """
+    Collects requests with deferred signature checks and verifies them in
+    batches in a pool of worker threads. Results are returned in the same
+    order the requests were added, so that requests get to the node in the
+    order they were received. Callers are expected to stop taking requests
+    in once it `is_full`, that is `max_pending` requests are pending, and
+    to pass requests checked by themselves to `add_checked` while any
+    request is pending, so that those do not overtake earlier ones.
+    """
+
+    def __init__(self, workers: int, batch_size: int, max_pending: int):
+        self._workers = workers
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        # Created on first use, so that verifier can be used after `stop`
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+        # Requests not submitted for verification yet
+        self._collected = []  # type: List[Tuple[Any, DeferredSignatureChecks]]
+        # Submitted batches, in order of submission
+        self._submitted = deque()
+
+    def add(self, item: Any, checks: DeferredSignatureChecks):
+        self._collected.append((item, checks))
+        if len(self._collected) >= self._batch_size * self._workers:
+            self.flush()
+
+    def add_checked(self, item: Any):
+        """
+        Add an item with no checks to be done, to be returned by `service`
+        after all the items added before it
+        """
+        self.flush()
+        future = Future()
+        future.set_result([None])
+        self._submitted.append((future, [(item, None)]))
+
+    def flush(self):
+        """
+        Submit collected requests for verification, spreading them among
+        the workers
+        """
+        if not self._collected:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        chunk_size = min(self._batch_size,
+                         -(-len(self._collected) // self._workers))
+        for i in range(0, len(self._collected), chunk_size):
+            chunk = self._collected[i:i + chunk_size]
+            future = self._executor.submit(self._verify_batch,
+                                           [checks for _, checks in chunk])
+            self._submitted.append((future, chunk))
+        self._collected = []
+
+    def service(self) -> List[Tuple[Any, Optional[DeferredSignatureChecks], Optional[Exception]]]:
+        """
+        Return verified requests along with their checks (None for ones
+        added with `add_checked`) and verification error, if any. A request
+        is returned only after all the requests added before it.
+        """
+        results = []
+        while self._submitted and self._submitted[0][0].done():
+            future, chunk = self._submitted.popleft()
+            for (item, checks), error in zip(chunk, future.result()):
+                results.append((item, checks, error))
+        return results
+
+    def __len__(self):
+        return len(self._collected) + \
+            sum(len(chunk) for _, chunk in self._submitted)
+
+    @property
+    def is_full(self) -> bool:
+        return len(self) >= self._max_pending
+
+    def stop(self):
+        self._collected = []
+        self._submitted.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    def _verify_batch(checks_list: List[DeferredSignatureChecks]):
+        return [checks.verify() for checks in checks_list]
@@ -5,7 +5,6 @@ from functools import partial
 from typing import Tuple, List, Set, Optional, Dict, Iterable
 
 import math
-from orderedset._orderedset import OrderedSet
 from sortedcontainers import SortedList
 
 from common.serializers.serialization import state_roots_serializer, invalid_index_serializer
@@ -14,8 +13,7 @@ from plenum.common.config_util import getConfig
 from plenum.common.constants import POOL_LEDGER_ID, SEQ_NO_DB_LABEL, ReplicaHooks, AUDIT_LEDGER_ID, TXN_TYPE, \
     LAST_SENT_PP_STORE_LABEL, AUDIT_TXN_PP_SEQ_NO, AUDIT_TXN_VIEW_NO, AUDIT_TXN_PRIMARIES, PREPREPARE, PREPARE, COMMIT
 from plenum.common.event_bus import InternalBus, ExternalBus
-from plenum.common.exceptions import SuspiciousNode, InvalidClientMessageException, SuspiciousPrePrepare, \
-    UnknownIdentifier
+from plenum.common.exceptions import SuspiciousNode, SuspiciousPrePrepare
 from plenum.common.ledger import Ledger
 from plenum.common.messages.internal_messages import HookMessage, OutboxMessage, DoCheckpointMessage, \
     RemoveStashedCheckpoints, RequestPropagates
@@ -23,6 +21,7 @@ from plenum.common.messages.node_messages import PrePrepare, Prepare, Commit, Re
     CheckpointState, MessageReq
 from plenum.common.metrics_collector import MetricsName
 from plenum.common.request import Request
+from plenum.common.request_queue import RequestQueue
 from plenum.common.stashing_router import StashingRouter
 from plenum.common.timer import TimerService, RepeatingTimer
 from plenum.common.txn_util import get_payload_digest, get_payload_data, get_seq_no
@@ -183,7 +182,7 @@ class OrderingService:
         self.warned_no_primary = False
 
         # Queues used in PRE-PREPARE for each ledger,
-        self.requestQueues = {}  # type: Dict[int, OrderedSet]
+        self.requestQueues = {}  # type: Dict[int, RequestQueue]
 
         self.batches = OrderedDict()  # type: OrderedDict[Tuple[int, int]]
 
@@ -226,19 +225,19 @@ class OrderingService:
             return result
 
         key = (prepare.viewNo, prepare.ppSeqNo)
-        self._logger.debug("{} received PREPARE{} from {}".format(self, key, sender))
+        self._logger.debug("%s received PREPARE%s from %s", self, key, sender)
 
         # TODO move this try/except up higher
         try:
             if self.l_validatePrepare(prepare, sender):
                 self.l_addToPrepares(prepare, sender)
                 self.stats.inc(TPCStat.PrepareRcvd)
-                self._logger.debug("{} processed incoming PREPARE {}".format(
-                    self, (prepare.viewNo, prepare.ppSeqNo)))
+                self._logger.debug("%s processed incoming PREPARE %s",
+                                   self, (prepare.viewNo, prepare.ppSeqNo))
             else:
                 # TODO let's have isValidPrepare throw an exception that gets
                 # handled and possibly logged higher
-                self._logger.trace("{} cannot process incoming PREPARE".format(self))
+                self._logger.trace("%s cannot process incoming PREPARE", self)
         except SuspiciousNode as ex:
             self.report_suspicious_node(ex)
 
@@ -427,14 +426,14 @@ class OrderingService:
         if result != PROCESS:
             return result
 
-        self._logger.debug("{} received COMMIT{} from {}".format(
-            self, (commit.viewNo, commit.ppSeqNo), sender))
+        self._logger.debug("%s received COMMIT%s from %s",
+                           self, (commit.viewNo, commit.ppSeqNo), sender)
 
         if self.l_validateCommit(commit, sender):
             self.stats.inc(TPCStat.CommitRcvd)
             self.l_addToCommits(commit, sender)
-            self._logger.debug("{} processed incoming COMMIT{}".format(
-                self, (commit.viewNo, commit.ppSeqNo)))
+            self._logger.debug("%s processed incoming COMMIT%s",
+                               self, (commit.viewNo, commit.ppSeqNo))
         return result
 
     """Method from legacy code"""
@@ -497,7 +496,7 @@ class OrderingService:
             return result
 
         key = (pre_prepare.viewNo, pre_prepare.ppSeqNo)
-        self._logger.debug("{} received PRE-PREPARE{} from {}".format(self, key, sender))
+        self._logger.debug("%s received PRE-PREPARE%s from %s", self, key, sender)
 
         # TODO: should we still do it?
         # Converting each req_idrs from list to tuple
@@ -779,11 +778,10 @@ class OrderingService:
             for coll in to_clean_up:
                 coll.pop(request_key, None)
 
+        for queue in self.requestQueues.values():
+            queue.discard_many(reqKeys)
         for request_key in reqKeys:
             self._requests.free(request_key)
-            for ledger_id, keys in self.requestQueues.items():
-                if request_key in keys:
-                    self.l_discard_req_key(ledger_id, request_key)
             self._logger.trace('{} freed request {} from previous checkpoints'
                                .format(self, request_key))
 
@@ -971,7 +969,7 @@ class OrderingService:
                 self._data.inst_id, pre_prepare.ppSeqNo)
         self.l_trackBatches(pre_prepare, old_state_root)
         key = (pre_prepare.viewNo, pre_prepare.ppSeqNo)
-        self._logger.debug("{} processed incoming PRE-PREPARE{}".format(self, key),
+        self._logger.debug("%s processed incoming PRE-PREPARE%s", self, key,
                            extra={"tags": ["processing"]})
         return None
 
@@ -1208,28 +1206,21 @@ class OrderingService:
         to the ledger and state
         """
 
-        reqs = []
-        idx = 0
         rejects = []
         invalid_indices = []
         suspicious = False
 
         # 1. apply each request
-        for req_key in pre_prepare.reqIdr:
-            req = self._requests[req_key].finalised
-            try:
-                self.l_processReqDuringBatch(req,
-                                             pre_prepare.ppTime)
-            except (InvalidClientMessageException, UnknownIdentifier, SuspiciousPrePrepare) as ex:
+        reqs = [self._requests[req_key].finalised for req_key in pre_prepare.reqIdr]
+        errors = self.l_processReqsDuringBatch(reqs, pre_prepare.ppTime)
+        for idx, (req, ex) in enumerate(zip(reqs, errors)):
+            if ex is not None:
                 self._logger.warning('{} encountered exception {} while processing {}, '
                                      'will reject'.format(self, ex, req))
                 rejects.append((req.key, Reject(req.identifier, req.reqId, ex)))
                 invalid_indices.append(idx)
                 if isinstance(ex, SuspiciousPrePrepare):
                     suspicious = True
-            finally:
-                reqs.append(req)
-            idx += 1
 
         # 2. call callback for the applied batch
         if self.is_master:
@@ -1324,8 +1315,8 @@ class OrderingService:
         # pp.discarded indicates the index from where the discarded requests
         #  starts hence the count of accepted requests, prevStateRoot is
         # tracked to revert this PRE-PREPARE
-        self._logger.trace('{} tracking batch for {} with state root {}'.format(
-            self, pp, prevStateRootHash))
+        self._logger.trace('%s tracking batch for %s with state root %s',
+                           self, pp, prevStateRootHash)
         # ToDo: for first stage we will exclude metrics
         # if self.is_master:
         #     self._metrics.add_event(MetricsName.THREE_PC_BATCH_SIZE, len(pp.reqIdr))
@@ -1439,8 +1430,8 @@ class OrderingService:
 
     """Method from legacy code"""
     def l_doPrepare(self, pp: PrePrepare):
-        self._logger.debug("{} Sending PREPARE{} at {}".format(
-            self, (pp.viewNo, pp.ppSeqNo), self.get_current_time()))
+        self._logger.debug("%s Sending PREPARE%s at %s",
+                           self, (pp.viewNo, pp.ppSeqNo), self.get_current_time())
         params = [self._data.inst_id,
                   pp.viewNo,
                   pp.ppSeqNo,
@@ -1523,7 +1514,7 @@ class OrderingService:
         :param p: the prepare message
         """
         key_3pc = (p.viewNo, p.ppSeqNo)
-        self._logger.debug("{} Sending COMMIT{} at {}".format(self, key_3pc, self.get_current_time()))
+        self._logger.debug("%s Sending COMMIT%s at %s", self, key_3pc, self.get_current_time())
 
         params = [
             self._data.inst_id, p.viewNo, p.ppSeqNo
@@ -1572,7 +1563,7 @@ class OrderingService:
     """Method from legacy code"""
     def l_doOrder(self, commit: Commit):
         key = (commit.viewNo, commit.ppSeqNo)
-        self._logger.debug("{} ordering COMMIT {}".format(self, key))
+        self._logger.debug("%s ordering COMMIT %s", self, key)
         return self.l_order_3pc_key(key)
 
     """Method from legacy code"""
@@ -1620,10 +1611,10 @@ class OrderingService:
                       "state root {}, txn root {}, audit root {}".format(self, pp.viewNo, pp.ppSeqNo, pp.ledgerId,
                                                                          pp.stateRootHash, pp.txnRootHash,
                                                                          pp.auditTxnRootHash)
-        self._logger.debug("{}, requests ordered {}, discarded {}".
-                           format(ordered_msg, valid_reqIdr, invalid_reqIdr))
-        self._logger.info("{}, requests ordered {}, discarded {}".
-                          format(ordered_msg, len(valid_reqIdr), len(invalid_reqIdr)))
+        self._logger.debug("%s, requests ordered %s, discarded %s",
+                           ordered_msg, valid_reqIdr, invalid_reqIdr)
+        self._logger.info("%s, requests ordered %s, discarded %s",
+                          ordered_msg, len(valid_reqIdr), len(invalid_reqIdr))
 
         # ToDo: add metrics in integration phase
         # if self.isMaster:
@@ -1754,13 +1745,12 @@ class OrderingService:
 
     """Method from legacy code"""
     def l_discard_ordered_req_keys(self, pp: PrePrepare):
-        for k in pp.reqIdr:
-            # Using discard since the key may not be present as in case of
-            # primary, the key was popped out while creating PRE-PREPARE.
-            # Or in case of node catching up, it will not validate
-            # PRE-PREPAREs or PREPAREs but will only validate number of COMMITs
-            #  and their consistency with PRE-PREPARE of PREPAREs
-            self.l_discard_req_key(pp.ledgerId, k)
+        # Using discard since the key may not be present as in case of
+        # primary, the key was popped out while creating PRE-PREPARE.
+        # Or in case of node catching up, it will not validate
+        # PRE-PREPAREs or PREPAREs but will only validate number of COMMITs
+        #  and their consistency with PRE-PREPARE of PREPAREs
+        self.requestQueues[pp.ledgerId].discard_many(pp.reqIdr)
 
     """Method from legacy code"""
     def l_canOrder(self, commit: Commit) -> Tuple[bool, Optional[str]]:
@@ -1980,16 +1970,18 @@ class OrderingService:
         self._write_manager.dynamic_validation(request)
 
     """Method from legacy code"""
-    def l_processReqDuringBatch(self,
-                                req: Request,
-                                cons_time: int):
+    def l_processReqsDuringBatch(self,
+                                 reqs: List[Request],
+                                 cons_time: int) -> List[Optional[Exception]]:
         """
-                This method will do dynamic validation and apply requests.
-                If there is any errors during validation it would be raised
+                This method will do dynamic validation and apply requests of a batch.
+                Returns the exception each of the requests failed with, or None
                 """
-        if self.is_master:
-            self.l_do_dynamic_validation(req, cons_time)
-            self._write_manager.apply_request(req, cons_time)
+        if not self.is_master:
+            return [None] * len(reqs)
+        return self._write_manager.apply_requests(
+            reqs, cons_time,
+            validate=lambda req: self.l_do_dynamic_validation(req, cons_time))
 
     def can_send_3pc_batch(self):
         if not self._data.is_primary:
@@ -1,4 +1,5 @@
 import time
+from collections import deque, Counter
 from datetime import datetime
 from statistics import mean
 from typing import Dict, Iterable, Optional
@@ -30,44 +31,33 @@ logger = getlogger()
 class RequestTimeTracker:
     """
     Request time tracking utility
-    """
-
-    class Request:
-        def __init__(self, timestamp, instances_ids):
-            self.ordered = dict()
-            self.timestamp = timestamp
-            for ins_id in instances_ids:
-                self.ordered[ins_id] = False
-
-            # True if request was unordered for too long and
-            # was handled by handlers on master replica
-            self.handled = False
-
-        def order(self, instId):
-            if instId in self.ordered:
-                self.ordered[instId] = True
-
-        def remove_instance(self, instId):
-            self.ordered.pop(instId, None)
-
-        @property
-        def is_ordered(self):
-            return self.ordered[0]
 
-        @property
-        def is_handled(self):
-            return self.handled
+    Each request is stored as a list of its start time and a bitmask of
+    instances which still have to order it. Requests are also queued in
+    order of start, so that requests unordered for too long are found at
+    the head of the queue without looking at all the tracked ones.
+    Start times are expected not to decrease.
+    """
 
-        @property
-        def is_ordered_by_all(self):
-            return all(self.ordered.values())
+    MASTER_MASK = 1
 
     def __init__(self, instances_ids):
         self.instances_ids = instances_ids
-        self._requests = {}
+        self._instances_mask = self._mask(instances_ids)
+        self._requests = {}  # type: Dict[str, List]
+        # (key, start time) of requests in order of start, which might have
+        # been ordered by master, handled or dropped since then
+        self._unhandled = deque()
         self._unordered = set()
         self._handled_unordered = set()
 
+    @staticmethod
+    def _mask(instances_ids):
+        mask = 0
+        for inst_id in instances_ids:
+            mask |= 1 << inst_id
+        return mask
+
     def __len__(self):
         return len(self._requests)
 
@@ -76,32 +66,33 @@ class RequestTimeTracker:
 
     def started(self, key):
         req = self._requests.get(key)
-        return req.timestamp if req is not None else None
+        return req[0] if req is not None else None
 
     def start(self, key, timestamp):
-        self._requests[key] = RequestTimeTracker.Request(timestamp, self.instances_ids)
+        self._requests[key] = [timestamp, self._instances_mask]
         self._unordered.add(key)
+        self._unhandled.append((key, timestamp))
 
     def order(self, instId, key, timestamp):
-        if key not in self._requests:
+        req = self._requests.get(key)
+        if req is None:
             return 0
-        req = self._requests[key]
-        tto = timestamp - req.timestamp
-        req.order(instId)
+        tto = timestamp - req[0]
+        req[1] &= ~(1 << instId)
         if instId == 0:
             self._handled_unordered.discard(key)
             self._unordered.discard(key)
-        if req.is_ordered_by_all:
+        if not req[1]:
             del self._requests[key]
         return tto
 
     def handle(self, key):
         if key in self._requests:
-            self._requests[key].handled = True
             self._handled_unordered.add(key)
 
     def reset(self):
         self._requests.clear()
+        self._unhandled.clear()
         self._unordered.clear()
         self._handled_unordered.clear()
 
@@ -111,20 +102,43 @@ class RequestTimeTracker:
     def handled_unordered(self):
         return self._handled_unordered
 
-    def unhandled_unordered(self):
-        return ((key, req.timestamp) for key, req in self._requests.items()
-                if not req.is_ordered and not req.is_handled)
+    def unhandled_unordered(self, started_before=None):
+        """
+        Return (key, start time) of requests neither ordered by master nor
+        handled, in order of start. Only requests started before
+        `started_before` are returned if it is given.
+        """
+        queue = self._unhandled
+        while queue and not self._is_unhandled(*queue[0]):
+            queue.popleft()
+        result = []
+        for key, timestamp in queue:
+            if started_before is not None and timestamp >= started_before:
+                break
+            if self._is_unhandled(key, timestamp):
+                result.append((key, timestamp))
+        return result
+
+    def _is_unhandled(self, key, timestamp):
+        req = self._requests.get(key)
+        return req is not None and req[0] == timestamp and \
+            req[1] & self.MASTER_MASK and key not in self._handled_unordered
 
     def add_instance(self, inst_id):
         self.instances_ids.add(inst_id)
+        self._instances_mask |= 1 << inst_id
 
     def remove_instance(self, instId):
-        for req in self._requests.values():
-            req.remove_instance(instId)
-        keys_to_del = [key for key, req in self._requests.items() if req.is_ordered_by_all]
+        mask = ~(1 << instId)
+        keys_to_del = []
+        for key, req in self._requests.items():
+            req[1] &= mask
+            if not req[1]:
+                keys_to_del.append(key)
         for key in keys_to_del:
             self.force_req_drop(key)
         self.instances_ids.remove(instId)
+        self._instances_mask &= mask
 
     def force_req_drop(self, key):
         if key in self._requests:
@@ -169,6 +183,11 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
         # the time taken to order those requests by the replica of the `i`th
         # protocol instance
         self.numOrderedRequests = dict()  # type: Dict[int, Tuple[int, int]]
+        # Number of instances by each of the numbers of ordered requests in
+        # `numOrderedRequests` and the smallest of them, which is updated
+        # incrementally rather than computed on every ordered batch
+        self._num_ordered_counts = Counter()
+        self._min_num_ordered = None
 
         # Dict(instance_id, throughput) of throughputs for replicas. Key is a instId and value is a instance of
         # ThroughputMeasurement class and provide throughputs evaluating mechanism
@@ -311,7 +330,11 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
         """
         logger.debug("{}'s Monitor being reset".format(self))
         instances_ids = self.instances.started.keys()
-        self.numOrderedRequests = {inst_id: (0, 0) for inst_id in instances_ids}
+        self.numOrderedRequests = {}
+        self._num_ordered_counts.clear()
+        self._min_num_ordered = None
+        for inst_id in instances_ids:
+            self._set_num_ordered(inst_id, (0, 0))
         self.requestTracker.reset()
         self.masterReqLatencies = {}
         self.masterReqLatencyTooHigh = False
@@ -331,7 +354,7 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
         """
         self.instances.add(inst_id)
         self.requestTracker.add_instance(inst_id)
-        self.numOrderedRequests[inst_id] = (0, 0)
+        self._set_num_ordered(inst_id, (0, 0))
         rm = self.create_throughput_measurement(self.config)
 
         self.throughputs[inst_id] = rm
@@ -346,7 +369,7 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
         if self.instances.count > 0:
             self.instances.remove(inst_id)
             self.requestTracker.remove_instance(inst_id)
-            self.numOrderedRequests.pop(inst_id, None)
+            self._set_num_ordered(inst_id, None)
             self.clientAvgReqLatencies.pop(inst_id, None)
             self.throughputs.pop(inst_id, None)
 
@@ -383,12 +406,10 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
 
         reqs, tm = self.numOrderedRequests[instId]
         orderedNow = len(durations)
-        self.numOrderedRequests[instId] = (reqs + orderedNow,
-                                           tm + sum(durations.values()))
+        self._set_num_ordered(instId, (reqs + orderedNow,
+                                       tm + sum(durations.values())))
 
-        # TODO: Inefficient, as on every request a minimum of a large list is
-        # calculated
-        if min(r[0] for r in self.numOrderedRequests.values()) == (reqs + orderedNow):
+        if self._min_num_ordered == (reqs + orderedNow):
             # If these requests is ordered by the last instance then increment
             # total requests, but why is this important, why cant is ordering
             # by master not enough?
@@ -399,6 +420,32 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
 
         return durations
 
+    def _set_num_ordered(self, inst_id: int, value: Optional[Tuple[int, int]]):
+        """
+        Set number of ordered requests and time taken to order them by
+        instance `inst_id`, or remove the instance if `value` is None
+        """
+        counts = self._num_ordered_counts
+        old = self.numOrderedRequests.get(inst_id)
+        if old is not None:
+            counts[old[0]] -= 1
+            if not counts[old[0]]:
+                del counts[old[0]]
+        if value is not None:
+            self.numOrderedRequests[inst_id] = value
+            counts[value[0]] += 1
+        else:
+            self.numOrderedRequests.pop(inst_id, None)
+
+        if not counts:
+            self._min_num_ordered = None
+        elif value is not None and (self._min_num_ordered is None or
+                                    value[0] < self._min_num_ordered):
+            self._min_num_ordered = value[0]
+        elif self._min_num_ordered not in counts:
+            # The last instance with the smallest number ordered more
+            self._min_num_ordered = min(counts)
+
     def requestUnOrdered(self, key: str):
         """
         Record the time at which request ordering started.
@@ -411,8 +458,8 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
 
     def check_unordered(self):
         now = time.perf_counter()
-        new_unordereds = [(req, now - started) for req, started in self.requestTracker.unhandled_unordered()
-                          if now - started > self.config.UnorderedCheckFreq]
+        new_unordereds = [(req, now - started) for req, started in self.requestTracker.unhandled_unordered(
+            started_before=now - self.config.UnorderedCheckFreq)]
         if len(new_unordereds) == 0:
             return
         for handler in self.unordered_requests_handlers:
@@ -102,6 +102,8 @@ from plenum.client.wallet import Wallet
 from plenum.server.blacklister import Blacklister
 from plenum.server.blacklister import SimpleBlacklister
 from plenum.server.client_authn import ClientAuthNr, SimpleAuthNr, CoreAuthNr
+from plenum.server.client_sig_verifier import ClientSignatureVerifier, \
+    DeferredSignatureChecks
 from plenum.server.has_action_queue import HasActionQueue
 from plenum.server.instances import Instances
 from plenum.server.message_req_processor import MessageReqProcessor
@@ -115,6 +117,8 @@ from plenum.server.plugin.has_plugin_loader_helper import PluginLoaderHelper
 from plenum.server.pool_manager import TxnPoolManager
 from plenum.server.propagator import Propagator
 from plenum.server.quorums import Quorums
+from plenum.server.read_replicas import ReadReplicas
+from plenum.server.reply_cache import ReplyCache
 from plenum.server.replicas import Replicas
 from plenum.server.req_authenticator import ReqAuthenticator
 from plenum.server.router import Router
@@ -166,7 +170,6 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.ha = ha
         self.cliname = cliname
         self.cliha = cliha
-        self.timer = QueueTimer()
         self.poolManager = None  # type: TxnPoolManager
         self.ledgerManager = None
         self.bls_bft = None
@@ -177,6 +180,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.requestExecuter = {}  # type: Dict[int, Callable]
 
         self.metrics = self._createMetricsCollector()
+        self.timer = QueueTimer(metrics=self.metrics)
         if self.config.METRICS_COLLECTOR_TYPE is not None:
             self._gc_time_tracker = GcTimeTracker(self.metrics)
 
@@ -204,6 +208,22 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.clientAuthNr = clientAuthNr or self.defaultAuthNr()
 
+        # Verifies signatures of client requests in worker threads if enabled
+        self.client_sig_verifier = ClientSignatureVerifier(
+            self.config.CLIENT_SIG_VERIFICATION_WORKERS,
+            self.config.CLIENT_SIG_VERIFICATION_BATCH_SIZE,
+            self.config.CLIENT_SIG_VERIFICATION_MAX_PENDING) \
+            if self.config.CLIENT_SIG_VERIFICATION_WORKERS > 0 else None
+
+        # Recently committed transactions to reply with without reading ledgers
+        self.reply_cache = ReplyCache(self.config.REPLY_CACHE_SIZE,
+                                      self.config.REPLY_CACHE_TTL) \
+            if self.config.REPLY_CACHE_SIZE > 0 else None
+
+        # Serves read requests in worker processes if enabled
+        self.read_replicas = self._create_read_replicas() \
+            if self.config.READ_REPLICAS > 0 else None
+
         self.addGenesisNyms()
 
         self._mode = None  # type: Optional[Mode]
@@ -575,7 +595,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.configLedger,
             preCatchupStartClbk=self.preConfigLedgerCatchup,
             postCatchupCompleteClbk=self.postConfigLedgerCaughtUp,
-            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+            postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(CONFIG_LEDGER_ID)
 
     def prePoolLedgerCatchup(self, **kwargs):
@@ -773,7 +794,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 self.config.reqIdToTxnStorage,
                 self.dataLocation,
                 self.config.seqNoDbName,
-                db_config=self.config.db_seq_no_db_config)
+                db_config=self.config.db_seq_no_db_config),
+            cache_size=self.config.seqNoDbCacheSize
         )
 
     def loadNodeStatusDB(self):
@@ -865,7 +887,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 self.poolLedger,
                 preCatchupStartClbk=self.prePoolLedgerCatchup,
                 postCatchupCompleteClbk=self.postPoolLedgerCaughtUp,
-                postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+                postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+                postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
             self.on_new_ledger_added(POOL_LEDGER_ID)
 
     def _add_domain_ledger(self):
@@ -874,7 +897,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.domainLedger,
             preCatchupStartClbk=self.preDomainLedgerCatchup,
             postCatchupCompleteClbk=self.postDomainLedgerCaughtUp,
-            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+            postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(DOMAIN_LEDGER_ID)
 
     def _add_audit_ledger(self):
@@ -883,7 +907,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.auditLedger,
             preCatchupStartClbk=self.preAuditLedgerCatchup,
             postCatchupCompleteClbk=self.postAuditLedgerCaughtUp,
-            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+            postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+            postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(AUDIT_LEDGER_ID)
 
     def getHashStore(self, name) -> HashStore:
@@ -959,6 +984,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         else:
             super().start(loop)
 
+            # Read replicas are forked before stacks are started, so that
+            # they do not inherit sockets
+            if self.read_replicas is not None:
+                self.read_replicas.start()
+
             # Start the ledgers
             for ledger in self.ledgers:
                 ledger.start(loop)
@@ -1056,6 +1086,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.nodestack.stop()
         self.clientstack.stop()
+        if self.client_sig_verifier is not None:
+            self.client_sig_verifier.stop()
+        if self.read_replicas is not None:
+            self.read_replicas.stop()
 
         self.closeAllKVStores()
 
@@ -1164,9 +1198,21 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param limit: the maximum number of messages to process
         :return: the number of messages successfully processed
         """
-        c = await self.clientstack.service(limit, self.quota_control.client_quota)
+        if self.client_sig_verifier is not None and self.client_sig_verifier.is_full:
+            # Client messages are left in the stack until signatures of
+            # pending requests are verified
+            c = 0
+        else:
+            c = await self.clientstack.service(limit, self.quota_control.client_quota)
         self.metrics.add_event(MetricsName.CLIENT_STACK_MESSAGES_PROCESSED, c)
 
+        if self.client_sig_verifier is not None:
+            self.client_sig_verifier.flush()
+            self.processVerifiedClientMsgs()
+        if self.read_replicas is not None:
+            for msg, frm in self.read_replicas.service():
+                self.transmitToClient(msg, frm)
+
         await self.processClientInBox()
         return c
 
@@ -1837,11 +1883,60 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.doStaticValidation(cMsg)
 
         self.execute_hook(NodeHooks.PRE_SIG_VERIFICATION, cMsg)
+        if self.canDeferSignatureVerification(cMsg):
+            # Signatures are checked by worker threads, the request gets
+            # to clientInBox once they are verified
+            checks = self.prepareSignatureVerification(cMsg)
+            self.client_sig_verifier.add((cMsg, frm), checks)
+            return None
         self.verifySignature(cMsg)
+        if self.client_sig_verifier is not None and len(self.client_sig_verifier) > 0:
+            # The message must not overtake requests still being verified
+            self.client_sig_verifier.add_checked((cMsg, frm))
+            return None
         logger.trace("{} received CLIENT message: {}".
                      format(self.clientstack.name, cMsg))
         return cMsg, frm
 
+    def canDeferSignatureVerification(self, msg) -> bool:
+        """
+        Whether signatures of the client message can be checked by the
+        client signature verifier: it has to be enabled, the message has to
+        be a write or action request (reads have no signatures to check) and
+        every authenticator has to take a verifier
+        """
+        if self.client_sig_verifier is None or \
+                not isinstance(msg, Request):
+            return False
+        txn_type = msg.operation.get(TXN_TYPE)
+        if txn_type == GET_TXN or self.is_query(txn_type):
+            return False
+        authnr = self.authNr(msg.as_dict)
+        return isinstance(authnr, ReqAuthenticator) and authnr.accepts_verifier
+
+    def processVerifiedClientMsgs(self):
+        """
+        Process client requests whose signatures have been verified by
+        the client signature verifier, in the order they were received
+        """
+        for wrappedMsg, checks, error in self.client_sig_verifier.service():
+            req, frm = wrappedMsg
+            if error is not None:
+                self.handleInvalidClientMsg(error, wrappedMsg)
+                continue
+            if checks is not None and checks.identifiers:
+                req_data = req.as_dict
+                self.authNr(req_data).add_verified(req.key, req_data,
+                                                   checks.identifiers)
+            logger.trace("{} received CLIENT message: {}".
+                         format(self.clientstack.name, req))
+            try:
+                self.unpackClientMsg(req, frm)
+            except BlowUp:
+                raise
+            except Exception as ex:
+                self.handleInvalidClientMsg(ex, wrappedMsg)
+
     def unpackClientMsg(self, msg, frm):
         """
         If the message is a batch message validate each message in the batch,
@@ -1941,21 +2036,47 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.postRecvTxnFromCatchup(ledger_id, txn)
         if self.write_manager.is_valid_type(typ):
             self.write_manager.update_state(txn, isCommitted=True)
-            state = self.getState(ledger_id)
-            if state:
-                state.commit(rootHash=state.headHash)
-                if self.stateTsDbStorage and \
-                        (ledger_id == DOMAIN_LEDGER_ID or ledger_id == CONFIG_LEDGER_ID):
-                    timestamp = get_txn_time(txn)
-                    if timestamp is not None:
-                        self.stateTsDbStorage.set(timestamp, state.headHash)
-                logger.trace("{} added transaction with seqNo {} to ledger {} during catchup, state root {}"
-                             .format(self, get_seq_no(txn), ledger_id,
-                                     state_roots_serializer.serialize(bytes(state.committedHeadHash))))
+            self._commit_caught_up_state(ledger_id, txn)
         if updateSeqNo:
             self.updateSeqNoMap([txn], ledger_id)
         self._clear_request_for_txn(ledger_id, txn)
 
+    def postTxnsFromCatchupAddedToLedger(self, ledger_id: int, txns: List):
+        """
+        Same as `postTxnFromCatchupAddedToLedger` for each of the txns, but
+        the state is committed once per run of txns with the same time, i.e.
+        once per 3PC batch they were ordered in, rather than once per txn.
+        Until then txns are applied on top of each other in the uncommitted
+        state, so they are read from there.
+        """
+        state_updated = False
+        for i, txn in enumerate(txns):
+            self.postRecvTxnFromCatchup(ledger_id, txn)
+            if self.write_manager.is_valid_type(get_type(txn)):
+                self.write_manager.update_state(txn, isCommitted=False)
+                state_updated = True
+            batch_end = i + 1 == len(txns) or \
+                get_txn_time(txns[i + 1]) != get_txn_time(txn)
+            if state_updated and batch_end:
+                self._commit_caught_up_state(ledger_id, txn)
+                state_updated = False
+        self.updateSeqNoMap([txn for txn in txns if get_req_id(txn)], ledger_id)
+        for txn in txns:
+            self._clear_request_for_txn(ledger_id, txn)
+
+    def _commit_caught_up_state(self, ledger_id: int, last_txn: Any):
+        state = self.getState(ledger_id)
+        if state:
+            state.commit(rootHash=state.headHash)
+            if self.stateTsDbStorage and \
+                    (ledger_id == DOMAIN_LEDGER_ID or ledger_id == CONFIG_LEDGER_ID):
+                timestamp = get_txn_time(last_txn)
+                if timestamp is not None:
+                    self.stateTsDbStorage.set(timestamp, state.headHash)
+            logger.trace("{} added transaction with seqNo {} to ledger {} during catchup, state root {}"
+                         .format(self, get_seq_no(last_txn), ledger_id,
+                                 state_roots_serializer.serialize(bytes(state.committedHeadHash))))
+
     def _clear_request_for_txn(self, ledger_id, txn):
         req_key = get_digest(txn)
         if req_key is not None:
@@ -2245,6 +2366,18 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         req_manager = self._get_manager_for_txn_type(txn_type=request.operation[TXN_TYPE])
         req_manager.apply_request(request, cons_time)
 
+    def applyReqs(self, requests: List[Request], cons_time: int) -> List[Optional[Exception]]:
+        """
+        Validate and apply requests of a 3PC batch to the appropriate ledger
+        and state, the ledger gets txns of all of them at once. `cons_time`
+        is the UTC epoch at which consensus was reached.
+
+        :return: exception each of the requests was rejected with, or None
+        """
+        return self.write_manager.apply_requests(
+            requests, cons_time,
+            validate=lambda req: self.doDynamicValidation(req, cons_time))
+
     def apply_stashed_reqs(self, three_pc_batch):
         request_ids = three_pc_batch.valid_digests
         requests = []
@@ -2289,8 +2422,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param request: the REQUEST from the client
         :param frm: the name of the client that sent this REQUEST
         """
-        logger.debug("{} received client request: {} from {}".
-                     format(self.name, request, frm))
+        logger.debug("%s received client request: %s from %s", self.name, request, frm)
         self.nodeRequestSpikeMonitorData['accum'] += 1
 
         # TODO: What if client sends requests with same request id quickly so
@@ -2311,6 +2443,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         if self.is_action(txn_type):
             self.process_action(request, frm)
 
+        elif (txn_type == GET_TXN or self.is_query(txn_type)) and \
+                self.read_replicas is not None and \
+                self.read_replicas.submit(request, frm):
+            self.total_read_request_number += 1
+
         elif txn_type == GET_TXN:
             self.handle_get_txn_req(request, frm)
             self.total_read_request_number += 1
@@ -2322,8 +2459,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         elif self.can_write_txn(txn_type):
             reply = self.getReplyFromLedgerForRequest(request)
             if reply:
-                logger.debug("{} returning reply from already processed "
-                             "REQUEST: {}".format(self, request))
+                logger.debug("%s returning reply from already processed REQUEST: %s", self, request)
                 self.transmitToClient(reply, frm)
                 return
 
@@ -2346,6 +2482,16 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 request.reqId,
                 'Pool is in readonly mode, try again in 60 seconds')
 
+    def _create_read_replicas(self):
+        return ReadReplicas(self.config.READ_REPLICAS,
+                            self.config.READ_REPLICA_MAX_PENDING,
+                            replica_args=(self.name,
+                                          self.config,
+                                          self.dataLocation,
+                                          self.config.READ_REPLICA_REFRESH_INTERVAL),
+                            get_committed_sizes=lambda: {lid: ledger.size
+                                                         for lid, ledger in self.db_manager.ledgers.items()})
+
     def is_query(self, txn_type) -> bool:
         # Does the transaction type correspond to a read?
         return self.read_manager.is_valid_type(txn_type)
@@ -2624,6 +2770,9 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.metrics.add_event(MetricsName.REQUEST_QUEUE_SIZE, len(self.requests))
         self.metrics.add_event(MetricsName.FINALISED_REQUEST_QUEUE_SIZE, self.requests.finalised_count)
+        self.metrics.add_event(MetricsName.REQUEST_QUEUE_OLDEST_AGE,
+                               max((q.oldest_age() for q in self.master_replica.requestQueues.values() if q),
+                                   default=0))
         self.metrics.add_event(MetricsName.MONITOR_REQUEST_QUEUE_SIZE, len(self.monitor.requestTracker))
         self.metrics.add_event(MetricsName.MONITOR_UNORDERED_REQUEST_QUEUE_SIZE,
                                len(self.monitor.requestTracker.unordered()))
@@ -2647,6 +2796,19 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.metrics.add_event(MetricsName.DOMAIN_LEDGER_UNCOMMITTED_SIZE, len(self.domainLedger.uncommittedTxns))
         self.metrics.add_event(MetricsName.CONFIG_LEDGER_UNCOMMITTED_SIZE, len(self.configLedger.uncommittedTxns))
 
+        for ledger_id, hits_metric, misses_metric in (
+                (POOL_LEDGER_ID, MetricsName.POOL_STATE_NODE_CACHE_HITS,
+                 MetricsName.POOL_STATE_NODE_CACHE_MISSES),
+                (DOMAIN_LEDGER_ID, MetricsName.DOMAIN_STATE_NODE_CACHE_HITS,
+                 MetricsName.DOMAIN_STATE_NODE_CACHE_MISSES),
+                (CONFIG_LEDGER_ID, MetricsName.CONFIG_STATE_NODE_CACHE_HITS,
+                 MetricsName.CONFIG_STATE_NODE_CACHE_MISSES)):
+            state = self.getState(ledger_id)
+            if state is not None:
+                hits, misses = state.node_cache_stats()
+                self.metrics.add_event(hits_metric, hits)
+                self.metrics.add_event(misses_metric, misses)
+
         # Collections metrics
         def sum_for_values(obj):
             # We don't want to get 0 if we have huge dictionary of empty queues, hence +1
@@ -3062,6 +3224,21 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                      extra={"cli": True,
                             "tags": ["node-msg-processing"]})
 
+    def prepareSignatureVerification(self, req: Request) -> DeferredSignatureChecks:
+        """
+        Do everything needed to validate the signature of the request but
+        the signature checks themselves, they are returned to be done later.
+
+        :return: signature checks; raises an exception if the request can
+        not be authenticated regardless of the checks results
+        """
+        req_data = req.as_dict
+        checks = DeferredSignatureChecks()
+        with self.metrics.measure_time(MetricsName.VERIFY_SIGNATURE_TIME):
+            checks.identifiers = self.authNr(req_data).authenticate(
+                req_data, key=req.key, verifier=checks)
+        return checks
+
     def authNr(self, req):
         return self.clientAuthNr
 
@@ -3155,6 +3332,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         committed_txns = self.write_manager.commit_batch(three_pc_batch)
         self.updateSeqNoMap(committed_txns, three_pc_batch.ledger_id)
         updated_committed_txns = list(map(self.update_txn_with_extra_data, committed_txns))
+        if self.reply_cache is not None:
+            ledger = self.getLedger(three_pc_batch.ledger_id)
+            for txn in updated_committed_txns:
+                self.reply_cache.add(ledger, get_seq_no(txn), txn)
         self.sendRepliesToClients(updated_committed_txns, three_pc_batch.pp_time)
         return committed_txns
 
@@ -3413,7 +3594,12 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
     def getReplyFromLedger(self, ledger, seq_no):
         # DoS attack vector, client requesting already processed request id
-        # results in iterating over ledger (or its subset)
+        # results in iterating over ledger (or its subset), so recently
+        # committed transactions are taken from reply cache
+        if self.reply_cache is not None:
+            txn = self.reply_cache.get(ledger, int(seq_no))
+            if txn is not None:
+                return Reply(txn)
         txn = ledger.getBySeqNo(int(seq_no))
         if txn:
             txn.update(ledger.merkleInfo(seq_no))
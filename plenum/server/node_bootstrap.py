@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from common.serializers.serialization import state_roots_serializer
 from ledger.compact_merkle_tree import CompactMerkleTree
 from ledger.genesis_txn.genesis_txn_initiator_from_file import GenesisTxnInitiatorFromFile
 from plenum.bls.bls_bft_factory import create_default_bls_bft_factory
 from plenum.common.ledger import Ledger
 from plenum.common.ledger_manager import LedgerManager
+from plenum.common.metrics_collector import BufferedMetricsCollector
 from plenum.persistence.storage import initStorage
 from plenum.server.batch_handlers.audit_batch_handler import AuditBatchHandler
 from plenum.server.batch_handlers.config_batch_handler import ConfigBatchHandler
@@ -38,6 +41,9 @@ class NodeBootstrap:
 
     def __init__(self, node):
         self.node = node
+        # Collector of ledgers' metrics, differs from node's one only while
+        # ledgers are created in worker threads
+        self.ledger_metrics = node.metrics
 
     def init_node(self, storage):
         self.init_storages(storage=storage)
@@ -66,27 +72,29 @@ class NodeBootstrap:
         self.node.db_manager.register_new_store(LAST_SENT_PP_STORE_LABEL, last_sent_pp_store)
 
     def init_storages(self, storage=None):
+        ledgers = self.init_ledgers(storage)
+
         # Config ledger and state init
         self.node.db_manager.register_new_database(CONFIG_LEDGER_ID,
-                                                   self.init_config_ledger(),
+                                                   ledgers[CONFIG_LEDGER_ID],
                                                    self.init_config_state(),
                                                    taa_acceptance_required=False)
 
         # Pool ledger init
         self.node.db_manager.register_new_database(POOL_LEDGER_ID,
-                                                   self.init_pool_ledger(),
+                                                   ledgers[POOL_LEDGER_ID],
                                                    self.init_pool_state(),
                                                    taa_acceptance_required=False)
 
         # Domain ledger init
         self.node.db_manager.register_new_database(DOMAIN_LEDGER_ID,
-                                                   storage or self.init_domain_ledger(),
+                                                   ledgers[DOMAIN_LEDGER_ID],
                                                    self.init_domain_state(),
                                                    taa_acceptance_required=True)
 
         # Audit ledger init
         self.node.db_manager.register_new_database(AUDIT_LEDGER_ID,
-                                                   self.init_audit_ledger(),
+                                                   ledgers[AUDIT_LEDGER_ID],
                                                    taa_acceptance_required=False)
         # StateTsDbStorage
         self.init_state_ts_db_storage()
@@ -100,6 +108,36 @@ class NodeBootstrap:
         # last_sent_pp_store
         self.init_last_sent_pp_store()
 
+    def init_ledgers(self, storage=None):
+        """
+        Ledgers are independent, so they are created, and their merkle trees
+        are recovered, concurrently unless LEDGER_RECOVERY_PARALLEL is off
+
+        :return: dict of ledger id to ledger
+        """
+        inits = {
+            CONFIG_LEDGER_ID: self.init_config_ledger,
+            POOL_LEDGER_ID: self.init_pool_ledger,
+            DOMAIN_LEDGER_ID: (lambda: storage) if storage else self.init_domain_ledger,
+            AUDIT_LEDGER_ID: self.init_audit_ledger,
+        }
+        if not self.node.config.LEDGER_RECOVERY_PARALLEL:
+            return {ledger_id: init() for ledger_id, init in inits.items()}
+        # Node's metrics are not thread safe, so events of the threads are
+        # added to them once ledgers are created
+        self.ledger_metrics = BufferedMetricsCollector()
+        try:
+            with ThreadPoolExecutor(max_workers=len(inits)) as executor:
+                futures = {ledger_id: executor.submit(init) for ledger_id, init in inits.items()}
+                ledgers = {ledger_id: future.result() for ledger_id, future in futures.items()}
+        finally:
+            self.ledger_metrics.flush_to(self.node.metrics)
+            self.ledger_metrics = self.node.metrics
+        for ledger in ledgers.values():
+            if isinstance(ledger, Ledger):
+                ledger.metrics = self.node.metrics
+        return ledgers
+
     def init_bls_bft(self):
         self.node.bls_bft = self._create_bls_bft()
         self.node.db_manager.register_new_store(BLS_LABEL, self.node.bls_bft.bls_store)
@@ -205,7 +243,8 @@ class NodeBootstrap:
                       dataDir=self.node.dataLocation,
                       fileName=self.node.config.poolTransactionsFile,
                       ensureDurability=self.node.config.EnsureLedgerDurability,
-                      genesis_txn_initiator=genesis_txn_initiator)
+                      genesis_txn_initiator=genesis_txn_initiator,
+                      metrics=self.ledger_metrics)
 
     def init_domain_ledger(self):
         """
@@ -221,7 +260,8 @@ class NodeBootstrap:
                           dataDir=self.node.dataLocation,
                           fileName=self.node.config.domainTransactionsFile,
                           ensureDurability=self.node.config.EnsureLedgerDurability,
-                          genesis_txn_initiator=genesis_txn_initiator)
+                          genesis_txn_initiator=genesis_txn_initiator,
+                          metrics=self.ledger_metrics)
         else:
             # TODO: we need to rethink this functionality
             return initStorage(self.node.config.primaryStorage,
@@ -233,13 +273,15 @@ class NodeBootstrap:
         return Ledger(CompactMerkleTree(hashStore=self.node.getHashStore('config')),
                       dataDir=self.node.dataLocation,
                       fileName=self.node.config.configTransactionsFile,
-                      ensureDurability=self.node.config.EnsureLedgerDurability)
+                      ensureDurability=self.node.config.EnsureLedgerDurability,
+                      metrics=self.ledger_metrics)
 
     def init_audit_ledger(self):
         return Ledger(CompactMerkleTree(hashStore=self.node.getHashStore('audit')),
                       dataDir=self.node.dataLocation,
                       fileName=self.node.config.auditTransactionsFile,
-                      ensureDurability=self.node.config.EnsureLedgerDurability)
+                      ensureDurability=self.node.config.EnsureLedgerDurability,
+                      metrics=self.ledger_metrics)
 
     # STATES
     def init_pool_state(self):
@@ -248,7 +290,8 @@ class NodeBootstrap:
                 self.node.config.poolStateStorage,
                 self.node.dataLocation,
                 self.node.config.poolStateDbName,
-                db_config=self.node.config.db_state_config)
+                db_config=self.node.config.db_state_config),
+            node_cache_size=self.node.config.stateTrieNodeCacheSize
         )
 
     def init_domain_state(self):
@@ -257,7 +300,8 @@ class NodeBootstrap:
                 self.node.config.domainStateStorage,
                 self.node.dataLocation,
                 self.node.config.domainStateDbName,
-                db_config=self.node.config.db_state_config)
+                db_config=self.node.config.db_state_config),
+            node_cache_size=self.node.config.stateTrieNodeCacheSize
         )
 
     def init_config_state(self):
@@ -266,7 +310,8 @@ class NodeBootstrap:
                 self.node.config.configStateStorage,
                 self.node.dataLocation,
                 self.node.config.configStateDbName,
-                db_config=self.node.config.db_state_config)
+                db_config=self.node.config.db_state_config),
+            node_cache_size=self.node.config.stateTrieNodeCacheSize
         )
 
     # STATES INIT
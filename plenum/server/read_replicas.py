@@ -0,0 +1,315 @@
+"""
+Serving of read requests (GET_TXN and queries) by worker processes having
+read only views of node's ledgers, states and storages, so that reads do
+not compete with ordering for the looper.
+"""
+import logging
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.bls.bls_store import BlsStore
+from plenum.common.constants import POOL_LEDGER_ID, DOMAIN_LEDGER_ID, CONFIG_LEDGER_ID, AUDIT_LEDGER_ID, \
+    BLS_LABEL, TS_LABEL, TXN_TYPE, GET_TXN, GET_TXN_AUTHOR_AGREEMENT, GET_TXN_AUTHOR_AGREEMENT_AML
+from plenum.common.ledger import Ledger
+from plenum.common.message_processor import MessageProcessor
+from plenum.common.messages.node_messages import Reply, RequestAck, RequestNack
+from plenum.common.request import Request
+from plenum.common.types import f
+from plenum.server.database_manager import DatabaseManager
+from plenum.server.request_handlers.get_txn_author_agreement_aml_handler import GetTxnAuthorAgreementAmlHandler
+from plenum.server.request_handlers.get_txn_author_agreement_handler import GetTxnAuthorAgreementHandler
+from plenum.server.request_handlers.get_txn_handler import GetTxnHandler
+from plenum.server.request_managers.read_request_manager import ReadRequestManager
+from state.pruning_state import PruningState
+from storage.helper import initKeyValueStorage, initKeyValueStorageIntKeys, initHashStore
+from storage.state_ts_store import StateTsDbStorage
+from stp_core.common.log import getlogger, Logger
+
+logger = getlogger()
+
+
+class ReadReplica:
+    """
+    Read only views of node's ledgers, states and storages along with read
+    request handlers. Views needed by a request are opened when it comes and
+    reopened once node has committed more transactions to the ledger than
+    they show, but at most once in `refresh_interval` seconds, so data
+    committed by the node becomes visible with at most that delay.
+    """
+
+    # Types of requests served, other reads are served by the node itself
+    TXN_TYPES = {GET_TXN, GET_TXN_AUTHOR_AGREEMENT, GET_TXN_AUTHOR_AGREEMENT_AML}
+
+    # Ledgers served, as names of their hash stores and of config options
+    # with their file names
+    LEDGERS = {
+        POOL_LEDGER_ID: ('pool', 'poolTransactionsFile'),
+        DOMAIN_LEDGER_ID: ('domain', 'domainTransactionsFile'),
+        CONFIG_LEDGER_ID: ('config', 'configTransactionsFile'),
+        AUDIT_LEDGER_ID: ('audit', 'auditTransactionsFile'),
+    }
+
+    def __init__(self, name: str, config, data_location: str,
+                 refresh_interval: float, get_current_time=time.perf_counter):
+        self.name = name
+        self.config = config
+        self.data_location = data_location
+        self._refresh_interval = refresh_interval
+        self._get_current_time = get_current_time
+        # Times views of every opened ledger were opened at
+        self._opened_at = {}  # type: Dict[int, float]
+        self._msg_processor = MessageProcessor()
+        self.db_manager = DatabaseManager()
+        self.read_manager = ReadRequestManager()
+        self.register_req_handlers()
+
+    def __repr__(self):
+        return self.name
+
+    @classmethod
+    def serves(cls, request: Request) -> bool:
+        typ = request.operation[TXN_TYPE]
+        if typ == GET_TXN:
+            return request.operation.get(f.LEDGER_ID.nm, DOMAIN_LEDGER_ID) in cls.LEDGERS
+        return typ in cls.TXN_TYPES
+
+    def open(self, ledger_id: int):
+        """
+        Open views of the ledger and of the storages requests to it need,
+        closing ones opened before
+        """
+        self.close(ledger_id)
+        config = self.config
+        state = None
+        if ledger_id == CONFIG_LEDGER_ID:
+            # Only TAA queries need a state, they also need state signatures
+            # and timestamps
+            state = self._init_state(config.configStateStorage, config.configStateDbName)
+            self.db_manager.register_new_store(BLS_LABEL,
+                                               BlsStore(key_value_type=config.stateSignatureStorage,
+                                                        data_location=self.data_location,
+                                                        key_value_storage_name=config.stateSignatureDbName,
+                                                        db_config=config.db_state_signature_config,
+                                                        read_only=True))
+            self.db_manager.register_new_store(TS_LABEL,
+                                               StateTsDbStorage(self.name, {
+                                                   CONFIG_LEDGER_ID: self._init_ts_storage(config.configStateTsDbName)
+                                               }))
+        hash_store_name, file_name_option = self.LEDGERS[ledger_id]
+        self.db_manager.register_new_database(ledger_id,
+                                              self._init_ledger(hash_store_name,
+                                                                getattr(config, file_name_option)),
+                                              state)
+        self._opened_at[ledger_id] = self._get_current_time()
+
+    def close(self, ledger_id: Optional[int] = None):
+        """
+        Close views of the ledger and of its storages, or all views if no
+        ledger is given
+        """
+        ledger_ids = list(self.db_manager.databases) if ledger_id is None else [ledger_id]
+        for lid in ledger_ids:
+            db = self.db_manager.databases.pop(lid, None)
+            if db is None:
+                continue
+            db.ledger.stop()
+            if db.state is not None:
+                db.state.close()
+            if lid == CONFIG_LEDGER_ID:
+                for label in (BLS_LABEL, TS_LABEL):
+                    self.db_manager.stores.pop(label).close()
+            del self._opened_at[lid]
+
+    def refresh(self, ledger_id: int, committed_size: int):
+        """
+        Open views of the ledger if they are not opened yet, or reopen them
+        if node has committed more than `committed_size` transactions to it
+        and they are old enough
+        """
+        db = self.db_manager.get_database(ledger_id)
+        if db is None:
+            self.open(ledger_id)
+        elif db.ledger.size < committed_size and \
+                self._get_current_time() - self._opened_at[ledger_id] >= self._refresh_interval:
+            self.open(ledger_id)
+
+    def register_req_handlers(self):
+        get_txn_handler = GetTxnHandler(self, self.db_manager)
+        for lid in self.LEDGERS:
+            self.read_manager.register_req_handler(get_txn_handler, ledger_id=lid)
+        self.read_manager.register_req_handler(GetTxnAuthorAgreementAmlHandler(database_manager=self.db_manager))
+        self.read_manager.register_req_handler(GetTxnAuthorAgreementHandler(database_manager=self.db_manager))
+
+    def process_request(self, request: Request, committed_sizes: Dict[int, int]) -> List[dict]:
+        """
+        Serve a read request the same way the node does
+
+        :param committed_sizes: sizes of node's ledgers as committed when
+        the request was received
+        :return: messages to be sent to the client, in dict form
+        """
+        req_key = (request.identifier, request.reqId)
+        if request.operation[TXN_TYPE] == GET_TXN:
+            ledger_id = request.operation.get(f.LEDGER_ID.nm, DOMAIN_LEDGER_ID)
+            if ledger_id not in self.LEDGERS:
+                msgs = [RequestNack(*req_key, 'Invalid ledger id {}'.format(ledger_id))]
+            else:
+                self.refresh(ledger_id, committed_sizes.get(ledger_id, 0))
+                msgs = [RequestAck(*req_key), self.read_manager.get_result(request)]
+        else:
+            try:
+                self.read_manager.static_validation(request)
+                msgs = [RequestAck(*req_key)]
+            except Exception as ex:
+                msgs = [RequestNack(*req_key, str(ex))]
+            self.refresh(CONFIG_LEDGER_ID, committed_sizes.get(CONFIG_LEDGER_ID, 0))
+            msgs.append(Reply(self.read_manager.get_result(request)))
+        return [self._msg_processor.toDict(msg) for msg in msgs]
+
+    def getReplyFromLedger(self, ledger, seq_no):
+        txn = ledger.getBySeqNo(int(seq_no))
+        if txn:
+            txn.update(ledger.merkleInfo(seq_no))
+            return Reply(self.update_txn_with_extra_data(txn))
+        return None
+
+    def update_txn_with_extra_data(self, txn):
+        return txn
+
+    def _init_ledger(self, hash_store_name, file_name):
+        hash_store = initHashStore(self.data_location, hash_store_name, self.config, read_only=True)
+        return Ledger(CompactMerkleTree(hashStore=hash_store),
+                      dataDir=self.data_location,
+                      fileName=file_name,
+                      config=self.config,
+                      read_only=True)
+
+    def _init_state(self, storage_type, db_name):
+        return PruningState(initKeyValueStorage(storage_type,
+                                                self.data_location,
+                                                db_name,
+                                                read_only=True,
+                                                db_config=self.config.db_state_config),
+                            node_cache_size=self.config.stateTrieNodeCacheSize)
+
+    def _init_ts_storage(self, db_name):
+        return initKeyValueStorageIntKeys(self.config.stateTsStorage,
+                                          self.data_location,
+                                          db_name,
+                                          read_only=True,
+                                          db_config=self.config.db_state_ts_db_config)
+
+
+def run_read_replica(conn, replica_cls, args):
+    """
+    Main loop of a worker process, serves requests received from `conn`
+    until None is received
+    """
+    Logger().reset_after_fork()
+    replica = replica_cls(*args)
+    while True:
+        item = conn.recv()
+        if item is None:
+            break
+        frm, request, committed_sizes = item
+        request = Request(**request)
+        try:
+            msgs = replica.process_request(request, committed_sizes)
+        except Exception as ex:
+            logger.exception('{} failed to process read request {}'.format(replica, request))
+            msgs = [MessageProcessor().toDict(RequestNack(request.identifier, request.reqId, str(ex)))]
+        conn.send((frm, msgs))
+    replica.close()
+    # Exit handlers are not run in worker processes, so records queued
+    # for writing are written here
+    logging.shutdown()
+
+
+class ReadReplicas:
+    """
+    Worker processes serving read requests of a node, each with a
+    ReadReplica. A request goes to the worker with the least requests in
+    progress, a worker with `max_pending` requests in progress gets no more
+    requests until it replies to some of them. Every request is sent along
+    with sizes of node's ledgers returned by `get_committed_sizes`, so that
+    workers know when their views are behind.
+    """
+
+    def __init__(self, count: int, max_pending: int, replica_args: Tuple,
+                 get_committed_sizes: Callable[[], Dict[int, int]],
+                 replica_cls=ReadReplica):
+        self._max_pending = max_pending
+        self._get_committed_sizes = get_committed_sizes
+        self._replica_cls = replica_cls
+        self._replica_args = replica_args
+        self._count = count
+        self._workers = []  # type: List[Tuple[Any, Any]]
+        self._pending = []  # type: List[int]
+
+    def start(self):
+        # Workers are forked so that they share node's config and plugins,
+        # so this is to be called before node starts its stacks
+        ctx = multiprocessing.get_context('fork')
+        for _ in range(self._count):
+            conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=run_read_replica,
+                                  args=(child_conn, self._replica_cls, self._replica_args),
+                                  daemon=True)
+            process.start()
+            self._workers.append((process, conn))
+            self._pending.append(0)
+
+    def submit(self, request: Request, frm: str) -> bool:
+        """
+        Give a request to one of the workers
+
+        :return: False if the request is not of a type workers serve or no
+        worker can take it now, so it should be served by the node itself
+        """
+        if not self._replica_cls.serves(request):
+            return False
+        idx = self._least_busy_worker()
+        if idx is None:
+            return False
+        _, conn = self._workers[idx]
+        conn.send((frm, request.as_dict, self._get_committed_sizes()))
+        self._pending[idx] += 1
+        return True
+
+    def service(self) -> List[Tuple[dict, str]]:
+        """
+        Return messages for clients produced by the workers since previous
+        call, along with names of the clients
+        """
+        results = []
+        for idx, (process, conn) in enumerate(self._workers):
+            while self._pending[idx] and conn.poll():
+                frm, msgs = conn.recv()
+                self._pending[idx] -= 1
+                results.extend((msg, frm) for msg in msgs)
+        return results
+
+    def stop(self):
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, conn in self._workers:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self._workers = []
+        self._pending = []
+
+    def _least_busy_worker(self) -> Optional[int]:
+        idx = None
+        for i, (process, _) in enumerate(self._workers):
+            if self._pending[i] >= self._max_pending or not process.is_alive():
+                continue
+            if idx is None or self._pending[i] < self._pending[idx]:
+                idx = i
+        return idx
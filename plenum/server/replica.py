@@ -16,15 +16,13 @@ from common.exceptions import LogicError, PlenumValueError
 from common.serializers.serialization import serialize_msg_for_signing, state_roots_serializer, \
     invalid_index_serializer
 from crypto.bls.bls_bft_replica import BlsBftReplica
-from orderedset import OrderedSet
 
 from plenum.common.config_util import getConfig
 from plenum.common.constants import THREE_PC_PREFIX, PREPREPARE, PREPARE, \
     ReplicaHooks, DOMAIN_LEDGER_ID, COMMIT, POOL_LEDGER_ID, AUDIT_LEDGER_ID, AUDIT_TXN_PP_SEQ_NO, AUDIT_TXN_VIEW_NO, \
     AUDIT_TXN_PRIMARIES, TS_LABEL
 from plenum.common.event_bus import ExternalBus, InternalBus
-from plenum.common.exceptions import SuspiciousNode, \
-    InvalidClientMessageException, UnknownIdentifier, SuspiciousPrePrepare
+from plenum.common.exceptions import SuspiciousNode, SuspiciousPrePrepare
 from plenum.common.hook_manager import HookManager
 from plenum.common.ledger import Ledger
 from plenum.common.message_processor import MessageProcessor
@@ -34,6 +32,7 @@ from plenum.common.messages.node_messages import Reject, Ordered, \
     PrePrepare, Prepare, Commit, Checkpoint, CheckpointState, ThreePhaseMsg, ThreePhaseKey
 from plenum.common.metrics_collector import NullMetricsCollector, MetricsCollector, MetricsName
 from plenum.common.request import Request, ReqKey
+from plenum.common.request_queue import RequestQueue
 from plenum.common.stashing_router import StashingRouter
 from plenum.common.txn_util import get_payload_data, get_seq_no
 from plenum.common.types import f
@@ -411,7 +410,7 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
         self.consumedAllStashedMsgs = True
 
         # Queues used in PRE-PREPARE for each ledger,
-        self.requestQueues = {}  # type: Dict[int, OrderedSet]
+        self.requestQueues = {}  # type: Dict[int, RequestQueue]
 
         self._freshness_checker = FreshnessChecker(freshness_timeout=self.config.STATE_FRESHNESS_UPDATE_INTERVAL)
 
@@ -494,12 +493,11 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
         )
 
     def register_ledger(self, ledger_id):
-        # Using ordered set since after ordering each PRE-PREPARE,
-        # the request key is removed, so fast lookup and removal of
-        # request key is needed. Need the collection to be ordered since
-        # the request key needs to be removed once its ordered
+        # After ordering each PRE-PREPARE its request keys are removed from
+        # queue, so fast lookup and removal of request key is needed, as
+        # well as taking the oldest ones when creating a PRE-PREPARE
         if ledger_id not in self.requestQueues:
-            self.requestQueues[ledger_id] = OrderedSet()
+            self.requestQueues[ledger_id] = RequestQueue(get_current_time=self.get_current_time)
         if ledger_id != AUDIT_LEDGER_ID:
             self._freshness_checker.register_ledger(ledger_id=ledger_id,
                                                     initial_time=self.get_time_for_3pc_batch())
@@ -944,6 +942,28 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
             self.node.doDynamicValidation(req, cons_time)
             self.node.applyReq(req, cons_time)
 
+    def processReqsDuringBatch(
+            self,
+            reqs: List[Request],
+            cons_time: int) -> List[Optional[Exception]]:
+        """
+        This method will do dynamic validation and apply requests of a batch.
+        Returns the exception each of the requests failed with, or None
+        """
+        start = time.perf_counter()
+        if self.isMaster:
+            errors = self.node.applyReqs(reqs, cons_time)
+        else:
+            errors = [None] * len(reqs)
+        if reqs:
+            # Processing time is reported per request, as by processReqDuringBatch
+            name = MetricsName.REQUEST_PROCESSING_TIME if self.isMaster \
+                else MetricsName.BACKUP_REQUEST_PROCESSING_TIME
+            req_time = (time.perf_counter() - start) / len(reqs)
+            for _ in reqs:
+                self.metrics.add_event(name, req_time)
+        return errors
+
     @measure_replica_time(MetricsName.CREATE_3PC_BATCH_TIME,
                           MetricsName.BACKUP_CREATE_3PC_BATCH_TIME)
     def create_3pc_batch(self, ledger_id):
@@ -1021,38 +1041,39 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
         reqs = []
         rejects = []
         invalid_indices = []
-        idx = 0
-        while len(reqs) < self.config.Max3PCBatchSize \
-                and self.requestQueues[ledger_id]:
-            key = self.requestQueues[ledger_id].pop(0)
-            if key in self.requests:
-                fin_req = self.requests[key].finalised
-                malicious_req = False
-                try:
-                    self.processReqDuringBatch(fin_req,
-                                               tm)
-
-                except (
-                        InvalidClientMessageException,
-                        UnknownIdentifier
-                ) as ex:
+        queue = self.requestQueues[ledger_id]
+        # Requests found to be already ordered are dropped, so more of them
+        # are taken from the queue till the batch is full
+        while len(reqs) < self.config.Max3PCBatchSize and queue:
+            fin_reqs = []
+            while len(reqs) + len(fin_reqs) < self.config.Max3PCBatchSize and queue:
+                key, waited = queue.pop()
+                self._add_request_wait_time(waited)
+                if key in self.requests:
+                    fin_reqs.append(self.requests[key].finalised)
+                else:
+                    self.logger.debug('{} found {} in its request queue but the '
+                                      'corresponding request was removed'.format(self, key))
+
+            errors = self.processReqsDuringBatch(fin_reqs, tm)
+            for fin_req, ex in zip(fin_reqs, errors):
+                if isinstance(ex, SuspiciousPrePrepare):
+                    continue
+                if ex is not None:
                     self.logger.warning('{} encountered exception {} while processing {}, '
                                         'will reject'.format(self, ex, fin_req))
                     rejects.append((fin_req.key, Reject(fin_req.identifier, fin_req.reqId, ex)))
-                    invalid_indices.append(idx)
-                except SuspiciousPrePrepare:
-                    malicious_req = True
-                finally:
-                    if not malicious_req:
-                        reqs.append(fin_req)
-                if not malicious_req:
-                    idx += 1
-            else:
-                self.logger.debug('{} found {} in its request queue but the '
-                                  'corresponding request was removed'.format(self, key))
+                    invalid_indices.append(len(reqs))
+                reqs.append(fin_req)
 
         return reqs, invalid_indices, rejects
 
+    def _add_request_wait_time(self, waited: float):
+        if self.isMaster:
+            self.metrics.add_event(MetricsName.REQUEST_QUEUE_WAIT_TIME, waited)
+        else:
+            self.metrics.add_event(MetricsName.BACKUP_REQUEST_QUEUE_WAIT_TIME, waited)
+
     @measure_replica_time(MetricsName.SEND_PREPREPARE_TIME,
                           MetricsName.BACKUP_SEND_PREPREPARE_TIME)
     def sendPrePrepare(self, ppReq: PrePrepare):
@@ -1513,28 +1534,21 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
         to the ledger and state
         """
 
-        reqs = []
-        idx = 0
         rejects = []
         invalid_indices = []
         suspicious = False
 
         # 1. apply each request
-        for req_key in pre_prepare.reqIdr:
-            req = self.requests[req_key].finalised
-            try:
-                self.processReqDuringBatch(req,
-                                           pre_prepare.ppTime)
-            except (InvalidClientMessageException, UnknownIdentifier, SuspiciousPrePrepare) as ex:
+        reqs = [self.requests[req_key].finalised for req_key in pre_prepare.reqIdr]
+        errors = self.processReqsDuringBatch(reqs, pre_prepare.ppTime)
+        for idx, (req, ex) in enumerate(zip(reqs, errors)):
+            if ex is not None:
                 self.logger.warning('{} encountered exception {} while processing {}, '
                                     'will reject'.format(self, ex, req))
                 rejects.append((req.key, Reject(req.identifier, req.reqId, ex)))
                 invalid_indices.append(idx)
                 if isinstance(ex, SuspiciousPrePrepare):
                     suspicious = True
-            finally:
-                reqs.append(req)
-            idx += 1
 
         # 2. call callback for the applied batch
         if self.isMaster:
@@ -2060,13 +2074,12 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
             return self.node.primaries
 
     def _discard_ordered_req_keys(self, pp: PrePrepare):
-        for k in pp.reqIdr:
-            # Using discard since the key may not be present as in case of
-            # primary, the key was popped out while creating PRE-PREPARE.
-            # Or in case of node catching up, it will not validate
-            # PRE-PREPAREs or PREPAREs but will only validate number of COMMITs
-            #  and their consistency with PRE-PREPARE of PREPAREs
-            self.discard_req_key(pp.ledgerId, k)
+        # Using discard since the key may not be present as in case of
+        # primary, the key was popped out while creating PRE-PREPARE.
+        # Or in case of node catching up, it will not validate
+        # PRE-PREPAREs or PREPAREs but will only validate number of COMMITs
+        #  and their consistency with PRE-PREPARE of PREPAREs
+        self.requestQueues[pp.ledgerId].discard_many(pp.reqIdr)
 
     def discard_req_key(self, ledger_id, req_key):
         self.requestQueues[ledger_id].discard(req_key)
@@ -2127,11 +2140,10 @@ class Replica(HasActionQueue, MessageProcessor, HookManager):
             for coll in to_clean_up:
                 coll.pop(request_key, None)
 
+        for queue in self.requestQueues.values():
+            queue.discard_many(reqKeys)
         for request_key in reqKeys:
             self.requests.free(request_key)
-            for ledger_id, keys in self.requestQueues.items():
-                if request_key in keys:
-                    self.discard_req_key(ledger_id, request_key)
             self.logger.trace('{} freed request {} from previous checkpoints'
                               .format(self, request_key))
 
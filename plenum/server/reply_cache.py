@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from plenum.common.ledger import Ledger
+
+
+class ReplyCache:
+    """
+    Recently committed transactions of every ledger, as sent to clients in
+    replies, so that replies to resent requests and GET_TXN for them are
+    made without reading the ledger. At most `max_size` transactions are
+    kept per ledger, each for at most `ttl` seconds since it was added.
+    Merkle info (root hash and audit path at the size ledger had when the
+    transaction was added) is computed on first request and kept too, since
+    it never changes.
+    """
+
+    def __init__(self, max_size: int, ttl: float, get_current_time: Callable[[], float] = None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._get_current_time = get_current_time or time.perf_counter
+        # {ledger: {seq_no: [added_at, txn, merkle_info]}}
+        self._txns = {}  # type: Dict[Ledger, OrderedDict]
+
+    def add(self, ledger: Ledger, seq_no: int, txn: dict):
+        txns = self._txns.setdefault(ledger, OrderedDict())
+        txns[seq_no] = [self._get_current_time(), txn, None]
+        txns.move_to_end(seq_no)
+        while len(txns) > self._max_size:
+            txns.popitem(last=False)
+
+    def get(self, ledger: Ledger, seq_no: int) -> Optional[dict]:
+        """
+        Return the transaction with merkle info added, or None if it is not
+        in cache
+        """
+        txns = self._txns.get(ledger)
+        if not txns:
+            return None
+        self._remove_expired(txns)
+        entry = txns.get(seq_no)
+        # Transactions beyond ledger size could be there only if ledger was reset
+        if entry is None or seq_no > ledger.size:
+            return None
+        if entry[2] is None:
+            entry[2] = ledger.merkleInfo(seq_no)
+        result = dict(entry[1])
+        result.update(entry[2])
+        return result
+
+    def clear(self):
+        self._txns.clear()
+
+    def _remove_expired(self, txns: OrderedDict):
+        expire_before = self._get_current_time() - self._ttl
+        while txns:
+            added_at = next(iter(txns.values()))[0]
+            if added_at >= expire_before:
+                break
+            txns.popitem(last=False)
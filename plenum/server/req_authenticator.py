@@ -1,4 +1,5 @@
 from copy import deepcopy
+from inspect import signature
 from typing import Optional
 
 from plenum.common.constants import TXN_TYPE
@@ -17,17 +18,25 @@ class ReqAuthenticator:
     def __init__(self):
         self._authenticators = []
         self._verified_reqs = {}    # type: Dict[str, Dict[str, List[str]]]
+        # Whether every registered authenticator takes a `verifier`
+        self.accepts_verifier = True
 
     def register_authenticator(self, authenticator: ClientAuthNr):
         self._authenticators.append(authenticator)
+        if 'verifier' not in signature(authenticator.authenticate).parameters:
+            self.accepts_verifier = False
 
-    def authenticate(self, req_data, key=None):
+    def authenticate(self, req_data, key=None, verifier=None):
         """
         Authenticates a given request data by verifying signatures from
         any registered authenticators. If the request is a query returns
         immediately, if no registered authenticator can authenticate then an
         exception is raised.
         :param req_data:
+        :param verifier: verifier passed to authenticators, if given the
+        request is not remembered as verified since the verifier might only
+        record signature checks to be done later, see `add_verified`; can
+        be given only if `accepts_verifier` is True
         :return:
         """
         identifiers = set()
@@ -41,16 +50,23 @@ class ReqAuthenticator:
             if not (authenticator.is_write(typ) or
                     authenticator.is_action(typ)):
                 continue
-            rv = authenticator.authenticate(deepcopy(req_data)) or set()
-            identifiers.update(rv)
+            if verifier is None:
+                rv = authenticator.authenticate(deepcopy(req_data))
+            else:
+                rv = authenticator.authenticate(deepcopy(req_data),
+                                                verifier=verifier)
+            identifiers.update(rv or set())
 
         if not identifiers:
             raise NoAuthenticatorFound
-        if key:
-            self._verified_reqs[key] = {'signature': req_data.get(f.SIG.nm)}
-            self._verified_reqs[key]['identifiers'] = identifiers
+        if key and verifier is None:
+            self.add_verified(key, req_data, identifiers)
         return identifiers
 
+    def add_verified(self, key, req_data, identifiers):
+        self._verified_reqs[key] = {'signature': req_data.get(f.SIG.nm)}
+        self._verified_reqs[key]['identifiers'] = identifiers
+
     def _check_and_verify_existing_req(self, req_data: dict, key: str):
         if key in self._verified_reqs:
             if req_data.get(f.SIG.nm) == self._verified_reqs[key]['signature']:
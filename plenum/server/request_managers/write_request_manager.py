@@ -1,13 +1,14 @@
 from _sha256 import sha256
 from datetime import datetime, time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Iterable, Callable
 
 from common.exceptions import LogicError
 from common.serializers.serialization import pool_state_serializer, config_state_serializer
 
 from plenum.common.constants import TXN_TYPE, POOL_LEDGER_ID, AML, TXN_AUTHOR_AGREEMENT_VERSION, \
     TXN_AUTHOR_AGREEMENT_TEXT, CONFIG_LEDGER_ID, AUDIT_LEDGER_ID
-from plenum.common.exceptions import InvalidClientTaaAcceptanceError, TaaAmlNotSetError
+from plenum.common.exceptions import InvalidClientTaaAcceptanceError, TaaAmlNotSetError, \
+    InvalidClientMessageException, UnknownIdentifier, SuspiciousPrePrepare
 
 from plenum.server.request_handlers.utils import VALUE
 from plenum.common.request import Request
@@ -101,6 +102,42 @@ class WriteRequestManager(RequestManager):
             _, _, updated_state = handler.apply_request(request, batch_ts, updated_state)
         return start, txn
 
+    def apply_requests(self, requests: Iterable[Request], batch_ts,
+                       validate: Optional[Callable[[Request], None]] = None) -> List[Optional[Exception]]:
+        """
+        Apply requests of a 3PC batch, validating each of them with
+        `validate` first if given. State is updated request by request,
+        while txns are added to the uncommitted tree of each ledger at once
+        after all requests are applied.
+
+        :return: exception each of the requests was rejected with, or None
+        if the request was applied
+        """
+        ledgers = []
+        results = []
+        try:
+            for request in requests:
+                handlers = self.request_handlers.get(request.operation[TXN_TYPE], None)
+                if handlers is None:
+                    raise LogicError
+                for handler in handlers:
+                    ledger = handler.ledger
+                    if ledger is not None and all(ledger is not started for started in ledgers):
+                        ledger.start_txns_batch()
+                        ledgers.append(ledger)
+                try:
+                    if validate is not None:
+                        validate(request)
+                    self.apply_request(request, batch_ts)
+                except (InvalidClientMessageException, UnknownIdentifier, SuspiciousPrePrepare) as ex:
+                    results.append(ex)
+                else:
+                    results.append(None)
+        finally:
+            for ledger in ledgers:
+                ledger.finish_txns_batch()
+        return results
+
     def apply_forced_request(self, request):
         handlers = self.request_handlers.get(request.operation[TXN_TYPE], None)
         if handlers is None:
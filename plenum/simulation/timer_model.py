@@ -29,11 +29,18 @@ class TimerModel(SimModel, TimerService):
     def get_current_time(self) -> float:
         return self._ts
 
-    def schedule(self, delay: float, callback: Callable):
+    def schedule(self, delay: float, callback: Callable, coalesce: bool = False):
         # TODO: Some classes (like ViewChanger) sometimes try to schedule None events o_O
         if callback is None:
             return
-        self._outbox.add(SimEvent(timestamp=self._ts + delay,
+        timestamp = self._ts + delay
+        if coalesce:
+            event = self.create_timer_event(callback)
+            if any(ev.payload == event and ev.timestamp <= timestamp
+                   for ev in self._outbox.events):
+                return
+            self.cancel(callback)
+        self._outbox.add(SimEvent(timestamp=timestamp,
                                   payload=self.create_timer_event(callback)))
 
     def cancel(self, callback: Callable):
@@ -8,6 +8,7 @@ from crypto.bls.bls_multi_signature import MultiSignature, MultiSignatureValue
 from plenum.bls.bls_bft_factory import create_default_bls_bft_factory
 from plenum.common.constants import DOMAIN_LEDGER_ID, POOL_LEDGER_ID, CONFIG_LEDGER_ID
 from plenum.common.messages.node_messages import PrePrepare
+from plenum.common.metrics_collector import MetricsName
 from plenum.common.types import f
 from plenum.common.util import get_utc_epoch
 from plenum.server.quorums import Quorums
@@ -15,6 +16,7 @@ from plenum.test.bls.helper import process_commits_for_key, calculate_multi_sig,
 from plenum.test.helper import create_pre_prepare_params, create_pre_prepare_no_bls, create_commit_params, \
     create_commit_no_bls_sig, create_commit_with_bls_sig, create_commit_bls_sig, create_prepare_params, create_prepare, \
     generate_state_root
+from plenum.test.metrics.helper import MockMetricsCollector
 
 whitelist = ['Indy Crypto error']
 
@@ -28,6 +30,14 @@ def bls_bft_replicas(txnPoolNodeSet):
     return bls_bft_replicas
 
 
+@pytest.fixture()
+def optimistic_bls_bft_replicas(bls_bft_replicas):
+    for bls_bft_replica in bls_bft_replicas:
+        bls_bft_replica._optimistic_commit_validation = True
+        bls_bft_replica.metrics = MockMetricsCollector()
+    return bls_bft_replicas
+
+
 @pytest.fixture()
 def quorums(txnPoolNodeSet):
     return Quorums(len(txnPoolNodeSet))
@@ -292,6 +302,17 @@ def test_validate_commit_incorrect_value(bls_bft_replicas, pre_prepare_incorrect
             assert status == BlsBftReplica.CM_BLS_SIG_WRONG
 
 
+def test_validate_commit_incorrect_sig_optimistic(optimistic_bls_bft_replicas, pre_prepare_with_bls):
+    key = (0, 0)
+    for sender_bls_bft in optimistic_bls_bft_replicas:
+        fake_sig = base58.b58encode(b"somefakesignaturesomefakesignaturesomefakesignature").decode("utf-8")
+        commit = create_commit_with_bls_sig(key, fake_sig)
+        for verifier_bls_bft in optimistic_bls_bft_replicas:
+            assert verifier_bls_bft.validate_commit(commit,
+                                                    sender_bls_bft.node_id,
+                                                    pre_prepare_with_bls) is None
+
+
 # ------ PROCESS 3PC MESSAGES ------
 
 def test_process_pre_prepare_no_multisig(bls_bft_replicas, pre_prepare_no_bls):
@@ -339,6 +360,57 @@ def test_process_order(bls_bft_replicas, pre_prepare_no_bls, quorums):
                               pre_prepare_no_bls)
 
 
+def fallback_metrics(bls_bft_replica):
+    bls_bft_replica.metrics.flush_accumulated()
+    return [(ev.count, ev.sum) for ev in bls_bft_replica.metrics.events
+            if ev.name == MetricsName.BLS_COMMIT_SIGS_FALLBACK]
+
+
+def test_process_order_optimistic(optimistic_bls_bft_replicas, pre_prepare_no_bls, quorums):
+    key = (0, 0)
+    process_commits_for_key(key, pre_prepare_no_bls, optimistic_bls_bft_replicas)
+    process_ordered(key, optimistic_bls_bft_replicas, pre_prepare_no_bls, quorums)
+
+    for bls_bft in optimistic_bls_bft_replicas:
+        multi_sig = bls_bft._bls_latest_multi_sig
+        assert multi_sig
+        assert len(multi_sig.participants) == len(optimistic_bls_bft_replicas)
+        assert fallback_metrics(bls_bft) == [(1, 0)]
+
+
+def test_process_order_optimistic_drops_incorrect_sig(optimistic_bls_bft_replicas, pre_prepare_no_bls, quorums):
+    key = (0, 0)
+    process_commits_for_key(key, pre_prepare_no_bls, optimistic_bls_bft_replicas)
+    wrong_sender = optimistic_bls_bft_replicas[0]
+    commit = create_commit_bls_sig(wrong_sender, key, create_pre_prepare_no_bls(generate_state_root()))
+    for bls_bft in optimistic_bls_bft_replicas:
+        bls_bft.process_commit(commit, wrong_sender.node_id)
+
+    process_ordered(key, optimistic_bls_bft_replicas, pre_prepare_no_bls, quorums)
+
+    for bls_bft in optimistic_bls_bft_replicas:
+        multi_sig = bls_bft._bls_latest_multi_sig
+        assert multi_sig
+        assert sorted(multi_sig.participants) == \
+            sorted(r.node_id for r in optimistic_bls_bft_replicas[1:])
+        assert bls_bft._validate_multi_sig(multi_sig)
+        assert wrong_sender.node_id not in bls_bft._signatures[key]
+        assert fallback_metrics(bls_bft) == [(1, 1)]
+
+
+def test_process_order_optimistic_on_backup(optimistic_bls_bft_replicas, pre_prepare_no_bls, quorums):
+    key = (0, 0)
+    for bls_bft in optimistic_bls_bft_replicas:
+        bls_bft._is_master = False
+    process_commits_for_key(key, pre_prepare_no_bls, optimistic_bls_bft_replicas)
+    process_ordered(key, optimistic_bls_bft_replicas, pre_prepare_no_bls, quorums)
+
+    # Backups do not save multi signatures, so do not validate them either
+    for bls_bft in optimistic_bls_bft_replicas:
+        assert bls_bft._bls_latest_multi_sig is None
+        assert fallback_metrics(bls_bft) == []
+
+
 # ------ CREATE MULTI_SIG ------
 
 def test_create_multi_sig_from_all(bls_bft_replicas, quorums, pre_prepare_no_bls):
@@ -537,3 +609,29 @@ def test_commits_gc(bls_bft_replicas):
         assert not key1 in bls_bft._signatures
         assert not key2 in bls_bft._signatures
         assert len(bls_bft._signatures[key3]) == len(bls_bft_replicas)
+
+
+def test_signed_values_gc(bls_bft_replicas):
+    key1 = (0, 1)
+    pre_prepare1 = create_pre_prepare_no_bls(generate_state_root(), pp_seq_no=1)
+    process_commits_for_key(key1, pre_prepare1, bls_bft_replicas)
+
+    key2 = (0, 2)
+    pre_prepare2 = create_pre_prepare_no_bls(generate_state_root(), pp_seq_no=2)
+    process_commits_for_key(key2, pre_prepare2, bls_bft_replicas)
+
+    for bls_bft in bls_bft_replicas:
+        assert set(bls_bft._signed_values) == {key1, key2}
+
+    # Value of another PRE-PREPARE with the same 3PC key is not taken from cache
+    pre_prepare3 = create_pre_prepare_no_bls(generate_state_root(), pp_seq_no=2)
+    process_commits_for_key(key2, pre_prepare3, bls_bft_replicas)
+    for bls_bft in bls_bft_replicas:
+        params, value = bls_bft._signed_values[key2]
+        assert params[1] == pre_prepare3.stateRootHash
+
+    for bls_bft in bls_bft_replicas:
+        bls_bft.gc(key1)
+
+    for bls_bft in bls_bft_replicas:
+        assert set(bls_bft._signed_values) == {key2}
@@ -200,6 +200,7 @@ def test_suspicious_primary_send_same_request_with_same_signatures(
         old_reverts[i] = node.master_replica.spylog.count(Replica.revert)
         node.seqNoDB._keyValueStorage.remove(req.digest)
         node.seqNoDB._keyValueStorage.remove(req.payload_digest)
+        node.seqNoDB._cache.pop(req.payload_digest, None)
 
     ppReq = replica.create_3pc_batch(DOMAIN_LEDGER_ID)
     ppReq._fields['reqIdr'] = [req.digest, req.digest]
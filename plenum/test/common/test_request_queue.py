@@ -0,0 +1,55 @@
+import pytest
+
+from plenum.common.request_queue import RequestQueue
+from plenum.test.helper import MockTimestamp
+
+
+@pytest.fixture()
+def ts():
+    return MockTimestamp(0)
+
+
+@pytest.fixture()
+def queue(ts):
+    return RequestQueue(get_current_time=ts)
+
+
+def test_request_queue_keeps_order(queue):
+    for key in ['a', 'b', 'c', 'b']:
+        queue.add(key)
+
+    assert len(queue) == 3
+    assert list(queue) == ['a', 'b', 'c']
+    assert queue[0] == 'a' and queue[-1] == 'c'
+    assert 'b' in queue and 'd' not in queue
+    with pytest.raises(IndexError):
+        queue[3]
+
+
+def test_request_queue_pops_oldest_with_wait_time(queue, ts):
+    queue.add('a')
+    ts.value += 2
+    queue.add('b')
+    assert queue.oldest_age() == 2
+
+    ts.value += 3
+    assert queue.pop() == ('a', 5)
+    assert queue.pop() == ('b', 3)
+    assert queue.oldest_age() is None
+    with pytest.raises(KeyError):
+        queue.pop()
+
+
+def test_request_queue_removes_keys(queue):
+    for key in 'abcdef':
+        queue.add(key)
+
+    queue.remove('b')
+    with pytest.raises(KeyError):
+        queue.remove('b')
+    queue.discard('b')
+    queue.discard_many(['a', 'd', 'x'])
+
+    assert list(queue) == ['c', 'e', 'f']
+    queue.clear()
+    assert not queue
@@ -1,8 +1,8 @@
 import pytest
-from orderedset._orderedset import OrderedSet
 
 from plenum.common.constants import DOMAIN_LEDGER_ID, CURRENT_PROTOCOL_VERSION, AUDIT_LEDGER_ID, POOL_LEDGER_ID
 from plenum.common.messages.node_messages import PrePrepare
+from plenum.common.request_queue import RequestQueue
 from plenum.common.startable import Mode
 from plenum.common.timer import QueueTimer
 from plenum.server.consensus.ordering_service import OrderingService, ThreePCMsgValidator
@@ -25,7 +25,7 @@ def orderer(consensus_data, internal_bus, name, write_manager,
     orderer.primary_name = "Alpha:0"
     orderer.l_txnRootHash = lambda ledger, to_str=False: txn_roots[ledger]
     orderer.l_stateRootHash = lambda ledger, to_str=False: state_roots[ledger]
-    orderer.requestQueues[DOMAIN_LEDGER_ID] = OrderedSet()
+    orderer.requestQueues[DOMAIN_LEDGER_ID] = RequestQueue()
     orderer.l_revert = lambda *args, **kwargs: None
     return orderer
 
@@ -167,7 +167,7 @@ def test_freshness_pre_prepare_only_when_no_requests_for_ledger(tconf,
                                                                 ordered, refreshed):
     replica, requests = replica_with_valid_requests
     for ordered_ledger_id in ordered:
-        replica.requestQueues[ordered_ledger_id] = OrderedSet([requests[ordered_ledger_id].key])
+        replica.requestQueues[ordered_ledger_id] = RequestQueue([requests[ordered_ledger_id].key])
 
     # send 3PC batch for requests
     assert len(replica.outBox) == 0
@@ -1353,7 +1353,7 @@ class MockTimer(QueueTimer):
         """
         Advance time to next scheduled callback and run that callback
         """
-        if not self._events:
+        if not self.queue_size():
             return
 
         event = self._pop_event()
@@ -1364,7 +1364,7 @@ class MockTimer(QueueTimer):
         """
         Advance time in steps until required value running scheduled callbacks in process
         """
-        while self._events and self._next_timestamp() <= value:
+        while self.queue_size() and self._next_timestamp() <= value:
             self.advance()
         self._ts.value = value
 
@@ -1380,7 +1380,7 @@ class MockTimer(QueueTimer):
         Throws TimeoutError if fail to reach condition (under required timeout if defined)
         """
         deadline = self._ts.value + timeout if timeout else None
-        while self._events and not condition():
+        while self.queue_size() and not condition():
             if deadline and self._next_timestamp() > deadline:
                 raise TimeoutError("Failed to reach condition in required time")
             self.advance()
@@ -1392,7 +1392,7 @@ class MockTimer(QueueTimer):
         """
         Advance time in steps until nothing is scheduled
         """
-        while self._events:
+        while self.queue_size():
             self.advance()
 
 
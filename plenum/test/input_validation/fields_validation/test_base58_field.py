@@ -1,6 +1,6 @@
 import pytest
 import base58
-from plenum.common.messages.fields import Base58Field
+from plenum.common.messages.fields import Base58Field, b58_decoded_length
 from plenum.common.util import randomString
 
 from plenum.test.input_validation.utils import b58_by_len
@@ -49,3 +49,17 @@ def test_invalid_symbols_truncated_output():
     assert res
     assert (res == 'should not contain the following chars '
                    '{} (truncated)'.format(sorted(set(INVALID_CHARS))[:10]))
+
+
+def test_only_values_of_valid_length_are_cached():
+    b58_decoded_length.cache_clear()
+    validator = Base58Field(byte_lengths=(16, 32))
+    for byte_len in (16, 32):
+        # Longest encoding of the length, having no leading zero bytes
+        val = base58.b58encode(b'\xff' * byte_len).decode()
+        assert not validator.validate(val)
+    assert b58_decoded_length.cache_info().currsize == 2
+
+    assert validator.validate(base58.b58encode(b'\xff' * 33).decode())
+    assert validator.validate('z' * 10000)
+    assert b58_decoded_length.cache_info().currsize == 2
@@ -1,7 +1,7 @@
 import pytest
 
 from plenum.common.messages.fields import NonNegativeNumberField
-from plenum.common.messages.message_base import MessageBase
+from plenum.common.messages.message_base import MessageBase, MessageValidator
 
 
 class MessageTest(MessageBase):
@@ -30,3 +30,16 @@ def test_message_base_init_with_both_args_kwargs():
     with pytest.raises(ValueError) as excinfo:
         MessageTest(1, b=3)
     assert "*args, **kwargs cannot be used together" == str(excinfo.value)
+
+
+def test_compiled_schema_is_kept_with_schema():
+    msg = MessageTest(1, 2)
+    assert MessageTest.__dict__['_compiled_schema'] is msg.compiled_schema
+    assert MessageTest(3, 4).compiled_schema is msg.compiled_schema
+
+    # Validator with schema of its own keeps the compiled one as well
+    validator = MessageValidator()
+    validator.schema = MessageTest.schema[:1]
+    assert validator.compiled_schema.names == ('a',)
+    assert validator.__dict__['_compiled_schema'] is validator.compiled_schema
+    assert MessageValidator._compiled_schema is None
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from plenum.common.constants import NYM, TARGET_NYM, TXN_TYPE
+from plenum.common.messages.client_request import ClientMessageValidator
+from plenum.common.messages.node_messages import Prepare, Commit, Propagate, PrePrepare
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.types import f, OPERATION
+from plenum.test.nodestack.helper import wire_payloads, random_b58
+
+"""
+Compares validation of message fields with schemas compiled once per schema
+and with schemas walked for every message as it was done before, on real
+node messages and a client request. Should only be run when a perf check is
+required by setting `SkipTests` to False, run with `-s` to see the results.
+"""
+SkipTests = True
+skipper = pytest.mark.skipif(SkipTests, reason='Benchmark, run manually')
+
+ITERATIONS = 10000
+
+
+def validate_fields_walking_schema(dct, schema):
+    schema_dct = dict(schema)
+    required_fields = filter(lambda x: not x[1].optional, schema)
+    required_field_names = map(lambda x: x[0], required_fields)
+    missed_required_fields = set(required_field_names) - set(dct)
+    assert not missed_required_fields
+    for k, v in dct.items():
+        assert not schema_dct[k].validate(v)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def client_request():
+    signer = SimpleSigner()
+    req_data = {
+        f.IDENTIFIER.nm: signer.identifier,
+        f.REQ_ID.nm: 1,
+        OPERATION: {TXN_TYPE: NYM, TARGET_NYM: random_b58(16)},
+        f.PROTOCOL_VERSION.nm: 2,
+    }
+    req_data[f.SIG.nm] = signer.sign(req_data)
+    return Request(**req_data).as_dict
+
+
+@skipper
+def test_message_validation_perf():
+    pre_prepare, commit, _ = wire_payloads(digests_count=100, txns_count=0)
+    prepare = Prepare(0, 1, 100, pre_prepare.ppTime, pre_prepare.digest,
+                      pre_prepare.stateRootHash, pre_prepare.txnRootHash,
+                      pre_prepare.auditTxnRootHash)
+    request = client_request()
+    propagate = Propagate(request, 'client')
+
+    # Messages validate their fields with schema of their own class
+    validators = [(msg.typename, msg, dict(msg.items()))
+                  for msg in (prepare, commit, propagate, pre_prepare)]
+    validators.append(('REQUEST', ClientMessageValidator(operation_schema_is_strict=True), request))
+
+    for name, validator, dct in validators:
+        schema = validator.schema
+        walking = measure(validate_fields_walking_schema, dct, schema)
+        compiled = measure(validator._validate_fields_with_schema, dct, schema)
+        print('{:<12} walking schema {:8.2f} us, compiled schema {:8.2f} us'
+              .format(name, walking * 1e6, compiled * 1e6))
+
+    for name, msg, dct in validators[:-1]:
+        print('{:<12} message creation {:8.2f} us'
+              .format(name, measure(lambda: type(msg)(**dct)) * 1e6))
@@ -0,0 +1,78 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.test.helper import random_txn
+from plenum.common.constants import NYM
+from plenum.common.ledger import Ledger
+from plenum.common.txn_util import init_empty_txn, set_payload_data
+
+
+@pytest.fixture(scope='function')
+def standalone_ledger(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=tdir_for_func)),
+                    dataDir=tdir_for_func)
+    yield ledger
+    ledger.stop()
+
+
+def create_batch(count):
+    return [set_payload_data(init_empty_txn(NYM), random_txn(i)) for i in range(count)]
+
+
+def append_batch(ledger, count):
+    txns = create_batch(count)
+    ledger.append_txns_metadata(txns)
+    ledger.appendTxns(txns)
+    return txns
+
+
+def expected_uncommitted_root(ledger):
+    return ledger.treeWithAppliedTxns(ledger.uncommittedTxns).root_hash
+
+
+@pytest.mark.parametrize('discard_count', [1, 3, 4, 5, 9, 12])
+def test_discard_restores_uncommitted_tree(standalone_ledger, discard_count):
+    for count in (4, 5, 3):
+        append_batch(standalone_ledger, count)
+
+    standalone_ledger.discardTxns(discard_count)
+
+    assert len(standalone_ledger.uncommittedTxns) == 12 - discard_count
+    if standalone_ledger.uncommittedTxns:
+        assert standalone_ledger.uncommittedRootHash == expected_uncommitted_root(standalone_ledger)
+    else:
+        assert standalone_ledger.uncommittedRootHash is None
+
+
+def test_discard_after_partial_commit(standalone_ledger):
+    for count in (4, 5, 3):
+        append_batch(standalone_ledger, count)
+
+    standalone_ledger.commitTxns(6)
+    standalone_ledger.discardTxns(4)
+    assert standalone_ledger.uncommittedRootHash == expected_uncommitted_root(standalone_ledger)
+
+    append_batch(standalone_ledger, 2)
+    standalone_ledger.discardTxns(3)
+    assert len(standalone_ledger.uncommittedTxns) == 1
+    assert standalone_ledger.uncommittedRootHash == expected_uncommitted_root(standalone_ledger)
+
+
+def test_commit_reuses_uncommitted_tree_data(standalone_ledger):
+    txns = append_batch(standalone_ledger, 4) + append_batch(standalone_ledger, 3)
+    uncommitted_root = standalone_ledger.uncommittedRootHash
+
+    standalone_ledger.commitTxns(7)
+
+    assert standalone_ledger.tree.root_hash == uncommitted_root
+    assert standalone_ledger.uncommittedRootHash is None
+    for seq_no, txn in standalone_ledger.getAllTxn():
+        stored = dict(txn)
+        expected = dict(txns[seq_no - 1])
+        expected.pop('rootHash')
+        expected.pop('auditPath')
+        assert stored == expected
+    merkle_info = standalone_ledger.merkleInfo(7)
+    assert txns[-1]['rootHash'] == merkle_info['rootHash']
+    assert txns[-1]['auditPath'] == merkle_info['auditPath']
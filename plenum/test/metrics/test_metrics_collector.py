@@ -1,4 +1,5 @@
 import asyncio
+import threading
 
 import time
 from typing import Callable
@@ -6,7 +7,7 @@ from typing import Callable
 import pytest
 
 from plenum.common.metrics_collector import MetricsName, KvStoreMetricsCollector, KvStoreMetricsFormat, MetricsEvent, \
-    measure_time, async_measure_time
+    measure_time, async_measure_time, BufferedMetricsCollector
 from plenum.common.value_accumulator import ValueAccumulator
 from plenum.test.metrics.helper import gen_next_timestamp, gen_metrics_name, generate_events, \
     MockMetricsCollector, MockEvent
@@ -72,6 +73,25 @@ def test_metrics_collector_resets_accumulated_after_flush():
     assert mc.events[1] == MockEvent(MetricsName.BACKUP_THREE_PC_BATCH_SIZE, 1, 2.0) in mc.events
 
 
+def test_buffered_metrics_collector_adds_events_from_threads_when_flushed():
+    bmc = BufferedMetricsCollector()
+    threads = [threading.Thread(target=lambda: [bmc.add_event(MetricsName.BACKUP_THREE_PC_BATCH_SIZE, 1.0)
+                                                for _ in range(100)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    mc = MockMetricsCollector()
+    bmc.flush_to(mc)
+    mc.flush_accumulated()
+
+    assert mc.events == [MockEvent(MetricsName.BACKUP_THREE_PC_BATCH_SIZE, 400, 400.0)]
+    bmc.flush_to(mc)
+    mc.flush_accumulated()
+    assert len(mc.events) == 1
+
+
 TIMING_ITER_COUNT = 30
 TIMING_METRIC_NAME = MetricsName.LOOPER_RUN_TIME_SPENT
 TIMING_FUNC_DURATION = 0.1
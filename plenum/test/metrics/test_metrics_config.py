@@ -56,6 +56,8 @@ def test_kv_store_metrics_config(looper, txnPoolNodeSet, tdir, tconf, sdk_pool_h
             MetricsName.NODE_CHECK_NODE_REQUEST_SPIKE,
             MetricsName.NODE_SEND_REJECT_TIME,
             MetricsName.AUTH_RULES_FROM_STATE_COUNT,
+            MetricsName.BLS_COMMIT_SIGS_FALLBACK,
+            MetricsName.LEDGER_RECOVERY_TXNS_HASHED,
 
             # Obsolete metrics
             MetricsName.DESERIALIZE_DURING_UNPACK_TIME,
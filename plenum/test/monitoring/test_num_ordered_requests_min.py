@@ -0,0 +1,33 @@
+import functools
+from collections import Counter
+
+from plenum.server.monitor import Monitor
+from plenum.test.testing_utils import FakeSomething
+
+
+def test_min_num_ordered_requests_tracked_incrementally():
+    monitor = FakeSomething(numOrderedRequests={},
+                            _num_ordered_counts=Counter(),
+                            _min_num_ordered=None)
+    set_num_ordered = functools.partial(Monitor._set_num_ordered, monitor)
+
+    def check_min():
+        if monitor.numOrderedRequests:
+            assert monitor._min_num_ordered == min(r[0] for r in monitor.numOrderedRequests.values())
+        else:
+            assert monitor._min_num_ordered is None
+
+    for inst_id in range(4):
+        set_num_ordered(inst_id, (0, 0))
+        check_min()
+
+    for num_ordered, inst_id in [(5, 0), (3, 1), (5, 2), (1, 3), (6, 3), (7, 1), (8, 0), (9, 2)]:
+        set_num_ordered(inst_id, (num_ordered, num_ordered))
+        check_min()
+
+    set_num_ordered(4, (0, 0))
+    check_min()
+    for inst_id in range(5):
+        set_num_ordered(inst_id, None)
+        check_min()
+    assert not monitor._num_ordered_counts
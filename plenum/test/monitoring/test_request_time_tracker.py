@@ -261,3 +261,30 @@ def test_force_req_drop_before_handle(req_tracker):
 
     req_tracker.handle(digest)
     assert digest not in req_tracker.handled_unordered()
+
+
+def test_request_tracker_unhandled_unordered_started_before(req_tracker):
+    for i in range(10):
+        req_tracker.start("digest{}".format(i), float(i))
+    req_tracker.order(0, "digest1", 20.0)
+    req_tracker.handle("digest2")
+    req_tracker.force_req_drop("digest3")
+
+    assert req_tracker.unhandled_unordered(started_before=6.0) == \
+        [("digest0", 0.0), ("digest4", 4.0), ("digest5", 5.0)]
+    assert len(req_tracker.unhandled_unordered()) == 7
+
+    req_tracker.handle("digest0")
+    # Requests at the head of the queue which are not unhandled anymore
+    # are dropped from it
+    assert req_tracker.unhandled_unordered(started_before=5.0) == [("digest4", 4.0)]
+    assert req_tracker._unhandled[0] == ("digest4", 4.0)
+
+
+def test_request_tracker_restarted_request_is_queued_once(req_tracker):
+    digest = "digest"
+    req_tracker.start(digest, 1.0)
+    req_tracker.force_req_drop(digest)
+    req_tracker.start(digest, 2.0)
+
+    assert req_tracker.unhandled_unordered() == [(digest, 2.0)]
@@ -0,0 +1,170 @@
+import logging
+from copy import deepcopy
+from typing import Any, Optional, Callable, Iterable
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.merkle_verifier import MerkleVerifier
+from plenum.common.channel import create_direct_channel
+from plenum.common.constants import DOMAIN_LEDGER_ID, NYM
+from plenum.common.ledger import Ledger
+from plenum.common.messages.node_messages import CatchupRep
+from plenum.common.metrics_collector import NullMetricsCollector
+from plenum.common.txn_util import init_empty_txn, set_payload_data, append_txn_metadata
+from plenum.common.util import SortedDict
+from plenum.server.catchup.catchup_rep_service import CatchupRepService
+from plenum.server.catchup.seeder_service import SeederService
+from plenum.server.catchup.utils import CatchupDataProvider, CatchupTill
+
+TXNS_COUNT = 30
+TXNS_IN_REPLY = 5
+
+
+class FakeLeecherProvider(CatchupDataProvider):
+    def __init__(self, ledger):
+        self._ledger = ledger
+        self.added = []
+        self.blacklisted = []
+
+    def node_name(self):
+        return 'Alpha'
+
+    def all_nodes_names(self):
+        return ['Alpha', 'Beta', 'Gamma']
+
+    def ledgers(self):
+        return [DOMAIN_LEDGER_ID]
+
+    def ledger(self, ledger_id: int):
+        return self._ledger if ledger_id == DOMAIN_LEDGER_ID else None
+
+    def verifier(self, ledger_id: int):
+        return MerkleVerifier(self._ledger.hasher)
+
+    def eligible_nodes(self):
+        return []
+
+    def update_txn_with_extra_data(self, txn: dict) -> dict:
+        return txn
+
+    def transform_txn_for_ledger(self, txn: dict) -> dict:
+        return txn
+
+    def notify_catchup_start(self, ledger_id: int):
+        pass
+
+    def notify_catchup_complete(self, ledger_id: int):
+        pass
+
+    def notify_transaction_added_to_ledger(self, ledger_id: int, txn: dict):
+        self.added.append([txn])
+
+    def notify_transactions_added_to_ledger(self, ledger_id: int, txns):
+        self.added.append(txns)
+
+    def send_to(self, msg: Any, to: str, message_splitter: Optional[Callable] = None):
+        pass
+
+    def send_to_nodes(self, msg: Any, nodes: Iterable[str] = None):
+        pass
+
+    def blacklist_node(self, node_name: str, reason: str):
+        self.blacklisted.append(node_name)
+
+    def discard(self, msg, reason, logMethod=logging.error, cliOutput=False):
+        pass
+
+
+def create_ledger(data_dir):
+    return Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=data_dir)),
+                  dataDir=data_dir)
+
+
+@pytest.fixture(scope="function")
+def source_ledger(tdir_for_func):
+    ledger = create_ledger(tdir_for_func + '/source')
+    for i in range(TXNS_COUNT):
+        txn = set_payload_data(init_empty_txn(NYM), {'dest': 'nym{}'.format(i)})
+        ledger.add(append_txn_metadata(txn, txn_time=1000 + i // 3))
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture(scope="function")
+def leecher(tdir_for_func):
+    ledger = create_ledger(tdir_for_func + '/leecher')
+    _, rx = create_direct_channel()
+    tx, _ = create_direct_channel()
+    service = CatchupRepService(ledger_id=DOMAIN_LEDGER_ID,
+                                config=None,
+                                input=rx,
+                                output=tx,
+                                timer=None,
+                                metrics=NullMetricsCollector(),
+                                provider=FakeLeecherProvider(ledger))
+    yield service
+    ledger.stop()
+
+
+def catchup_reps(ledger):
+    reps = []
+    for start in range(1, ledger.size + 1, TXNS_IN_REPLY):
+        end = start + TXNS_IN_REPLY - 1
+        txns = {str(seq_no): deepcopy(txn) for seq_no, txn in ledger.getAllTxn(start, end)}
+        reps.append(CatchupRep(DOMAIN_LEDGER_ID,
+                               SortedDict(txns),
+                               SeederService._make_consistency_proof(ledger, end, ledger.size)))
+    return reps
+
+
+def start_catchup(leecher, source_ledger):
+    catchup_till = CatchupTill(start_size=0,
+                               final_size=source_ledger.size,
+                               final_hash=source_ledger.root_hash)
+    leecher._is_working = True
+    leecher._catchup_till = catchup_till
+
+
+def test_catchup_reps_applied_in_batches(leecher, source_ledger):
+    start_catchup(leecher, source_ledger)
+    reps = catchup_reps(source_ledger)
+
+    for rep in reversed(reps[1:]):
+        leecher.process_catchup_rep(rep, 'Beta')
+    assert leecher._ledger.size == 0
+    assert len(leecher._catchup_reply_index) == TXNS_COUNT - TXNS_IN_REPLY
+
+    leecher.process_catchup_rep(reps[0], 'Gamma')
+    assert leecher._ledger.size == TXNS_COUNT
+    assert leecher._ledger.root_hash == source_ledger.root_hash
+    assert list(leecher._ledger.getAllTxn()) == list(source_ledger.getAllTxn())
+
+    # Transactions of every reply are notified of at once
+    added = leecher._provider.added
+    assert [len(txns) for txns in added] == [TXNS_IN_REPLY] * len(reps)
+    assert not leecher._catchup_reply_index
+    assert not leecher.is_working()
+
+
+def test_invalid_catchup_rep_is_discarded(leecher, source_ledger):
+    start_catchup(leecher, source_ledger)
+    reps = catchup_reps(source_ledger)
+
+    invalid_txns = deepcopy(reps[0].txns)
+    set_payload_data(invalid_txns['2'], {'dest': 'other'})
+    invalid_rep = CatchupRep(DOMAIN_LEDGER_ID, invalid_txns, reps[0].consProof)
+
+    leecher.process_catchup_rep(reps[1], 'Beta')
+    leecher.process_catchup_rep(invalid_rep, 'Gamma')
+    assert leecher._provider.blacklisted == ['Gamma']
+    assert leecher._ledger.size == 0
+    assert not leecher._received_catchup_replies_from['Gamma']
+    assert set(leecher._catchup_reply_index) == set(range(6, 11))
+
+    leecher.process_catchup_rep(reps[0], 'Beta')
+    assert leecher._ledger.size == 2 * TXNS_IN_REPLY
+    assert leecher._ledger.root_hash == \
+        Ledger.hashToStr(source_ledger.tree.merkle_tree_hash(0, 2 * TXNS_IN_REPLY))
+    assert not leecher._catchup_reply_index
@@ -15,15 +15,15 @@ TestRunningTimeLimitSec = 300
 def decrease_max_request_size(node):
     old = node.nodestack.prepare_for_sending
 
-    def prepare_for_sending(msg, signer, message_splitter=lambda x: None):
+    def prepare_for_sending(msg, signer, message_splitter=lambda x: None, codec=None):
         if isinstance(msg, CatchupRep) and len(msg.txns) > 6:
             node.nodestack.prepare_for_sending = old
-            part_bytes = node.nodestack.sign_and_serialize(msg, signer)
+            part_bytes = node.nodestack.sign_and_serialize(msg, signer, codec=codec)
             # Decrease at least 6 times to increase probability of
             # unintentional shuffle
             new_limit = len(part_bytes) // 6
             node.nodestack.msg_len_val = MessageLenValidator(new_limit)
-        return old(msg, signer, message_splitter)
+        return old(msg, signer, message_splitter, codec=codec)
 
     node.nodestack.prepare_for_sending = prepare_for_sending
 
@@ -160,6 +160,8 @@ def test_cancel_request_cp_and_ls_after_catchup(txnPoolNodeSet,
 
     # check cancel of schedule with requesting ledger statuses and consistency proofs
     for event in node_to_disconnect.timer._events:
+        if event.cancelled:
+            continue
         name = event.callback.__name__
         assert name != '_reask_for_ledger_status'
         assert name != '_reask_for_last_consistency_proof'
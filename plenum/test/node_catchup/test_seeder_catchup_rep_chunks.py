@@ -0,0 +1,137 @@
+import logging
+import random
+import string
+from typing import Any, Optional, Callable, Iterable
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from ledger.ledger import Ledger
+from plenum.common.channel import create_direct_channel
+from plenum.common.constants import DOMAIN_LEDGER_ID
+from plenum.common.messages.node_messages import CatchupReq
+from plenum.server.catchup.seeder_service import NodeSeederService
+from plenum.server.catchup.utils import CatchupDataProvider
+from plenum.test.testing_utils import FakeSomething
+from stp_zmq.zstack import ZStack
+
+MSG_LEN_LIMIT = 16 * 1024
+TXNS_COUNT = 200
+
+
+class FakeSeederProvider(CatchupDataProvider):
+    def __init__(self, ledger):
+        self._ledger = ledger
+        self.sent = []
+        self.discarded = []
+
+    def node_name(self):
+        return 'Alpha'
+
+    def all_nodes_names(self):
+        return ['Alpha', 'Beta']
+
+    def ledgers(self):
+        return [DOMAIN_LEDGER_ID]
+
+    def ledger(self, ledger_id: int):
+        return self._ledger if ledger_id == DOMAIN_LEDGER_ID else None
+
+    def verifier(self, ledger_id: int):
+        pass
+
+    def eligible_nodes(self):
+        return ['Beta']
+
+    def update_txn_with_extra_data(self, txn: dict) -> dict:
+        return txn
+
+    def transform_txn_for_ledger(self, txn: dict) -> dict:
+        return txn
+
+    def notify_catchup_start(self, ledger_id: int):
+        pass
+
+    def notify_catchup_complete(self, ledger_id: int):
+        pass
+
+    def notify_transaction_added_to_ledger(self, ledger_id: int, txn: dict):
+        pass
+
+    def send_to(self, msg: Any, to: str, message_splitter: Optional[Callable] = None):
+        self.sent.append((msg, to))
+
+    def send_to_nodes(self, msg: Any, nodes: Iterable[str] = None):
+        pass
+
+    def blacklist_node(self, node_name: str, reason: str):
+        pass
+
+    def discard(self, msg, reason, logMethod=logging.error, cliOutput=False):
+        self.discarded.append((msg, reason))
+
+
+@pytest.fixture(scope="function")
+def ledger(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=tdir_for_func)),
+                    dataDir=tdir_for_func)
+    rnd = random.Random(0)
+    for i in range(TXNS_COUNT):
+        ledger.add({
+            'identifier': 'cli' + str(i),
+            'reqId': i + 1,
+            'op': ''.join(rnd.choice(string.ascii_letters)
+                          for _ in range(rnd.randint(10, 1000)))
+        })
+    yield ledger
+    ledger.stop()
+
+
+@pytest.fixture(scope="function")
+def seeder(ledger):
+    _, rx = create_direct_channel()
+    provider = FakeSeederProvider(ledger)
+    return NodeSeederService(rx, provider, FakeSomething(MSG_LEN_LIMIT=MSG_LEN_LIMIT))
+
+
+def test_catchup_reps_fit_into_len_limit(seeder, ledger):
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, TXNS_COUNT, TXNS_COUNT), 'Beta')
+    reps = [rep for rep, to in seeder._provider.sent]
+
+    assert len(reps) > 1
+    received = []
+    for rep in reps:
+        assert len(ZStack.serializeMsg(dict(rep._asdict()))) <= MSG_LEN_LIMIT
+        received.extend(rep.txns.items())
+    assert received == list(ledger.getAllTxn(1, TXNS_COUNT))
+
+
+def test_catchup_reps_are_not_split_more_than_needed(seeder, ledger):
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, TXNS_COUNT, TXNS_COUNT), 'Beta')
+    reps = [rep for rep, to in seeder._provider.sent]
+
+    stored_sizes = {seq_no: size for seq_no, _, size in ledger.get_txns_with_size(1, TXNS_COUNT)}
+    max_txns_size = MSG_LEN_LIMIT - seeder.CATCHUP_REP_OVERHEAD - \
+        2 * TXNS_COUNT.bit_length() * seeder.PROOF_HASH_SIZE
+    # Each reply but the last one would be estimated to exceed the limit
+    # with one more txn
+    for rep, next_rep in zip(reps, reps[1:]):
+        seq_nos = list(rep.txns) + [min(next_rep.txns)]
+        size = sum(int(stored_sizes[seq_no] * seeder.TXN_SIZE_FACTOR) + len(str(seq_no)) + 4
+                   for seq_no in seq_nos)
+        assert size > max_txns_size
+        assert len(ZStack.serializeMsg(dict(rep._asdict()))) > MSG_LEN_LIMIT // 2
+
+
+def test_catchup_reps_have_own_consistency_proofs(seeder, ledger):
+    catchup_till = TXNS_COUNT
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 11, 150, catchup_till), 'Beta')
+    reps = [rep for rep, to in seeder._provider.sent]
+
+    assert min(min(rep.txns) for rep in reps) == 11
+    assert max(max(rep.txns) for rep in reps) == 150
+    for rep in reps:
+        last_seq_no = max(rep.txns)
+        proof = ledger.tree.consistency_proof(last_seq_no, catchup_till)
+        assert rep.consProof == [Ledger.hashToStr(p) for p in proof]
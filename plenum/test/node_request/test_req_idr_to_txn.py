@@ -4,6 +4,7 @@ import pytest
 
 from plenum.persistence.req_id_to_txn import ReqIdrToTxn
 from storage.helper import initKeyValueStorage
+from storage.kv_in_memory import KeyValueStorageInMemory
 
 
 @pytest.fixture(scope="module")
@@ -70,3 +71,63 @@ def test_req_id_to_txn_add_batch_same_full_and_payload_digests(req_ids_to_txn):
         assert payload_digest == digest
         assert req_ids_to_txn.get_by_payload_digest(payload_digest) == (ledger_id, seq_no)
         assert req_ids_to_txn.get_by_full_digest(digest) == payload_digest
+
+
+def test_req_id_to_txn_reads_old_format():
+    storage = KeyValueStorageInMemory()
+    storage.put('old_payload', '1~123')
+    req_ids_to_txn = ReqIdrToTxn(storage)
+
+    assert req_ids_to_txn.get_by_payload_digest('old_payload') == (1, 123)
+    # The value is rewritten in the binary format once it is read
+    assert storage.get('old_payload') == req_ids_to_txn._create_value(1, 123)
+    req_ids_to_txn._cache.clear()
+    assert req_ids_to_txn.get_by_payload_digest('old_payload') == (1, 123)
+
+
+def test_req_id_to_txn_size_is_tracked():
+    storage = KeyValueStorageInMemory()
+    req_ids_to_txn = ReqIdrToTxn(storage, cache_size=2)
+    req_ids_to_txn.add('payload0', 1, 1, 'digest0')
+    assert req_ids_to_txn.size == 2
+
+    assert req_ids_to_txn.get_by_payload_digest('payload1') == (None, None)
+    req_ids_to_txn.addBatch([('payload{}'.format(i), 1, i, 'digest{}'.format(i))
+                             for i in range(4)])
+    assert req_ids_to_txn.size == storage.size == 8
+
+    # Adding keys cached as existing does not change the size
+    req_ids_to_txn.add('payload3', 1, 3, 'digest3')
+    req_ids_to_txn.add('payload3', 1, 3, None)
+    assert req_ids_to_txn.size == storage.size == 8
+
+
+def test_req_id_to_txn_size_does_not_read_storage():
+    storage = KeyValueStorageInMemory()
+    req_ids_to_txn = ReqIdrToTxn(storage, cache_size=2)
+    assert req_ids_to_txn.size == 0
+
+    def fail(*args):
+        raise AssertionError('storage is read')
+
+    storage.get = fail
+    storage._has_key = fail
+    req_ids_to_txn.addBatch([('payload{}'.format(i), 1, i, 'digest{}'.format(i))
+                             for i in range(4)] + [('payload0', 1, 0, 'digest0')])
+    assert req_ids_to_txn.size == 8
+
+
+def test_req_id_to_txn_cache_is_bounded():
+    req_ids_to_txn = ReqIdrToTxn(KeyValueStorageInMemory(), cache_size=2)
+    req_ids_to_txn.addBatch([('payload{}'.format(i), 1, i, 'digest{}'.format(i))
+                             for i in range(4)])
+    assert list(req_ids_to_txn._cache) == ['payload2', 'payload3']
+
+    assert req_ids_to_txn.get_by_payload_digest('payload0') == (1, 0)
+    assert list(req_ids_to_txn._cache) == ['payload3', 'payload0']
+    assert req_ids_to_txn.get_by_payload_digest('unknown') == (None, None)
+    assert list(req_ids_to_txn._cache) == ['payload0', 'unknown']
+
+    # Digest which was not found is not cached as absent once added
+    req_ids_to_txn.add('unknown', 2, 10, None)
+    assert req_ids_to_txn.get_by_payload_digest('unknown') == (2, 10)
@@ -0,0 +1,55 @@
+from copy import copy
+
+import pytest
+
+from plenum.common.stacks import nodeStackClass
+from stp_core.network.auth_mode import AuthMode
+from stp_core.network.port_dispenser import genHa
+from stp_core.test.helper import connectStack
+from stp_zmq.test.helper import genKeys
+from stp_zmq.wire_codec import MsgPackWireCodec
+
+
+@pytest.fixture()
+def registry():
+    return {
+        'Alpha': genHa(),
+        'Beta': genHa(),
+    }
+
+
+@pytest.fixture(scope="function")
+def create_stacks(tdir, registry):
+    """
+    Creates two connected node stacks with given lists of supported
+    features, collecting received messages in `received`
+    """
+    stacks = []
+
+    def create(features):
+        genKeys(tdir, registry.keys())
+        for (name, ha), stack_features in zip(registry.items(), features):
+            received = []
+            stackParams = dict(name=name, ha=ha, basedirpath=tdir,
+                               auth_mode=AuthMode.RESTRICTED.value)
+            reg = copy(registry)
+            reg.pop(name)
+            stack = nodeStackClass(stackParams, received.append, reg)
+            stack.received = received
+            stack.supported_features = set()
+            stack.wire_codecs.clear()
+            for feature in stack_features:
+                if feature == MsgPackWireCodec.name:
+                    stack.add_wire_codec(MsgPackWireCodec())
+                else:
+                    stack.supported_features.add(feature)
+            stack.start()
+            stacks.append(stack)
+        a, b = stacks
+        connectStack(a, b)
+        connectStack(b, a)
+        return a, b
+
+    yield create
+    for stack in stacks:
+        stack.stop()
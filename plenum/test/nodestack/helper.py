@@ -0,0 +1,104 @@
+import os
+
+import base58
+
+from plenum.common.constants import BATCH, OP_FIELD_NAME, DOMAIN_LEDGER_ID, \
+    NYM, TARGET_NYM, TXN_TYPE
+from plenum.common.messages.node_messages import PrePrepare, Commit, CatchupRep
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.txn_util import reqToTxn, append_txn_metadata
+from plenum.common.types import f, OPERATION
+from plenum.common.util import get_utc_epoch
+from stp_core.loop.eventually import eventually
+
+
+async def exchange(*stacks):
+    for stack in stacks:
+        stack.flushOutBoxes()
+    for stack in stacks:
+        await stack.service()
+
+
+async def check_connected(a, b):
+    await exchange(a, b)
+    assert a.getRemote(b.name).isConnected
+    assert b.getRemote(a.name).isConnected
+
+
+async def check_features(a, b, features):
+    await exchange(a, b)
+    assert a.getRemote(b.name).features == features
+    assert b.getRemote(a.name).features == features
+
+
+def make_msgs(count):
+    return [{'op': 'TEST', 'data': 'msg {}'.format(i)} for i in range(count)]
+
+
+def send_and_check(looper, a, b, msgs, expected=None):
+    """
+    Sends `msgs` from `a` to `b`, checks that `b` gets them (or `expected`
+    if given) in the same order and returns what was transmitted by `a`
+    """
+    expected = msgs if expected is None else expected
+    transmitted = []
+    transmit = a.transmit
+
+    def spy(msg, uid, timeout=None, serialized=False):
+        transmitted.append(msg)
+        return transmit(msg, uid, timeout=timeout, serialized=serialized)
+
+    a.transmit = spy
+    for msg in msgs:
+        a.send(msg, b.name)
+    a.flushOutBoxes()
+    a.transmit = transmit
+
+    async def check_received():
+        await b.service()
+        received = []
+        for msg, frm in b.received:
+            if msg.get(OP_FIELD_NAME) == BATCH:
+                received.extend(b.deserializeMsg(m) for m in msg[f.MSGS.nm])
+            else:
+                received.append(msg)
+        assert received == expected
+
+    looper.run(eventually(check_received))
+    return transmitted
+
+
+def random_b58(size=32):
+    return base58.b58encode(os.urandom(size)).decode()
+
+
+def wire_payloads(digests_count=1000, txns_count=1000):
+    """
+    Node messages as large as they get in a loaded pool: a PRE-PREPARE of
+    `digests_count` requests, a COMMIT with a BLS signature and a CATCHUP_REP
+    of `txns_count` signed NYM transactions
+    """
+    pre_prepare = PrePrepare(0, 1, 100, get_utc_epoch(),
+                             [os.urandom(32).hex() for _ in range(digests_count)],
+                             None, os.urandom(32).hex(), DOMAIN_LEDGER_ID,
+                             random_b58(), random_b58(), 0, True,
+                             random_b58(), random_b58())
+    commit = Commit(0, 1, 100, random_b58(128))
+
+    signer = SimpleSigner()
+    txns = {}
+    for seq_no in range(1, txns_count + 1):
+        req_data = {
+            f.IDENTIFIER.nm: signer.identifier,
+            f.REQ_ID.nm: seq_no,
+            OPERATION: {TXN_TYPE: NYM, TARGET_NYM: random_b58(16)},
+            f.PROTOCOL_VERSION.nm: 2,
+        }
+        req_data[f.SIG.nm] = signer.sign(req_data)
+        txn = reqToTxn(Request(**req_data))
+        txns[seq_no] = append_txn_metadata(txn, seq_no=seq_no, txn_time=get_utc_epoch())
+    catchup_rep = CatchupRep(DOMAIN_LEDGER_ID, txns,
+                             [random_b58() for _ in range(10)])
+
+    return [pre_prepare, commit, catchup_rep]
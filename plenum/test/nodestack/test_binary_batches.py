@@ -0,0 +1,57 @@
+import pytest
+
+from plenum.test.nodestack.helper import check_connected, check_features, \
+    send_and_check, make_msgs
+from stp_core.loop.eventually import eventually
+from stp_zmq.zstack import ZStack
+
+
+def test_binary_batch_packing():
+    msgs = [b'{"op": "A"}', b'\x00\x01 binary', b'']
+    batch = ZStack.pack_binary_batch(msgs)
+    assert batch.startswith(ZStack.binaryBatchPrefix)
+    assert ZStack.unpack_binary_batch(batch) == msgs
+    assert len(batch) <= ZStack.binary_batch_len(sum(len(m) for m in msgs), len(msgs))
+
+    with pytest.raises(ValueError):
+        ZStack.unpack_binary_batch(ZStack.binaryBatchPrefix + b'{"op": "A"}')
+
+
+def test_binary_batches_respect_len_limit(create_stacks):
+    a, _ = create_stacks([[], []])
+    msg = b'x' * 1000
+    limit = a.msg_len_val.max_allowed
+    msgs = [msg] * (3 * limit // len(msg))
+
+    batches = a._make_binary_batches(list(msgs))
+    assert len(batches) > 2
+    assert sum(size for _, size in batches) == len(msgs)
+    unpacked = []
+    for batch, size in batches:
+        assert len(batch) <= limit
+        unpacked.extend(ZStack.unpack_binary_batch(batch))
+    assert unpacked == msgs
+
+
+def test_binary_batches_used_when_both_support(looper, create_stacks):
+    a, b = create_stacks([[ZStack.BINARY_BATCH_FEATURE],
+                          [ZStack.BINARY_BATCH_FEATURE]])
+    looper.run(eventually(check_connected, a, b))
+    looper.run(eventually(check_features, a, b, {ZStack.BINARY_BATCH_FEATURE}))
+
+    transmitted = send_and_check(looper, a, b, make_msgs(20))
+    assert len(transmitted) == 1
+    assert transmitted[0].startswith(ZStack.binaryBatchPrefix)
+
+
+def test_json_batches_used_with_not_supporting_remote(looper, create_stacks):
+    a, b = create_stacks([[ZStack.BINARY_BATCH_FEATURE], []])
+    looper.run(eventually(check_connected, a, b))
+    # Beta gets Alpha's features but does not support them
+    looper.run(eventually(check_features, a, b, set()))
+    assert b.getRemote(a.name).isConnected
+
+    transmitted = send_and_check(looper, a, b, make_msgs(20))
+    assert len(transmitted) == 1
+    assert not transmitted[0].startswith(ZStack.binaryBatchPrefix)
+
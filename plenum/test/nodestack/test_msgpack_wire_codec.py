@@ -0,0 +1,92 @@
+import pytest
+
+from plenum.common.message_processor import MessageProcessor
+from plenum.common.messages.node_messages import CatchupRep
+from plenum.test.nodestack.helper import check_connected, check_features, \
+    send_and_check, make_msgs, wire_payloads
+from stp_core.loop.eventually import eventually
+from stp_zmq.wire_codec import MsgPackWireCodec, msgpack_codec
+from stp_zmq.zstack import ZStack
+
+MSGPACK = MsgPackWireCodec.name
+
+
+@pytest.fixture(scope='module')
+def payloads():
+    return [MessageProcessor().toDict(msg)
+            for msg in wire_payloads(digests_count=10, txns_count=10)]
+
+
+def test_msgpack_gives_same_messages_as_json(payloads):
+    for payload in payloads:
+        encoded = msgpack_codec.encode(payload)
+        assert MsgPackWireCodec.is_encoded(encoded)
+        assert ZStack.deserializeMsg(encoded) == \
+            ZStack.deserializeMsg(ZStack.serializeMsg(payload))
+
+
+def test_msgpack_catchup_rep_keys_are_strings(payloads):
+    catchup_rep = ZStack.deserializeMsg(msgpack_codec.encode(payloads[2]))
+    assert all(isinstance(k, str) for k in catchup_rep['txns'])
+    CatchupRep(**catchup_rep)
+
+
+def test_only_msgpack_messages_are_told_encoded(payloads):
+    for msg in [ZStack.serializeMsg(payloads[0]), b'pi', b'po', b'',
+                ZStack.pack_binary_batch([b'{}']), '{}']:
+        assert not MsgPackWireCodec.is_encoded(msg)
+
+
+def test_msgpack_used_when_both_support(looper, create_stacks):
+    a, b = create_stacks([[MSGPACK], [MSGPACK]])
+    looper.run(eventually(check_connected, a, b))
+    looper.run(eventually(check_features, a, b, {MSGPACK}))
+
+    transmitted = send_and_check(looper, a, b, make_msgs(20))
+    assert len(transmitted) == 1
+    assert MsgPackWireCodec.is_encoded(transmitted[0])
+
+    transmitted = send_and_check(looper, b, a, make_msgs(1))
+    assert MsgPackWireCodec.is_encoded(transmitted[0])
+
+
+def test_msgpack_with_binary_batches(looper, create_stacks):
+    features = [MSGPACK, ZStack.BINARY_BATCH_FEATURE]
+    a, b = create_stacks([features, features])
+    looper.run(eventually(check_connected, a, b))
+    looper.run(eventually(check_features, a, b, set(features)))
+
+    msgs = make_msgs(20)
+    transmitted = send_and_check(looper, a, b, msgs)
+    assert len(transmitted) == 1
+    # Pongs and features messages may go in the same batch
+    frames = [frame for frame in ZStack.unpack_binary_batch(transmitted[0])
+              if frame not in ZStack.healthMessages and
+              not frame.startswith(ZStack.featuresMessageStart.encode())]
+    assert len(frames) == len(msgs)
+    assert all(MsgPackWireCodec.is_encoded(frame) for frame in frames)
+
+
+def test_json_used_with_not_supporting_remote(looper, create_stacks):
+    a, b = create_stacks([[MSGPACK], []])
+    looper.run(eventually(check_connected, a, b))
+    looper.run(eventually(check_features, a, b, set()))
+
+    transmitted = send_and_check(looper, a, b, make_msgs(20))
+    assert not MsgPackWireCodec.is_encoded(transmitted[0])
+
+
+def test_queued_msgpack_messages_sent_as_json_after_features_lost(looper, create_stacks):
+    a, b = create_stacks([[MSGPACK], [MSGPACK]])
+    looper.run(eventually(check_connected, a, b))
+    looper.run(eventually(check_features, a, b, {MSGPACK}))
+
+    msgs = make_msgs(5)
+    for msg in msgs[:3]:
+        a.send(msg, b.name)
+    # The remote got disconnected before the queued messages were sent
+    a.getRemote(b.name).features = set()
+
+    transmitted = send_and_check(looper, a, b, msgs[3:], expected=msgs)
+    assert len(transmitted) == 1
+    assert not MsgPackWireCodec.is_encoded(transmitted[0])
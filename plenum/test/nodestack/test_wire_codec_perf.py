@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from plenum.common.message_processor import MessageProcessor
+from plenum.test.nodestack.helper import wire_payloads
+from stp_zmq.wire_codec import msgpack_codec
+from stp_zmq.zstack import ZStack
+
+"""
+Compares serialization of node messages with JSON and msgpack wire codecs
+on a PRE-PREPARE with 1000 requests, a COMMIT and a CATCHUP_REP with 1000
+transactions. Should only be run when a perf check is required by setting
+`SkipTests` to False, run with `-s` to see the results.
+"""
+SkipTests = True
+skipper = pytest.mark.skipif(SkipTests, reason='Benchmark, run manually')
+
+ITERATIONS = 200
+
+
+def measure(func, arg):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(arg)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+@skipper
+def test_wire_codecs_perf():
+    codecs = [('json', ZStack.serializeMsg),
+              ('msgpack', msgpack_codec.encode)]
+    for msg in wire_payloads(digests_count=1000, txns_count=1000):
+        payload = MessageProcessor().toDict(msg)
+        for name, encode in codecs:
+            data = encode(payload)
+            encode_time = measure(encode, payload)
+            # Received data is always dispatched by ZStack
+            decode_time = measure(ZStack.deserializeMsg, data)
+            print('{:<12} {:<8} size {:>8} bytes, encode {:8.3f} ms, decode {:8.3f} ms'
+                  .format(msg.typename, name, len(data),
+                          encode_time * 1000, decode_time * 1000))
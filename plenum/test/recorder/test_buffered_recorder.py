@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from plenum.common.constants import KeyValueStorageType
+from plenum.recorder.buffered_recorder import BufferedRecorder
+from plenum.recorder.combined_recorder import CombinedRecorder
+from plenum.recorder.recorder import Recorder
+from storage.helper import initKeyValueStorageIntKeys
+from storage.kv_store_leveldb_int_keys import KeyValueStorageLeveldbIntKeys
+
+
+def create_buffered_recorder(tmpdir_factory, name, buffer_size=100, flush_interval=60):
+    storage = KeyValueStorageLeveldbIntKeys(tmpdir_factory.mktemp('').strpath, name)
+    return BufferedRecorder(storage, buffer_size, flush_interval)
+
+
+@pytest.fixture()
+def buffered_recorder(tmpdir_factory):
+    recorder = create_buffered_recorder(tmpdir_factory, 'test_db')
+    yield recorder
+    recorder.stop()
+
+
+def test_buffered_recorder_writes_in_batches(buffered_recorder):
+    buffered_recorder.add_incoming(b'm1', 'f1')
+    buffered_recorder.add_outgoing('m2', 't1', 't2')
+    buffered_recorder.add_disconnecteds('a', 'b')
+    assert buffered_recorder.store.size == 0
+
+    buffered_recorder.flush()
+    items = list(buffered_recorder.store.iterator(include_value=True))
+    # Every record has its own key even if added at the same time
+    keys = [int(k) for k, _ in items]
+    assert keys == sorted(set(keys))
+    assert [Recorder.get_parsed(v) for _, v in items] == [
+        [[Recorder.INCOMING_FLAG, b'm1', 'f1']],
+        [[Recorder.OUTGOING_FLAG, 'm2', 't1', 't2']],
+        [[Recorder.DISCONN_FLAG, 'a', 'b']]
+    ]
+    assert Recorder.get_parsed(items[0][1], only_incoming=True) == [[b'm1', 'f1']]
+
+
+def test_buffered_recorder_flushes_periodically(tmpdir_factory):
+    recorder = create_buffered_recorder(tmpdir_factory, 'test_db', flush_interval=.1)
+    recorder.add_incoming('m1', 'f1')
+    time.sleep(.5)
+    assert recorder.store.size == 1
+    recorder.stop()
+
+
+def test_buffered_recorder_drops_oldest(tmpdir_factory):
+    recorder = create_buffered_recorder(tmpdir_factory, 'test_db', buffer_size=3)
+    for i in range(5):
+        recorder.add_incoming('m{}'.format(i), 'f')
+    assert recorder.dropped == 2
+    recorder.flush()
+    assert [Recorder.get_parsed(v)[0][1] for _, v in recorder.store.iterator(include_value=True)] == \
+        ['m2', 'm3', 'm4']
+    recorder.stop()
+
+
+def test_combined_recorder_streams_buffered_recorders(tmpdir_factory):
+    r1 = create_buffered_recorder(tmpdir_factory, 'r1')
+    r2 = create_buffered_recorder(tmpdir_factory, 'r2')
+
+    r1.add_incoming('m1', 'f1')
+    time.sleep(.1)
+    r2.add_outgoing('m2', 'f2')
+    time.sleep(.1)
+    r1.add_disconnecteds('x', 'y')
+
+    kv_store = initKeyValueStorageIntKeys(KeyValueStorageType.Leveldb,
+                                          tmpdir_factory.mktemp('').strpath,
+                                          'combined_recorder')
+    cr = CombinedRecorder(kv_store)
+    cr.add_recorders(r1, r2)
+    cr.start_playing()
+
+    played = []
+    start = time.perf_counter()
+    while cr.is_playing and time.perf_counter() < start + 10:
+        vals = cr.get_next()
+        if vals:
+            played.append(vals)
+    assert played == [
+        [[[Recorder.INCOMING_FLAG, 'm1', 'f1']], []],
+        [[], [[Recorder.OUTGOING_FLAG, 'm2', 'f2']]],
+        [[[Recorder.DISCONN_FLAG, 'x', 'y']], []]
+    ]
+    # Nothing was copied to the combined store
+    assert kv_store.size == 0
+    for r in (r1, r2, cr):
+        r.stop()
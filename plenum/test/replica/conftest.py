@@ -1,8 +1,9 @@
 import pytest
-from orderedset._orderedset import OrderedSet
 
 from plenum.common.event_bus import InternalBus
+from plenum.common.exceptions import InvalidClientMessageException, SuspiciousPrePrepare
 from plenum.common.messages.node_messages import PrePrepare
+from plenum.common.request_queue import RequestQueue
 from plenum.common.startable import Mode
 from plenum.common.constants import POOL_LEDGER_ID, DOMAIN_LEDGER_ID, CURRENT_PROTOCOL_VERSION, AUDIT_LEDGER_ID
 from plenum.common.util import get_utc_epoch
@@ -68,6 +69,17 @@ class ReplicaFakeNode(FakeSomething):
         for replica in self.replicas:
             replica._consensus_data.view_no = self.viewNo
 
+    def applyReqs(self, reqs, cons_time):
+        errors = []
+        for req in reqs:
+            try:
+                self.doDynamicValidation(req, cons_time)
+            except (InvalidClientMessageException, SuspiciousPrePrepare) as ex:
+                errors.append(ex)
+            else:
+                errors.append(None)
+        return errors
+
 
 @pytest.fixture(scope='function', params=[0, 10])
 def viewNo(tconf, request):
@@ -143,7 +155,7 @@ def replica(tconf, viewNo, inst_id, ledger_ids, mock_timestamp, fake_requests, t
     replica.txnRootHash = lambda ledger, to_str=False: txn_roots[ledger]
     replica.stateRootHash = lambda ledger, to_str=False: state_roots[ledger]
 
-    replica.requestQueues[DOMAIN_LEDGER_ID] = OrderedSet()
+    replica.requestQueues[DOMAIN_LEDGER_ID] = RequestQueue()
 
     replica._get_primaries_for_ordered = lambda pp: [replica.primaryName]
 
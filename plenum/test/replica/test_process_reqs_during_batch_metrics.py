@@ -0,0 +1,23 @@
+from plenum.common.metrics_collector import MetricsName
+from plenum.server.replica import Replica
+from plenum.test.metrics.helper import MockMetricsCollector
+from plenum.test.testing_utils import FakeSomething
+
+
+def test_processing_time_is_reported_per_request():
+    metrics = MockMetricsCollector()
+    replica = FakeSomething(isMaster=True,
+                            metrics=metrics,
+                            node=FakeSomething(applyReqs=lambda reqs, cons_time: [None] * len(reqs)))
+
+    assert Replica.processReqsDuringBatch(replica, ['req1', 'req2', 'req3'], 0) == [None] * 3
+    metrics.flush_accumulated()
+    assert [(event.name, event.count) for event in metrics.events] == \
+        [(MetricsName.REQUEST_PROCESSING_TIME, 3)]
+
+    replica.isMaster = False
+    Replica.processReqsDuringBatch(replica, ['req1', 'req2'], 0)
+    Replica.processReqsDuringBatch(replica, [], 0)
+    metrics.flush_accumulated()
+    assert [(event.name, event.count) for event in metrics.events[1:]] == \
+        [(MetricsName.BACKUP_REQUEST_PROCESSING_TIME, 2)]
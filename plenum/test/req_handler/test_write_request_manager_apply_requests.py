@@ -0,0 +1,108 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from plenum.common.constants import NYM, TARGET_NYM, TXN_TYPE, DOMAIN_LEDGER_ID
+from plenum.common.exceptions import InvalidClientRequest, SuspiciousPrePrepare
+from plenum.common.ledger import Ledger
+from plenum.common.request import Request
+from plenum.common.txn_util import get_seq_no, get_payload_data
+from plenum.server.database_manager import DatabaseManager
+from plenum.server.request_handlers.nym_handler import NymHandler
+from plenum.server.request_managers.write_request_manager import WriteRequestManager
+from state.pruning_state import PruningState
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+BATCH_TS = 1000
+
+
+def create_write_manager(tconf, data_dir):
+    db_manager = DatabaseManager()
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=data_dir)),
+                    dataDir=data_dir)
+    db_manager.register_new_database(DOMAIN_LEDGER_ID, ledger,
+                                     PruningState(KeyValueStorageInMemory()))
+    write_manager = WriteRequestManager(db_manager)
+    write_manager.register_req_handler(NymHandler(tconf, db_manager))
+    return write_manager
+
+
+@pytest.fixture(scope="function")
+def managers(tconf, tdir_for_func):
+    managers = [create_write_manager(tconf, tdir_for_func + '/' + name)
+                for name in ('batched', 'one_by_one')]
+    yield managers
+    for manager in managers:
+        manager.database_manager.get_ledger(DOMAIN_LEDGER_ID).stop()
+
+
+def nym_requests(count, start=0):
+    return [Request(identifier='identifier{}'.format(i % 2),
+                    reqId=i,
+                    operation={TXN_TYPE: NYM,
+                               TARGET_NYM: 'nym{}'.format(i)})
+            for i in range(start, start + count)]
+
+
+def test_apply_requests_same_as_one_by_one(managers):
+    batched, one_by_one = managers
+    ledger = batched.database_manager.get_ledger(DOMAIN_LEDGER_ID)
+    for start in (0, 10):
+        reqs = nym_requests(10, start)
+        assert batched.apply_requests(reqs, BATCH_TS) == [None] * len(reqs)
+        for req in reqs:
+            one_by_one.apply_request(req, BATCH_TS)
+
+    expected_ledger = one_by_one.database_manager.get_ledger(DOMAIN_LEDGER_ID)
+    assert ledger.uncommittedTxns == expected_ledger.uncommittedTxns
+    assert [get_seq_no(txn) for txn in ledger.uncommittedTxns] == list(range(1, 21))
+    assert ledger.uncommittedRootHash == expected_ledger.uncommittedRootHash
+    assert ledger.uncommittedTree.hashes == expected_ledger.uncommittedTree.hashes
+    assert batched.database_manager.get_state(DOMAIN_LEDGER_ID).headHash == \
+        one_by_one.database_manager.get_state(DOMAIN_LEDGER_ID).headHash
+
+    # Every batch can be discarded separately
+    ledger.discardTxns(10)
+    expected_ledger.discardTxns(10)
+    assert ledger.uncommittedRootHash == expected_ledger.uncommittedRootHash
+    ledger.commitTxns(10)
+    assert ledger.root_hash == Ledger.hashToStr(ledger.tree.root_hash)
+    assert ledger.size == 10 and not ledger.uncommittedTxns
+
+
+def test_apply_requests_rejects_invalid(managers):
+    manager = managers[0]
+    ledger = manager.database_manager.get_ledger(DOMAIN_LEDGER_ID)
+    reqs = nym_requests(6)
+
+    def validate(req):
+        if req.reqId == 2:
+            raise InvalidClientRequest(req.identifier, req.reqId)
+        # Requests applied before are already seen as uncommitted txns
+        if any(get_payload_data(txn)[TARGET_NYM] == req.operation[TARGET_NYM]
+               for txn in ledger.uncommittedTxns):
+            raise SuspiciousPrePrepare('Trying to order already ordered request')
+
+    results = manager.apply_requests(reqs + reqs[:1], BATCH_TS, validate=validate)
+    assert [type(ex) if ex else None for ex in results] == \
+        [None, None, InvalidClientRequest, None, None, None, SuspiciousPrePrepare]
+    assert [get_payload_data(txn)[TARGET_NYM] for txn in ledger.uncommittedTxns] == \
+        ['nym0', 'nym1', 'nym3', 'nym4', 'nym5']
+    assert ledger.uncommittedRootHash == \
+        ledger.tree_with_applied_hashes(ledger._uncommitted_leaf_hashes).root_hash
+
+
+def test_txns_batch_is_finished_on_error(managers):
+    manager = managers[0]
+    ledger = manager.database_manager.get_ledger(DOMAIN_LEDGER_ID)
+
+    def validate(req):
+        if req.reqId == 3:
+            raise ValueError()
+
+    with pytest.raises(ValueError):
+        manager.apply_requests(nym_requests(5), BATCH_TS, validate=validate)
+    assert len(ledger.uncommittedTxns) == 3
+    assert ledger.uncommitted_size == 3
+    ledger.start_txns_batch()
+    ledger.finish_txns_batch()
@@ -45,6 +45,19 @@ def testReadWrite(hashStore, nodesLeaves):
     assert onebyone == multiple
 
 
+def testBulkWrite(hashStore, nodesLeaves):
+    cleanup(hashStore)
+    _, leaves = nodesLeaves
+    nodes = [(start, height, leaves[i])
+             for i, (start, height) in enumerate([(2, 1), (4, 2), (4, 1)])]
+    hashStore.writeLeafs(leaves)
+    hashStore.writeNodes(nodes)
+    assert hashStore.leafCount == len(leaves)
+    assert hashStore.readLeafs(1, 10) == leaves
+    for start, height, nodeHash in nodes:
+        assert hashStore.readNodeByTree(start, height) == nodeHash
+
+
 def testRecoverLedgerFromHashStore(hashStore, tconf, tdir):
     cleanup(hashStore)
     tree = CompactMerkleTree(hashStore=hashStore)
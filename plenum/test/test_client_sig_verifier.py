@@ -0,0 +1,214 @@
+import time
+
+import pytest
+
+from plenum.common.constants import NYM, GET_TXN, TXN_TYPE, TARGET_NYM
+from plenum.common.exceptions import InsufficientCorrectSignatures
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.types import f, OPERATION
+from plenum.server.client_authn import CoreAuthNr, SimpleAuthNr
+from plenum.server.client_sig_verifier import ClientSignatureVerifier, \
+    DeferredSignatureChecks
+from plenum.server.node import Node
+from plenum.server.req_authenticator import ReqAuthenticator
+from plenum.test.testing_utils import FakeSomething
+from stp_core.loop.eventually import eventually
+
+
+@pytest.fixture(scope='module')
+def signer():
+    return SimpleSigner()
+
+
+@pytest.fixture(scope='module')
+def req_authnr(signer):
+    core_authnr = CoreAuthNr([NYM], [GET_TXN], [])
+    core_authnr.addIdr(signer.identifier, signer.verkey)
+    req_authnr = ReqAuthenticator()
+    req_authnr.register_authenticator(core_authnr)
+    return req_authnr
+
+
+@pytest.fixture()
+def verifier():
+    verifier = ClientSignatureVerifier(workers=2, batch_size=3, max_pending=10)
+    yield verifier
+    verifier.stop()
+
+
+def signed_request(signer, req_id, valid=True, txn_type=NYM):
+    req_data = {
+        f.IDENTIFIER.nm: signer.identifier,
+        f.REQ_ID.nm: req_id,
+        OPERATION: {TXN_TYPE: txn_type, TARGET_NYM: 'dest{}'.format(req_id)}
+    }
+    req_data[f.SIG.nm] = signer.sign(req_data)
+    if not valid:
+        req_data[OPERATION][TARGET_NYM] = 'other'
+    return Request(**req_data)
+
+
+def prepare(req_authnr, req):
+    checks = DeferredSignatureChecks()
+    checks.identifiers = req_authnr.authenticate(req.as_dict, key=req.key,
+                                                 verifier=checks)
+    return checks
+
+
+def test_deferred_checks_do_not_verify(req_authnr, signer):
+    req = signed_request(signer, 1, valid=False)
+    checks = prepare(req_authnr, req)
+
+    assert checks.identifiers == {signer.identifier}
+    assert len(checks.checks) == 1
+    assert isinstance(checks.verify(), InsufficientCorrectSignatures)
+    # Request is not remembered as verified
+    assert not req_authnr._check_and_verify_existing_req(req.as_dict, req.key)
+
+
+def test_deferred_checks_of_valid_request(req_authnr, signer):
+    req = signed_request(signer, 2)
+    checks = prepare(req_authnr, req)
+    assert checks.verify() is None
+
+    req_authnr.add_verified(req.key, req.as_dict, checks.identifiers)
+    # Verified requests do not need checks anymore
+    assert prepare(req_authnr, req).checks == []
+
+
+def test_results_are_returned_in_order(looper, req_authnr, signer, verifier):
+    reqs = [signed_request(signer, i, valid=i % 4 != 0)
+            for i in range(10, 30)]
+    for req in reqs:
+        verifier.add(req, prepare(req_authnr, req))
+    verifier.flush()
+
+    results = []
+
+    def check_all_verified():
+        results.extend(verifier.service())
+        assert len(results) == len(reqs)
+
+    looper.run(eventually(check_all_verified))
+    assert [req for req, _, _ in results] == reqs
+    for req, checks, error in results:
+        if req.reqId % 4 == 0:
+            assert isinstance(error, InsufficientCorrectSignatures)
+        else:
+            assert error is None
+            assert checks.identifiers == {signer.identifier}
+    assert len(verifier) == 0
+
+
+def test_requests_are_submitted_in_batches(req_authnr, signer, verifier):
+    # 2 workers by 3 requests, so 5 requests are only collected
+    for i in range(5):
+        req = signed_request(signer, 100 + i)
+        verifier.add(req, prepare(req_authnr, req))
+    time.sleep(0.1)
+    assert verifier.service() == []
+    assert len(verifier) == 5
+
+    req = signed_request(signer, 105)
+    verifier.add(req, prepare(req_authnr, req))
+    time.sleep(0.1)
+    assert len(verifier.service()) == 6
+
+
+def test_verifier_takes_up_to_max_pending(req_authnr, signer, verifier):
+    for i in range(10):
+        assert not verifier.is_full
+        req = signed_request(signer, 200 + i)
+        verifier.add(req, prepare(req_authnr, req))
+    assert verifier.is_full
+
+
+def test_verifier_can_be_used_after_stop(looper, req_authnr, signer, verifier):
+    verifier.stop()
+    req = signed_request(signer, 300)
+    verifier.add(req, prepare(req_authnr, req))
+    verifier.flush()
+
+    def check_verified():
+        assert [error for _, _, error in verifier.service()] == [None]
+
+    looper.run(eventually(check_verified))
+
+
+def test_accepts_verifier_only_if_all_authenticators_do(signer):
+    req_authnr = ReqAuthenticator()
+    req_authnr.register_authenticator(CoreAuthNr([NYM], [GET_TXN], []))
+    assert req_authnr.accepts_verifier
+    # Authenticators following ClientAuthNr interface take no verifier
+    req_authnr.register_authenticator(SimpleAuthNr())
+    assert not req_authnr.accepts_verifier
+
+
+def test_checked_requests_do_not_overtake_pending_ones(looper, req_authnr, signer, verifier):
+    reqs = [signed_request(signer, 400 + i) for i in range(3)]
+    verifier.add(reqs[0], prepare(req_authnr, reqs[0]))
+    verifier.add_checked(reqs[1])
+    verifier.add(reqs[2], prepare(req_authnr, reqs[2]))
+    verifier.flush()
+
+    results = []
+
+    def check_all_verified():
+        results.extend(verifier.service())
+        assert len(results) == 3
+
+    looper.run(eventually(check_all_verified))
+    assert [req for req, _, _ in results] == reqs
+    assert [checks is None for _, checks, _ in results] == [False, True, False]
+
+
+def test_reads_are_not_remembered_as_verified(looper, signer, verifier):
+    req_authnr = ReqAuthenticator()
+    core_authnr = CoreAuthNr([NYM], [GET_TXN], [])
+    core_authnr.addIdr(signer.identifier, signer.verkey)
+    req_authnr.register_authenticator(core_authnr)
+    unpacked = []
+    node = FakeSomething(client_sig_verifier=verifier,
+                         authNr=lambda req_data: req_authnr,
+                         is_query=lambda txn_type: False,
+                         clientstack=FakeSomething(name='Alpha'),
+                         unpackClientMsg=lambda req, frm: unpacked.append(req))
+    read = signed_request(signer, 500, txn_type=GET_TXN)
+    write = signed_request(signer, 501)
+    assert not Node.canDeferSignatureVerification(node, read)
+    assert Node.canDeferSignatureVerification(node, write)
+
+    verifier.add((write, 'client'), prepare(req_authnr, write))
+    req_authnr.authenticate(read.as_dict, key=read.key)
+    verifier.add_checked((read, 'client'))
+    # Even a read passed to the verifier has no identifiers to remember
+    verifier.add((read, 'client'), prepare(req_authnr, read))
+    verifier.flush()
+
+    def check_all_processed():
+        Node.processVerifiedClientMsgs(node)
+        assert unpacked == [write, read, read]
+
+    looper.run(eventually(check_all_processed))
+    assert list(req_authnr._verified_reqs) == [write.key]
+
+
+def test_signatures_are_checked_right_away_for_threshold(signer):
+    other = SimpleSigner()
+    authnr = CoreAuthNr([NYM], [GET_TXN], [])
+    for s in (signer, other):
+        authnr.addIdr(s.identifier, s.verkey)
+    req = signed_request(signer, 600)
+    to_sign = {k: v for k, v in req.as_dict.items() if k != f.SIG.nm}
+    signatures = {signer.identifier: signer.sign(dict(to_sign, op='other')),
+                  other.identifier: other.sign(to_sign)}
+
+    checks = DeferredSignatureChecks()
+    # Only the second signature is correct, which is enough for threshold
+    assert authnr.authenticate_multi(to_sign, signatures, threshold=1,
+                                     verifier=checks) == [other.identifier]
+    assert checks.checks == []
+    with pytest.raises(InsufficientCorrectSignatures):
+        authnr.authenticate_multi(to_sign, signatures, threshold=2,
+                                  verifier=checks)
@@ -1,5 +1,7 @@
+from plenum.common.metrics_collector import MetricsName
 from plenum.common.timer import QueueTimer
 from plenum.test.helper import MockTimestamp
+from plenum.test.metrics.helper import MockMetricsCollector
 
 
 class Callback:
@@ -226,3 +228,101 @@ def test_timer_cancels_all_instances_of_callback():
     ts.value += 6
     timer.service()
     assert cb.call_count == 0
+
+
+def test_timer_can_cancel_callback_by_handle():
+    ts = MockTimestamp(0)
+    timer = QueueTimer(ts)
+    cb = Callback()
+
+    event = timer.schedule(5, cb)
+    timer.schedule(3, cb)
+    event.cancel()
+    assert timer.queue_size() == 1
+
+    # Cancelling twice doesn't affect other events
+    event.cancel()
+    assert timer.queue_size() == 1
+
+    ts.value += 6
+    timer.service()
+    assert cb.call_count == 1
+    assert timer.queue_size() == 0
+
+
+def test_timer_ignores_cancel_of_fired_event():
+    ts = MockTimestamp(0)
+    timer = QueueTimer(ts)
+    cb = Callback()
+
+    event = timer.schedule(1, cb)
+    ts.value += 2
+    timer.service()
+    assert event.fired
+    event.cancel()
+    assert not event.cancelled
+    assert timer.queue_size() == 0
+
+    # Same callback scheduled again is not cancelled by the fired event
+    timer.schedule(1, cb)
+    event.cancel()
+    assert timer.queue_size() == 1
+    ts.value += 2
+    timer.service()
+    assert cb.call_count == 2
+
+
+def test_timer_coalesces_same_callbacks():
+    ts = MockTimestamp(0)
+    timer = QueueTimer(ts)
+    cb = Callback()
+
+    event = timer.schedule(5, cb, coalesce=True)
+    assert timer.schedule(7, cb, coalesce=True) is event
+    assert timer.queue_size() == 1
+
+    # Earlier request replaces scheduled callback
+    timer.schedule(3, cb, coalesce=True)
+    assert event.cancelled
+    assert timer.queue_size() == 1
+
+    ts.value += 6
+    timer.service()
+    assert cb.call_count == 1
+
+
+def test_timer_drops_cancelled_events():
+    ts = MockTimestamp(0)
+    timer = QueueTimer(ts)
+    callbacks = [Callback() for _ in range(10 * QueueTimer.COMPACT_MIN_SIZE)]
+
+    for i, cb in enumerate(callbacks):
+        timer.schedule(i, cb)
+    for cb in callbacks[::3]:
+        timer.cancel(cb)
+    for cb in callbacks[1::3]:
+        timer.cancel(cb)
+    assert timer.queue_size() == len(callbacks[2::3])
+    assert len(timer._events) < 2 * timer.queue_size()
+
+    ts.value += len(callbacks)
+    timer.service()
+    assert [cb.call_count for cb in callbacks] == [0, 0, 1] * (len(callbacks) // 3) + [0]
+    assert not timer._events and not timer._pending
+
+
+def test_timer_reports_callback_metrics():
+    ts = MockTimestamp(0)
+    metrics = MockMetricsCollector()
+    timer = QueueTimer(ts, metrics=metrics)
+
+    timer.schedule(5, Callback())
+    timer.schedule(3, Callback())
+    ts.value += 6
+    timer.service()
+    metrics.flush_accumulated()
+
+    events = {ev.name: ev for ev in metrics.events}
+    assert events[MetricsName.TIMER_CALLBACK_DELAY].count == 2
+    assert events[MetricsName.TIMER_CALLBACK_DELAY].sum == 4
+    assert events[MetricsName.TIMER_CALLBACK_TIME].count == 2
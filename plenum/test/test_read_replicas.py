@@ -0,0 +1,201 @@
+import pytest
+
+from common.serializers.serialization import config_state_serializer
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.bls.bls_store import BlsStore
+from plenum.common.constants import NYM, GET_TXN, TXN_TYPE, DATA, DOMAIN_LEDGER_ID, CONFIG_LEDGER_ID, \
+    GET_TXN_AUTHOR_AGREEMENT, TXN_AUTHOR_AGREEMENT_TEXT, TXN_AUTHOR_AGREEMENT_VERSION
+from plenum.common.ledger import Ledger
+from plenum.common.metrics_collector import NullMetricsCollector
+from plenum.common.request import Request
+from plenum.common.txn_util import init_empty_txn, set_payload_data, append_txn_metadata
+from plenum.common.types import f
+from plenum.server.node import Node
+from plenum.server.read_replicas import ReadReplica, ReadReplicas
+from plenum.server.request_handlers.static_taa_helper import StaticTAAHelper
+from plenum.server.request_handlers.utils import encode_state_value
+from plenum.test.testing_utils import FakeSomething
+from state.pruning_state import PruningState
+from storage.helper import initKeyValueStorage, initKeyValueStorageIntKeys, initHashStore
+from stp_core.loop.eventually import eventually
+
+TAA = {TXN_AUTHOR_AGREEMENT_TEXT: 'Some text', TXN_AUTHOR_AGREEMENT_VERSION: 'v1'}
+
+
+class FakeTime:
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self):
+        return self.value
+
+
+@pytest.fixture(scope='function')
+def ledgers(tconf, tdir_for_func):
+    # Every storage is created beforehand since read only views can be
+    # opened only for existing ones
+    ledgers = {lid: Ledger(CompactMerkleTree(hashStore=initHashStore(tdir_for_func, name, tconf)),
+                           dataDir=tdir_for_func,
+                           fileName=getattr(tconf, file_name_option),
+                           config=tconf)
+               for lid, (name, file_name_option) in ReadReplica.LEDGERS.items()}
+    yield ledgers
+    for ledger in ledgers.values():
+        ledger.stop()
+
+
+@pytest.fixture(scope='function')
+def domain_ledger(ledgers):
+    return ledgers[DOMAIN_LEDGER_ID]
+
+
+@pytest.fixture(scope='function')
+def config_state(tconf, tdir_for_func, ledgers):
+    state = PruningState(initKeyValueStorage(tconf.configStateStorage, tdir_for_func, tconf.configStateDbName))
+    stores = [initKeyValueStorageIntKeys(tconf.stateTsStorage, tdir_for_func, tconf.configStateTsDbName),
+              BlsStore(tconf.stateSignatureStorage, tdir_for_func, tconf.stateSignatureDbName)]
+    yield state
+    state.close()
+    for store in stores:
+        store.close()
+
+
+def add_txns(ledger, count):
+    for i in range(count):
+        txn = set_payload_data(init_empty_txn(NYM), {'dest': 'nym{}'.format(ledger.size)})
+        ledger.add(append_txn_metadata(txn, txn_time=1000))
+
+
+def add_taa(state):
+    digest = StaticTAAHelper.taa_digest(TAA[TXN_AUTHOR_AGREEMENT_TEXT], TAA[TXN_AUTHOR_AGREEMENT_VERSION])
+    state.set(StaticTAAHelper.state_path_taa_latest(), digest.encode())
+    state.set(StaticTAAHelper.state_path_taa_digest(digest),
+              encode_state_value(TAA, 1, 1000, serializer=config_state_serializer))
+    state.commit(rootHash=state.headHash)
+
+
+def txn_with_proof(ledger, seq_no):
+    txn = ledger.getBySeqNo(seq_no)
+    txn.update(ledger.merkleInfo(seq_no))
+    return txn
+
+
+def get_txn_request(seq_no, ledger_id=DOMAIN_LEDGER_ID, req_id=1):
+    return Request(identifier='client',
+                   reqId=req_id,
+                   operation={TXN_TYPE: GET_TXN, f.LEDGER_ID.nm: ledger_id, DATA: seq_no})
+
+
+def get_taa_request(req_id=1):
+    return Request(identifier='client', reqId=req_id, operation={TXN_TYPE: GET_TXN_AUTHOR_AGREEMENT})
+
+
+def test_read_replica_serves_get_txn(tconf, tdir_for_func, domain_ledger):
+    add_txns(domain_ledger, 5)
+    now = FakeTime()
+    replica = ReadReplica('Alpha', tconf, tdir_for_func, refresh_interval=1, get_current_time=now)
+
+    ack, reply = replica.process_request(get_txn_request(3), {DOMAIN_LEDGER_ID: 5})
+    assert ack['op'] == 'REQACK'
+    assert reply['result'][DATA] == txn_with_proof(domain_ledger, 3)
+    assert reply['result'][f.SEQ_NO.nm] == 3
+    # Only views the request needs are opened
+    assert list(replica.db_manager.databases) == [DOMAIN_LEDGER_ID]
+
+    # Transactions committed later are seen once the views are old enough
+    add_txns(domain_ledger, 2)
+    _, reply = replica.process_request(get_txn_request(7), {DOMAIN_LEDGER_ID: 7})
+    assert reply['result'][DATA] is None
+    now.value += 1
+    _, reply = replica.process_request(get_txn_request(7), {DOMAIN_LEDGER_ID: 7})
+    assert reply['result'][DATA] == txn_with_proof(domain_ledger, 7)
+
+    # Views are not reopened unless node has committed more
+    view = replica.db_manager.get_ledger(DOMAIN_LEDGER_ID)
+    now.value += 1
+    replica.process_request(get_txn_request(7), {DOMAIN_LEDGER_ID: 7})
+    assert replica.db_manager.get_ledger(DOMAIN_LEDGER_ID) is view
+
+    nack, = replica.process_request(get_txn_request(1, ledger_id=100), {})
+    assert nack['op'] == 'REQNACK'
+    replica.close()
+    assert not replica.db_manager.databases
+
+
+def test_read_replica_serves_taa(tconf, tdir_for_func, config_state):
+    add_taa(config_state)
+    replica = ReadReplica('Alpha', tconf, tdir_for_func, refresh_interval=1)
+
+    ack, reply = replica.process_request(get_taa_request(), {})
+    assert ack['op'] == 'REQACK'
+    assert reply['result'][TXN_TYPE] == GET_TXN_AUTHOR_AGREEMENT
+    assert reply['result'][DATA] == TAA
+    assert list(replica.db_manager.databases) == [CONFIG_LEDGER_ID]
+    replica.close()
+
+
+def test_read_replicas_serve_requests(tconf, tdir_for_func, domain_ledger, config_state, looper):
+    add_txns(domain_ledger, 5)
+    add_taa(config_state)
+    replicas = ReadReplicas(2, max_pending=2,
+                            replica_args=('Alpha', tconf, tdir_for_func, 1),
+                            get_committed_sizes=lambda: {DOMAIN_LEDGER_ID: domain_ledger.size})
+    replicas.start()
+    try:
+        # Requests of other types and to unknown ledgers are left to the node
+        assert not replicas.submit(Request(identifier='client', reqId=1, operation={TXN_TYPE: NYM}), 'client')
+        assert not replicas.submit(get_txn_request(1, ledger_id=100), 'client')
+        assert all(replicas.submit(get_txn_request(seq_no, req_id=seq_no), 'client')
+                   for seq_no in range(1, 4))
+        assert replicas.submit(get_taa_request(req_id=4), 'client')
+        # Every worker has as many requests in progress as it can take
+        assert not replicas.submit(get_txn_request(5, req_id=5), 'client')
+
+        results = []
+
+        def check_replied():
+            results.extend(replicas.service())
+            assert len(results) == 8
+
+        looper.run(eventually(check_replied))
+        assert all(frm == 'client' for _, frm in results)
+        replies = sorted((msg['result'] for msg, _ in results if msg['op'] == 'REPLY'),
+                         key=lambda result: result[f.REQ_ID.nm])
+        assert [result[DATA] for result in replies] == \
+            [txn_with_proof(domain_ledger, seq_no) for seq_no in range(1, 4)] + [TAA]
+    finally:
+        replicas.stop()
+
+
+def test_node_gives_reads_to_read_replicas(tconf, tdir_for_func, domain_ledger, looper):
+    add_txns(domain_ledger, 2)
+    replicas = ReadReplicas(1, max_pending=1,
+                            replica_args=('Alpha', tconf, tdir_for_func, 1),
+                            get_committed_sizes=lambda: {DOMAIN_LEDGER_ID: domain_ledger.size})
+    served_by_node = []
+    node = FakeSomething(name='Alpha',
+                         metrics=NullMetricsCollector(),
+                         nodeRequestSpikeMonitorData={'accum': 0},
+                         total_read_request_number=0,
+                         read_replicas=replicas,
+                         is_action=lambda txn_type: False,
+                         is_query=lambda txn_type: False,
+                         handle_get_txn_req=lambda request, frm: served_by_node.append(request))
+    replicas.start()
+    try:
+        Node.processRequest(node, get_txn_request(1, req_id=1), 'client')
+        # The only worker is busy, so the node serves the request itself
+        Node.processRequest(node, get_txn_request(2, req_id=2), 'client')
+        assert [request.reqId for request in served_by_node] == [2]
+        assert node.total_read_request_number == 2
+
+        results = []
+
+        def check_replied():
+            results.extend(replicas.service())
+            assert len(results) == 2
+
+        looper.run(eventually(check_replied))
+        assert results[1][0]['result'][DATA] == txn_with_proof(domain_ledger, 1)
+    finally:
+        replicas.stop()
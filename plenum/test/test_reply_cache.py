@@ -0,0 +1,70 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.hash_stores.file_hash_store import FileHashStore
+from plenum.common.constants import NYM
+from plenum.common.ledger import Ledger
+from plenum.common.txn_util import init_empty_txn, set_payload_data, append_txn_metadata, get_seq_no
+from plenum.server.reply_cache import ReplyCache
+
+
+class FakeTime:
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self):
+        return self.value
+
+
+@pytest.fixture(scope='function')
+def ledger(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=tdir_for_func)),
+                    dataDir=tdir_for_func)
+    for i in range(10):
+        txn = set_payload_data(init_empty_txn(NYM), {'dest': 'nym{}'.format(i)})
+        ledger.add(append_txn_metadata(txn, txn_time=1000))
+    yield ledger
+    ledger.stop()
+
+
+def expected_txn(ledger, seq_no):
+    txn = ledger.getBySeqNo(seq_no)
+    txn.update(ledger.merkleInfo(seq_no))
+    return txn
+
+
+def test_reply_cache_keeps_last_txns(ledger):
+    cache = ReplyCache(max_size=3, ttl=10)
+    for seq_no in range(1, 6):
+        cache.add(ledger, seq_no, ledger.getBySeqNo(seq_no))
+
+    assert [cache.get(ledger, seq_no) for seq_no in (1, 2)] == [None, None]
+    for seq_no in (3, 4, 5):
+        assert cache.get(ledger, seq_no) == expected_txn(ledger, seq_no)
+
+    # Merkle info is calculated once and stays valid as ledger grows
+    txn = set_payload_data(init_empty_txn(NYM), {'dest': 'other'})
+    ledger.add(append_txn_metadata(txn, txn_time=1000))
+    assert cache.get(ledger, 5) == expected_txn(ledger, 5)
+    assert 'auditPath' not in ledger.getBySeqNo(5)
+    assert get_seq_no(cache.get(ledger, 5)) == 5
+
+
+def test_reply_cache_expires_txns(ledger):
+    now = FakeTime()
+    cache = ReplyCache(max_size=10, ttl=10, get_current_time=now)
+    cache.add(ledger, 1, ledger.getBySeqNo(1))
+    now.value = 5
+    cache.add(ledger, 2, ledger.getBySeqNo(2))
+
+    now.value = 11
+    assert cache.get(ledger, 1) is None
+    assert cache.get(ledger, 2) == expected_txn(ledger, 2)
+    now.value = 16
+    assert cache.get(ledger, 2) is None
+
+
+def test_reply_cache_ignores_txns_beyond_ledger_size(ledger):
+    cache = ReplyCache(max_size=10, ttl=10)
+    cache.add(ledger, ledger.size + 1, {'txn': {}})
+    assert cache.get(ledger, ledger.size + 1) is None
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+from state.db.persistent_db import PersistentDB
+from state.util.fast_rlp import decode_optimized as rlp_decode
+from storage.kv_store import KeyValueStorage
+
+HASH_SIZE = 32
+
+
+class BufferedDB(PersistentDB):
+    """
+    A PersistentDB keeping new trie nodes in memory instead of writing them
+    to the storage right away. Most of the nodes created while applying
+    a batch are replaced by later updates of the same batch, so only the
+    nodes reachable from a committed root are flushed, with a single
+    `setBatch`, and the rest is discarded without touching the storage.
+
+    A node is flushed together with all the buffered nodes it references,
+    so every node in the storage has its whole subtree in the storage as
+    well and walks over buffered nodes can stop at the first stored one.
+
+    Every buffered node is tagged with the generation it was created in
+    (and the last one it was created again in), which the owner advances
+    with `new_generation` before every trie update. Since later roots are
+    built from the trie of an earlier one, nodes a root does not reference
+    are told from nodes later roots may need by generation only, without
+    walking any trie but the committed one.
+    """
+
+    def __init__(self, keyValueStorage: KeyValueStorage):
+        super().__init__(keyValueStorage)
+        # {key: [value, first generation, last generation]}, in order of
+        # the last generation
+        self._buffer = OrderedDict()
+        self.generation = 0
+
+    def get(self, key: bytes) -> bytes:
+        entry = self._buffer.get(key)
+        if entry is not None:
+            return entry[0]
+        return super().get(key)
+
+    def inc_refcount(self, key, value):
+        entry = self._buffer.pop(key, None)
+        first_generation = self.generation if entry is None else entry[1]
+        self._buffer[key] = [value, first_generation, self.generation]
+
+    def new_generation(self) -> int:
+        self.generation += 1
+        return self.generation
+
+    def flush(self, root_hash, generation=None):
+        """
+        Write buffered nodes reachable from `root_hash` to the storage. If
+        `generation` the root was created in is given, the rest of nodes
+        created up to it are dropped, as roots created later can not
+        reference them.
+
+        :return: number of written nodes
+        """
+        nodes = self._reachable(root_hash)
+        if nodes:
+            self._keyValueStorage.setBatch(list(nodes.items()))
+            for key in nodes:
+                del self._buffer[key]
+        if generation is not None:
+            while self._buffer and next(iter(self._buffer.values()))[2] <= generation:
+                self._buffer.popitem(last=False)
+        return len(nodes)
+
+    def discard_after(self, generation=None):
+        """
+        Drop buffered nodes first created after `generation`, or all of them
+        if no generation is given
+        """
+        if generation is None:
+            self._buffer.clear()
+            return
+        dropped = []
+        for key in reversed(self._buffer):
+            _, first_generation, last_generation = self._buffer[key]
+            if last_generation <= generation:
+                break
+            if first_generation > generation:
+                dropped.append(key)
+        for key in dropped:
+            del self._buffer[key]
+
+    @property
+    def buffered_count(self):
+        return len(self._buffer)
+
+    def _reachable(self, root_hash):
+        found = {}
+        to_visit = [root_hash]
+        while to_visit:
+            ref = to_visit.pop()
+            if isinstance(ref, list):
+                # A decoded or embedded node
+                to_visit.extend(ref)
+                continue
+            if len(ref) != HASH_SIZE or ref in found:
+                continue
+            entry = self._buffer.get(ref)
+            if entry is None:
+                # Either stored with its subtree or not a reference
+                continue
+            found[ref] = entry[0]
+            to_visit.extend(rlp_decode(entry[0]))
+        return found
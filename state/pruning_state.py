@@ -1,7 +1,8 @@
 from binascii import unhexlify
+from collections import OrderedDict
 from typing import Optional
 
-from state.db.persistent_db import PersistentDB
+from state.db.buffered_db import BufferedDB
 from state.state import State
 from state.trie.pruning_trie import BLANK_ROOT, Trie, BLANK_NODE, \
     bin_to_nibbles
@@ -20,21 +21,35 @@ class PruningState(State):
     node crashes. Now when the node restarts, it restores the db from the
     committed root hash and all entries for uncommitted batches will be
     ignored
+
+    New trie nodes are buffered in memory and written to the db only when
+    a root referencing them is committed. Every root the trie gets on update
+    is remembered along with its generation of buffered nodes, so that on
+    commit and revert nodes no longer needed are dropped by generation.
     """
 
     # SOME KEY THAT DOES NOT COLLIDE WITH ANY STATE VARIABLE'S NAME
     rootHashKey = b'\x88\xc8\x88 \x9a\xa7\x89\x1b'
 
-    def __init__(self, keyValueStorage: KeyValueStorage):
+    def __init__(self, keyValueStorage: KeyValueStorage, node_cache_size=0):
         self._kv = keyValueStorage
         if self.rootHashKey in self._kv:
             rootHash = bytes(self._kv.get(self.rootHashKey))
         else:
             rootHash = BLANK_ROOT
             self._kv.put(self.rootHashKey, BLANK_ROOT)
+        # The committed root hash only changes in `commit`, so it is kept in
+        # memory instead of being read from the db on every committed read
+        self._committed_head_hash = rootHash
+        self._db = BufferedDB(self._kv)
+        # Uncommitted roots which may be committed or reverted to, with
+        # generations of buffered nodes they were created in, in order of
+        # appearance
+        self._uncommitted_roots = OrderedDict()  # type: OrderedDict[bytes, int]
         self._trie = Trie(
-            PersistentDB(self._kv),
-            rootHash)
+            self._db,
+            rootHash,
+            node_cache_size=node_cache_size)
 
     @property
     def head(self):
@@ -58,7 +73,9 @@ class PruningState(State):
         return self._trie._decode_to_node(node_hash)
 
     def set(self, key: bytes, value: bytes):
+        self._db.new_generation()
         self._trie.update(key, rlp_encode([value]))
+        self._add_uncommitted_root()
 
     def get(self, key: bytes, isCommitted: bool = True) -> Optional[bytes]:
         if not isCommitted:
@@ -82,7 +99,9 @@ class PruningState(State):
         return leaves
 
     def remove(self, key: bytes):
+        self._db.new_generation()
         self._trie.delete(key)
+        self._add_uncommitted_root()
 
     def commit(self, rootHash=None, rootNode=None):
         if rootNode:
@@ -95,11 +114,46 @@ class PruningState(State):
             rootHash = rootHash
         else:
             rootHash = self.headHash
+        rootHash = bytes(rootHash)
+        generation = self._uncommitted_roots.get(rootHash)
+        if generation is None and rootHash == self._trie.root_hash:
+            generation = self._db.generation
+        self._db.flush(rootHash, generation)
         self._kv.put(self.rootHashKey, rootHash)
+        self._committed_head_hash = rootHash
+        # Roots up to the committed one are either stored now or abandoned
+        if generation is not None:
+            self._pop_uncommitted_roots(lambda gen: gen <= generation, last=False)
 
     def revertToHead(self, headHash=None):
         head = self._hash_to_node(headHash)
         self._trie.replace_root_hash(self._trie.root_node, head)
+        head_hash = self._trie.root_hash
+        if head_hash == self._committed_head_hash:
+            # Committed nodes are all stored
+            self._uncommitted_roots.clear()
+            self._db.discard_after(None)
+            return
+        # Roots appeared after the one reverted to belong to reverted
+        # batches, nodes they were made of are dropped unless the root is
+        # not known, then they are left to be dropped on commit
+        generation = self._uncommitted_roots.get(head_hash)
+        if generation is not None:
+            self._pop_uncommitted_roots(lambda gen: gen > generation, last=True)
+            self._db.discard_after(generation)
+
+    def _add_uncommitted_root(self):
+        root_hash = self._trie.root_hash
+        self._uncommitted_roots.pop(root_hash, None)
+        self._uncommitted_roots[root_hash] = self._db.generation
+
+    def _pop_uncommitted_roots(self, condition, last):
+        while self._uncommitted_roots:
+            root_hash = next(reversed(self._uncommitted_roots)) if last \
+                else next(iter(self._uncommitted_roots))
+            if not condition(self._uncommitted_roots[root_hash]):
+                break
+            del self._uncommitted_roots[root_hash]
 
     # Proofs are always generated over committed state
     def generate_state_proof(self, key: bytes, root=None, serialize=False, get_value=False):
@@ -143,7 +197,16 @@ class PruningState(State):
 
     @property
     def committedHeadHash(self):
-        return self._kv.get(self.rootHashKey)
+        return self._committed_head_hash
+
+    def node_cache_stats(self):
+        """
+        Returns number of decoded node cache hits and misses since the
+        previous call, (0, 0) if the cache is disabled
+        """
+        if self._trie.node_cache is None:
+            return 0, 0
+        return self._trie.node_cache.reset_stats()
 
     @property
     def isEmpty(self):
@@ -0,0 +1,130 @@
+import pytest
+
+from state.pruning_state import PruningState
+from state.state import State
+from state.trie.node_cache import TrieNodeCache
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+CACHE_SIZE = 20
+
+
+@pytest.yield_fixture(scope="function")
+def kv():
+    return KeyValueStorageInMemory()
+
+
+@pytest.yield_fixture(scope="function")
+def state(kv) -> State:
+    state = PruningState(kv, node_cache_size=CACHE_SIZE)
+    yield state
+    state.close()
+
+
+def fill(state, count, prefix=b'k'):
+    for i in range(count):
+        state.set(prefix + str(i).encode(), str(i).encode())
+
+
+def test_cache_is_bounded():
+    cache = TrieNodeCache(2)
+    cache.put(b'1', [b'a'])
+    cache.put(b'2', [b'b'])
+    assert cache.get(b'1') == [b'a']
+    cache.put(b'3', [b'c'])
+    # `2` is the least recently used
+    assert b'2' not in cache
+    assert b'1' in cache
+    assert b'3' in cache
+    assert len(cache) == 2
+
+
+def test_cache_returns_copies():
+    cache = TrieNodeCache(2)
+    node = [b'a', [b'b', b'c']]
+    cache.put(b'1', node)
+    node[1][0] = b'x'
+
+    cached = cache.get(b'1')
+    assert cached == [b'a', [b'b', b'c']]
+    cached[1][0] = b'y'
+    assert cache.get(b'1') == [b'a', [b'b', b'c']]
+
+
+def test_cache_stats():
+    cache = TrieNodeCache(2)
+    cache.get(b'1')
+    cache.put(b'1', [b'a'])
+    cache.get(b'1')
+    cache.get(b'1')
+    assert cache.reset_stats() == (2, 1)
+    assert cache.reset_stats() == (0, 0)
+
+
+def test_committed_reads_hit_cache(state):
+    fill(state, 100)
+    state.commit()
+    state.node_cache_stats()
+
+    for i in range(100):
+        assert state.get(b'k' + str(i).encode()) == str(i).encode()
+    hits, misses = state.node_cache_stats()
+    assert hits > misses
+    assert len(state._trie.node_cache) <= CACHE_SIZE
+
+
+def test_cached_state_matches_uncached(state):
+    uncached = PruningState(KeyValueStorageInMemory())
+    for s in (state, uncached):
+        fill(s, 50)
+        s.commit()
+        # Reads populate the cache before nodes get modified by updates
+        for i in range(50):
+            s.get(b'k' + str(i).encode())
+        fill(s, 50, prefix=b'k1')
+        s.remove(b'k3')
+        s.set(b'k4', b'new')
+
+    assert state.headHash == uncached.headHash
+    assert state.committedHeadHash == uncached.committedHeadHash
+    assert state.as_dict == uncached.as_dict
+    assert state.get(b'k4') == b'4'
+    assert state.get(b'k4', isCommitted=False) == b'new'
+    assert state.get(b'k3', isCommitted=False) is None
+
+
+def test_revert_with_cache(state):
+    fill(state, 30)
+    state.commit()
+    committed_head_hash = state.committedHeadHash
+
+    fill(state, 30, prefix=b'x')
+    state.revertToHead(committed_head_hash)
+    assert state.headHash == committed_head_hash
+    assert state.get(b'x1', isCommitted=False) is None
+    assert state.get(b'k1', isCommitted=False) == b'1'
+
+
+def test_committed_head_hash_kept_in_memory(state, kv):
+    fill(state, 10)
+    state.commit()
+    assert state.committedHeadHash == state.headHash
+    assert kv.get(PruningState.rootHashKey) == state.headHash
+
+    state.set(b'k1', b'v1')
+    assert state.committedHeadHash != state.headHash
+    state.commit()
+    assert state.committedHeadHash == state.headHash
+    assert state.get(b'k1') == b'v1'
+
+    # Committed head is restored from the db after restart
+    restarted = PruningState(kv, node_cache_size=CACHE_SIZE)
+    assert restarted.committedHeadHash == state.committedHeadHash
+    assert restarted.get(b'k1') == b'v1'
+
+
+def test_no_stats_without_cache():
+    state = PruningState(KeyValueStorageInMemory())
+    fill(state, 10)
+    state.commit()
+    state.get(b'k1')
+    assert state.node_cache_stats() == (0, 0)
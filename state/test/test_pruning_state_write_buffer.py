@@ -0,0 +1,152 @@
+import pytest
+
+from state.pruning_state import PruningState
+from state.state import State
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+
+class CountingKeyValueStorage(KeyValueStorageInMemory):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def put(self, key, value):
+        self.writes += 1
+        super().put(key, value)
+
+
+@pytest.fixture(scope="function")
+def kv():
+    return CountingKeyValueStorage()
+
+
+@pytest.yield_fixture(scope="function")
+def state(kv) -> State:
+    state = PruningState(kv)
+    yield state
+    state.close()
+
+
+def apply_batch(state, count, prefix=b'k'):
+    for i in range(count):
+        state.set(prefix + str(i).encode(), prefix + str(i).encode())
+    return state.headHash
+
+
+def test_nodes_not_written_before_commit(state, kv):
+    writes = kv.writes
+    apply_batch(state, 100)
+    assert kv.writes == writes
+
+
+def test_commit_writes_only_reachable_nodes(state, kv):
+    writes = kv.writes
+    root = apply_batch(state, 1000)
+    buffered = state._db.buffered_count
+    state.commit(rootHash=root)
+
+    # Intermediate nodes replaced within the batch are not written
+    assert kv.writes - writes < buffered / 2
+    assert state._db.buffered_count == 0
+
+    restarted = PruningState(kv)
+    assert restarted.committedHeadHash == root
+    for i in range(1000):
+        key = b'k' + str(i).encode()
+        assert restarted.get(key) == key
+
+
+def test_commit_batches_in_order(state, kv):
+    root1 = apply_batch(state, 50, prefix=b'a')
+    root2 = apply_batch(state, 50, prefix=b'b')
+    root3 = apply_batch(state, 50, prefix=b'c')
+
+    state.commit(rootHash=root1)
+    assert state.get(b'a1') == b'a1'
+    assert state.get(b'b1') is None
+    assert state.get_for_root_hash(root2, b'b1') == b'b1'
+
+    state.commit(rootHash=root2)
+    state.commit(rootHash=root3)
+    assert state._db.buffered_count == 0
+
+    restarted = PruningState(kv)
+    for key in (b'a1', b'b1', b'c1'):
+        assert restarted.get(key) == key
+
+
+def test_commit_while_next_batch_is_applied(state, kv):
+    root1 = apply_batch(state, 50, prefix=b'a')
+    apply_batch(state, 50, prefix=b'b')
+    state.set(b'x', b'x')
+    state.commit(rootHash=root1)
+    state.commit(rootHash=state.headHash)
+
+    restarted = PruningState(kv)
+    for key in (b'a1', b'b1', b'x'):
+        assert restarted.get(key) == key
+
+
+def test_reverted_batch_is_not_written(state, kv):
+    root1 = apply_batch(state, 50, prefix=b'a')
+    apply_batch(state, 50, prefix=b'b')
+    writes = kv.writes
+
+    state.revertToHead(root1)
+    assert kv.writes == writes
+    assert state.headHash == root1
+    assert state.get(b'b1', isCommitted=False) is None
+
+    state.commit(rootHash=root1)
+    assert state._db.buffered_count == 0
+    restarted = PruningState(kv)
+    assert restarted.get(b'a1') == b'a1'
+    assert restarted.get(b'b1') is None
+
+
+def test_revert_to_committed(state, kv):
+    root = apply_batch(state, 50, prefix=b'a')
+    state.commit(rootHash=root)
+    writes = kv.writes
+
+    apply_batch(state, 50, prefix=b'b')
+    apply_batch(state, 50, prefix=b'c')
+    state.revertToHead(state.committedHeadHash)
+
+    assert kv.writes == writes
+    assert state._db.buffered_count == 0
+    assert state.headHash == root
+    assert state.get(b'a1', isCommitted=False) == b'a1'
+
+
+def test_revert_to_root_never_read(state, kv):
+    root1 = apply_batch(state, 50, prefix=b'a')
+    for i in range(50):
+        state.set(b'b' + str(i).encode(), b'b')
+    # Root of the second batch is not got from headHash
+    root2 = state._trie.root_hash
+    apply_batch(state, 50, prefix=b'c')
+
+    state.commit(rootHash=root1)
+    state.revertToHead(root2)
+    assert state.get(b'b1', isCommitted=False) == b'b'
+    assert state.get(b'c1', isCommitted=False) is None
+
+    state.commit(rootHash=root2)
+    assert state._db.buffered_count == 0
+    restarted = PruningState(kv)
+    assert restarted.get(b'b1') == b'b'
+
+
+def test_commit_keeps_nodes_of_later_batches(state, kv):
+    root1 = apply_batch(state, 50, prefix=b'a')
+    state.commit(rootHash=root1)
+    root2 = apply_batch(state, 50, prefix=b'b')
+    buffered = state._db.buffered_count
+    apply_batch(state, 50, prefix=b'c')
+
+    state.commit(rootHash=root2)
+    # Nodes left are only ones created by the third batch
+    assert 0 < state._db.buffered_count < buffered * 2
+    state.revertToHead(root2)
+    assert state._db.buffered_count == 0
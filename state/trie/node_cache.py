@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+
+class TrieNodeCache:
+    """
+    Size bounded LRU cache of decoded trie nodes keyed by the node hash.
+    Nodes are content addressed, so a cached entry never gets stale, the cache
+    just has to be bounded.
+
+    The trie modifies decoded nodes in place, so every node handed out is a
+    copy of the cached one.
+    """
+
+    def __init__(self, max_size: int):
+        if max_size <= 0:
+            raise ValueError("Cache size should be positive, got {}".format(max_size))
+        self.max_size = max_size
+        self._nodes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, node_hash):
+        node = self._nodes.get(node_hash)
+        if node is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._nodes.move_to_end(node_hash)
+        return self._copy(node)
+
+    def put(self, node_hash, node):
+        self._nodes[node_hash] = self._copy(node)
+        self._nodes.move_to_end(node_hash)
+        if len(self._nodes) > self.max_size:
+            self._nodes.popitem(last=False)
+
+    def clear(self):
+        self._nodes.clear()
+
+    def reset_stats(self):
+        """
+        Returns number of hits and misses since the previous call
+        """
+        stats = self.hits, self.misses
+        self.hits = self.misses = 0
+        return stats
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node_hash):
+        return node_hash in self._nodes
+
+    @classmethod
+    def _copy(cls, node):
+        # Nodes are lists of bytes and embedded nodes, bytes are immutable
+        return [cls._copy(item) if isinstance(item, list) else item
+                for item in node]
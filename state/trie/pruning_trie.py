@@ -7,6 +7,7 @@ from common.exceptions import PlenumTypeError, PlenumValueError
 import rlp
 from rlp.utils import encode_hex, ascii_chr, str_to_bytes
 from state.db.db import BaseDB
+from state.trie.node_cache import TrieNodeCache
 from state.util.fast_rlp import encode_optimized, decode_optimized
 from state.util.utils import is_string, to_string, sha3, sha3rlp, encode_int
 from storage.kv_in_memory import KeyValueStorageInMemory
@@ -215,13 +216,18 @@ def transient_trie_exception(*args):
 
 class Trie:
 
-    def __init__(self, db: BaseDB, root_hash=BLANK_ROOT, transient=False):
+    def __init__(self, db: BaseDB, root_hash=BLANK_ROOT, transient=False,
+                 node_cache_size=0):
         '''it also present a dictionary like interface
 
         :param db key value database
         :root: blank or trie node in form of [key, value] or [v0,v1..v15,v]
+        :param node_cache_size: number of decoded nodes to keep in memory,
+        0 disables caching
         '''
         self._db = db  # Pass in a database object directly
+        self.node_cache = TrieNodeCache(node_cache_size) \
+            if node_cache_size > 0 else None
         self.transient = transient
         if self.transient:
             self.update = self.get = self.delete = transient_trie_exception
@@ -349,7 +355,13 @@ class Trie:
             return BLANK_NODE
         if isinstance(encoded, list):
             return encoded
-        o = rlp.decode(self._db.get(encoded))
+        if self.node_cache is None:
+            o = rlp.decode(self._db.get(encoded))
+        else:
+            o = self.node_cache.get(encoded)
+            if o is None:
+                o = rlp.decode(self._db.get(encoded))
+                self.node_cache.put(encoded, o)
         self.spv_grabbing(o)
         return o
 
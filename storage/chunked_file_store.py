@@ -289,12 +289,20 @@ class ChunkedFileStore(KeyValueStorageFile):
         self._useLatestChunk()
         self.currentChunk._append_new_line_if_req()
 
+    def get_last_key(self):
+        size = self.size
+        return str(size) if size else None
+
     @property
     def size(self) -> int:
         """
-        This will iterate only over the last chunk since the name of the last
-        chunk indicates how many lines in total exist in all other chunks
+        The current chunk is always the last one, so its index and number of
+        items in it give the total number of lines. Otherwise this will
+        iterate only over the last chunk since the name of the last chunk
+        indicates how many lines in total exist in all other chunks
         """
+        if not self.closed:
+            return self.currentChunkIndex - 1 + self.itemNum - 1
         chunks = self._listChunks()
         num_chunks = len(chunks)
         if num_chunks == 0:
@@ -3,9 +3,10 @@ import os
 from ledger.hash_stores.file_hash_store import FileHashStore
 from ledger.hash_stores.hash_store import HashStore
 from ledger.hash_stores.memory_hash_store import MemoryHashStore
+from ledger.hash_stores.mmap_file_hash_store import MmapFileHashStore
 
 from plenum.common.config_util import getConfig
-from plenum.common.constants import KeyValueStorageType, HS_FILE, HS_LEVELDB, HS_ROCKSDB
+from plenum.common.constants import KeyValueStorageType, HS_FILE, HS_MMAP_FILE, HS_LEVELDB, HS_ROCKSDB
 from plenum.common.exceptions import KeyValueStorageConfigNotFound
 
 from plenum.persistence.db_hash_store import DbHashStore
@@ -78,6 +79,9 @@ def initHashStore(data_dir, name, config=None, read_only=False) -> HashStore:
     if hsConfig == HS_FILE:
         return FileHashStore(dataDir=data_dir,
                              fileNamePrefix=name)
+    elif hsConfig == HS_MMAP_FILE:
+        return MmapFileHashStore(dataDir=data_dir,
+                                 fileNamePrefix=name)
     elif hsConfig == HS_LEVELDB or hsConfig == HS_ROCKSDB:
         return DbHashStore(dataDir=data_dir,
                            fileNamePrefix=name,
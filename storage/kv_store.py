@@ -68,6 +68,14 @@ class KeyValueStorage(metaclass=ABCMeta):
             c += 1
         return c
 
+    @property
+    def estimated_size(self) -> int:
+        """
+        Number of records which may be approximate but is cheap to get,
+        falls back to the exact size if a backend can't estimate it
+        """
+        return self.size
+
     def _has_key(self, key):
         try:
             self.get(key)
@@ -35,10 +35,5 @@ class KeyValueStorageLeveldbIntKeys(KeyValueStorageLeveldb):
         return value
 
     def get_last_key(self):
-        last_key = None
-        itr = self.iterator(include_value=False)
-        if itr:
-            all_keys = [_ for _ in itr]
-            if len(all_keys) > 0:
-                last_key = all_keys[-1]
-        return last_key
+        itr = self._db.RangeIter(include_value=False, reverse=True)
+        return next(itr, None)
@@ -102,6 +102,10 @@ class KeyValueStorageRocksdb(KeyValueStorage):
     def closed(self):
         return self._db is None
 
+    @property
+    def estimated_size(self) -> int:
+        return int(self._db.get_property(b'rocksdb.estimate-num-keys'))
+
     def put(self, key, value):
         key = self.to_byte_repr(key)
         value = self.to_byte_repr(value)
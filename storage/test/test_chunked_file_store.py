@@ -75,6 +75,24 @@ def testSizeChunkedFileStore(populatedChunkedFileStore):
     assert c2 == dataSize
 
 
+def test_size_and_last_key_after_reopen(populatedChunkedFileStore):
+    store = populatedChunkedFileStore
+    assert store.size == dataSize
+    assert store.get_last_key() == str(dataSize)
+
+    store.close()
+    assert store.size == dataSize
+    store.open()
+    assert store.size == dataSize
+    store.put(None, getValue(dataSize + 1))
+    assert store.size == dataSize + 1
+    assert store.get_last_key() == str(dataSize + 1)
+
+    store.reset()
+    assert store.size == 0
+    assert store.get_last_key() is None
+
+
 def testIterateOverChunkedFileStore(populatedChunkedFileStore):
     store = populatedChunkedFileStore
     for k, v in store.iterator():
@@ -36,3 +36,8 @@ def test_previous_key_for_given(storage_with_ts_root_hashes):
 def test_get_required_key(storage_with_ts_root_hashes):
     storage, ts_list = storage_with_ts_root_hashes
     assert storage.get_equal_or_prev(2).decode("utf-8") == ts_list[2]
+
+
+def test_get_last_key(storage_with_ts_root_hashes):
+    storage, _ = storage_with_ts_root_hashes
+    assert int(storage.get_last_key()) == 100
@@ -142,3 +142,9 @@ def test_batch_bytes(kv):
 
     for i in range(5):
         assert 'v'.format(i).encode() == kv.get('k'.format(i))
+
+
+def test_estimated_size(kv):
+    assert kv.estimated_size == 0
+    kv.setBatch([('k{}'.format(i), 'v{}'.format(i)) for i in range(10)])
+    assert kv.estimated_size == kv.size == 10
@@ -1,3 +1,4 @@
+import atexit
 import inspect
 import logging
 import os
@@ -5,7 +6,7 @@ import sys
 import time
 from stp_core.common.logging.CompressingFileHandler import CompressingFileHandler
 from stp_core.common.util import Singleton
-from stp_core.common.logging.handlers import CliHandler
+from stp_core.common.logging.handlers import CliHandler, AsyncHandler
 from stp_core.common.config.util import getConfig
 
 TRACE_LOG_LEVEL = 5
@@ -28,6 +29,8 @@ def getlogger(name: object = None) -> logging.Logger:
 
 class Logger(metaclass=Singleton):
     def __init__(self, config=None):
+        self._async_handler = None
+        atexit.register(self._closeAsyncHandler)
 
         # TODO: This should take directory
         self.apply_config(config or getConfig())
@@ -43,6 +46,22 @@ class Logger(metaclass=Singleton):
         logger = logging.getLogger(name)
         return logger
 
+    @property
+    def async_handler(self):
+        """
+        Handler passing records to other handlers in a background thread if
+        asynchronous logging is enabled, has counters of dropped records
+        """
+        return self._async_handler
+
+    def reset_after_fork(self):
+        """
+        To be called in a forked process, asynchronous handler inherited from
+        the parent has no background thread there so it is replaced
+        """
+        if self._async_handler is not None:
+            self._resetAsyncHandler()
+
     @staticmethod
     def setLogLevel(log_level):
         logging.root.setLevel(log_level)
@@ -53,7 +72,12 @@ class Logger(metaclass=Singleton):
 
         self._config = config
         self._handlers = {}
+        self._closeAsyncHandler()
         self._clearAllHandlers()
+        # Size of the queue of records if they are written in a background
+        # thread, None if they are written by the thread logging them
+        self._async_queue_size = self._config.logAsyncQueueSize \
+            if getattr(self._config, "logAsync", False) else None
         self._format = logging.Formatter(fmt=self._config.logFormat,
                                          style=self._config.logFormatStyle)
         self._format.converter = time.gmtime
@@ -94,15 +118,38 @@ class Logger(metaclass=Singleton):
             new_handler.setFormatter(self._format)
 
         # assuming indempotence and removing old one first
-        self._clearHandler(typ)
+        old = self._handlers.pop(typ, None)
+        if old and not self._async_queue_size:
+            logging.root.removeHandler(old)
 
         self._handlers[typ] = new_handler
-        logging.root.addHandler(new_handler)
+        if self._async_queue_size:
+            self._resetAsyncHandler()
+        else:
+            logging.root.addHandler(new_handler)
 
     def _clearHandler(self, typ: str):
-        old = self._handlers.get(typ)
+        old = self._handlers.pop(typ, None)
         if old:
-            logging.root.removeHandler(old)
+            if self._async_queue_size:
+                self._resetAsyncHandler()
+            else:
+                logging.root.removeHandler(old)
+
+    def _resetAsyncHandler(self):
+        # Handlers of a running listener cannot be changed, so it is
+        # replaced with one having current handlers
+        self._closeAsyncHandler()
+        if self._handlers:
+            self._async_handler = AsyncHandler(self._handlers.values(),
+                                               self._async_queue_size)
+            logging.root.addHandler(self._async_handler)
+
+    def _closeAsyncHandler(self):
+        if self._async_handler is not None:
+            logging.root.removeHandler(self._async_handler)
+            self._async_handler.close()
+            self._async_handler = None
 
     def _clearAllHandlers(self):
         for hdlr in logging.root.handlers:
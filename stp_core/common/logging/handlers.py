@@ -1,4 +1,7 @@
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 
 class CallbackHandler(logging.Handler):
@@ -74,3 +77,65 @@ class TestingHandler(logging.Handler):
         Captures a record.
         """
         self.tester(record)
+
+
+class _QueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Queue can be full, so wait for room instead of failing
+        self.queue.put(self._sentinel)
+
+
+class AsyncHandler(QueueHandler):
+    """
+    Puts records to a bounded queue from which a background thread passes
+    them to `handlers`, so that logging thread does not wait for records to
+    be formatted and written. Records which do not fit into the queue are
+    dropped and counted.
+    """
+
+    def __init__(self, handlers, queue_size: int):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        # Number of records dropped since the queue was full
+        self.dropped = 0
+        # Number of times the queue became full
+        self.overflows = 0
+        self._full = False
+        self._handlers = tuple(handlers)
+        self._pid = os.getpid()
+        self._listener = _QueueListener(self.queue, *self._handlers,
+                                        respect_handler_level=True)
+        self._listener.start()
+
+    @property
+    def handlers(self):
+        return self._handlers
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self._full = False
+        except queue.Full:
+            self.dropped += 1
+            if not self._full:
+                self._full = True
+                self.overflows += 1
+
+    def prepare(self, record):
+        # Arguments are merged into the message right away since they can
+        # change before the record is written, while the rest of formatting
+        # is left to the background thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self):
+        """
+        Write all queued records and stop the background thread
+        """
+        if self._listener is not None:
+            # A copy of the handler in a forked process has no background
+            # thread, so there is nobody to write queued records there
+            if os.getpid() == self._pid:
+                self._listener.stop()
+            self._listener = None
+        super().close()
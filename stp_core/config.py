@@ -12,6 +12,10 @@ logRotationMaxBytes = 100 * 1024 * 1024
 logRotationCompression = "xz"
 logFormat = '{asctime:s}|{levelname:s}|{filename:s}|{message:s}'
 logFormatStyle = '{'
+# Write log records in a background thread, records logged while
+# logAsyncQueueSize of them are waiting to be written are dropped
+logAsync = False
+logAsyncQueueSize = 10000
 
 logLevel = logging.NOTSET
 enableStdOutLogging = True
@@ -51,3 +55,13 @@ REMOVE_CLIENT_MSG_TIMEOUT = 60 * 5
 
 # All messages exceeding the limit will be rejected without processing
 MSG_LEN_LIMIT = 128 * 1024
+
+# Send batches of node messages as binary frames instead of JSON to nodes
+# which support it too (negotiated on connection). Nodes of versions
+# without this feature just ignore the negotiation, so it is safe to enable
+# in a pool with such nodes.
+ENABLE_BINARY_BATCHES = False
+
+# Serialize node messages with msgpack instead of JSON for nodes which
+# support it too (negotiated the same way as binary batches)
+ENABLE_MSGPACK_WIRE_CODEC = False
@@ -1,9 +1,85 @@
+import logging
+import multiprocessing
+import threading
+from types import SimpleNamespace
+
 import pytest
 
-from stp_core.common.log import Logger
+from stp_core.common.log import Logger, getlogger
+from stp_core.common.logging.handlers import TestingHandler
 
 
 def test_apply_config():
     logger = Logger()
     with pytest.raises(ValueError):
         logger.apply_config(None)
+
+
+@pytest.fixture()
+def async_logger():
+    logger = Logger()
+    config = logger._config
+    root_handlers = logging.root.handlers[:]
+    async_config = SimpleNamespace(**{name: getattr(config, name)
+                                      for name in dir(config) if not name.startswith('__')})
+    async_config.enableStdOutLogging = False
+    async_config.logAsync = True
+    async_config.logAsyncQueueSize = 3
+    logger.apply_config(async_config)
+    yield logger
+    logger.apply_config(config)
+    logging.root.handlers[:] = root_handlers
+
+
+def test_async_logging(async_logger):
+    records = []
+    writing = threading.Event()
+    can_write = threading.Event()
+
+    def write(record):
+        writing.set()
+        can_write.wait()
+        records.append(record)
+
+    handler = TestingHandler(write)
+    async_logger._setHandler('test', handler)
+    log = getlogger('test_async_logging')
+    # Records get to the handler only through the background thread
+    assert async_logger.async_handler in logging.root.handlers
+    assert handler not in logging.root.handlers
+    assert async_logger.async_handler.handlers == (handler,)
+
+    data = [1, 2]
+    log.info('record %d of %s', 0, data)
+    writing.wait()
+    # The background thread waits with the first record, so the queue gets
+    # full with 3 more
+    for i in range(1, 5):
+        log.info('record %d of %s', i, data)
+    data.append(3)
+    assert async_logger.async_handler.dropped == 1
+    assert async_logger.async_handler.overflows == 1
+
+    can_write.set()
+    async_logger.async_handler.close()
+    assert [record.getMessage() for record in records] == \
+        ['record {} of [1, 2]'.format(i) for i in range(4)]
+
+
+def test_async_logging_in_forked_process(async_logger):
+    ctx = multiprocessing.get_context('fork')
+    conn, child_conn = ctx.Pipe()
+    async_logger._setHandler('test', TestingHandler(lambda record: child_conn.send(record.getMessage())))
+
+    def log_in_child():
+        # Background thread of the handler is not copied to the child
+        async_logger.reset_after_fork()
+        getlogger('test_async_logging').info('child record')
+        async_logger.async_handler.close()
+
+    process = ctx.Process(target=log_in_child)
+    process.start()
+    process.join(timeout=10)
+    assert process.exitcode == 0
+    assert conn.poll(1)
+    assert conn.recv() == 'child record'
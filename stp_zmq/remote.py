@@ -48,6 +48,8 @@ class Remote:
         self._numOfReconnects = 0
         self._isConnected = False
         self._lastConnectedAt = None
+        # Stack features supported by both sides, see `ZStack.featuresOp`
+        self.features = set()
         self.config = config or getConfig()
         self.uid = name
 
@@ -61,6 +63,8 @@ class Remote:
         lost = self.hasLostConnection
         if lost:
             self._isConnected = False
+            # The remote might come back with a different set of features
+            self.features = set()
             return False
         return True
 
@@ -106,6 +110,7 @@ class Remote:
                         'being called twice.'.format(self))
 
         self._isConnected = False
+        self.features = set()
 
     @property
     def hasLostConnection(self):
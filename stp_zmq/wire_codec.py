@@ -0,0 +1,123 @@
+from abc import ABCMeta, abstractmethod
+from collections import Mapping
+from typing import Any
+
+import msgpack
+
+from common.serializers.msgpack_serializer import MsgPackSerializer
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+
+class WireCodec(metaclass=ABCMeta):
+    """
+    Serialization of messages sent by a stack. Strings and bytes are
+    considered already serialized and are sent as they are.
+    """
+
+    # Stack feature the codec is advertised with, see `ZStack.featuresOp`
+    name = None
+
+    @abstractmethod
+    def encode(self, msg: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data) -> Any:
+        pass
+
+
+class JsonWireCodec(WireCodec):
+    name = 'json'
+
+    def encode(self, msg):
+        if isinstance(msg, Mapping):
+            msg = json.dumps(msg)
+        if isinstance(msg, str):
+            msg = msg.encode()
+        assert isinstance(msg, bytes)
+        return msg
+
+    def decode(self, data):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode()
+        return json.loads(data)
+
+
+class MsgPackWireSerializer(MsgPackSerializer):
+    """
+    MsgPackSerializer producing the same messages on the receiving side as
+    JSON does. Messages are not sorted, since the wire representation is not
+    signed, and are deserialized as plain dicts.
+
+    JSON turns all mapping keys into strings, msgpack keeps them as they are.
+    Only message fields can be mappings with non string keys (e.g. txns of
+    CATCHUP_REP keyed by seq no), nested data comes from JSON requests and
+    already has string keys, so only the first two levels are converted,
+    without walking the whole message.
+    """
+
+    def serialize(self, data, fields=None, toBytes=True):
+        if isinstance(data, Mapping):
+            data = {k: self._with_str_keys(v) if isinstance(v, dict) else v
+                    for k, v in self._with_str_keys(data).items()}
+        return msgpack.packb(data, use_bin_type=True, default=self._default)
+
+    def deserialize(self, data, fields=None):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            return data
+        return msgpack.unpackb(data, encoding='utf-8')
+
+    @staticmethod
+    def _with_str_keys(mapping: Mapping):
+        if isinstance(mapping, dict) and all(type(k) is str for k in mapping):
+            return mapping
+        return {k if isinstance(k, str) else str(k): v
+                for k, v in mapping.items()}
+
+    @staticmethod
+    def _default(obj):
+        # Mappings which are not dicts, like nested messages
+        if hasattr(obj, '_asdict'):
+            return dict(obj._asdict())
+        if hasattr(obj, 'toDict'):
+            return obj.toDict()
+        if isinstance(obj, Mapping):
+            return dict(obj.items())
+        raise TypeError('can not serialize {}'.format(type(obj).__name__))
+
+
+class MsgPackWireCodec(WireCodec):
+    name = 'msgpack'
+
+    def __init__(self, serializer: MsgPackSerializer = None):
+        self._serializer = serializer or MsgPackWireSerializer()
+
+    def encode(self, msg):
+        if isinstance(msg, bytes):
+            return msg
+        if isinstance(msg, str):
+            return msg.encode()
+        return self._serializer.serialize(msg)
+
+    def decode(self, data):
+        return self._serializer.deserialize(data)
+
+    @staticmethod
+    def is_encoded(data) -> bool:
+        """
+        Whether `data` is a msgpack encoded message. Messages are encoded as
+        msgpack maps, which start with a byte no JSON document can start
+        with, so messages of both codecs can be told apart without parsing.
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)) or not data:
+            return False
+        first = data[0]
+        return 0x80 <= first <= 0x8f or first in (0xde, 0xdf)
+
+
+json_codec = JsonWireCodec()
+msgpack_codec = MsgPackWireCodec()
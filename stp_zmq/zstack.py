@@ -18,7 +18,7 @@ import sys
 import time
 from binascii import hexlify, unhexlify
 from collections import deque, OrderedDict
-from typing import Mapping, Tuple, Any, Union, Optional, NamedTuple
+from typing import Tuple, Any, Union, Optional, NamedTuple
 
 from common.exceptions import PlenumTypeError, PlenumValueError
 
@@ -28,15 +28,18 @@ from stp_core.crypto.nacl_wrappers import Signer, Verifier
 from stp_core.crypto.util import isHex, ed25519PkToCurve25519
 from stp_core.network.exceptions import PublicKeyNotFoundOnDisk, VerKeyNotFoundOnDisk
 from stp_zmq.authenticator import MultiZapAuthenticator
+import msgpack
 from zmq.utils import z85
 from zmq.utils.monitor import recv_monitor_message
 
 import zmq
-from stp_core.common.log import getlogger
+from stp_core.common.log import getlogger, TRACE_LOG_LEVEL
 from stp_core.network.network_interface import NetworkInterface
 from stp_zmq.util import createEncAndSigKeys, \
     moveKeyFilesToCorrectLocations, createCertsFromKeys
 from stp_zmq.remote import Remote, set_keepalive, set_zmq_internal_queue_size
+from stp_zmq.wire_codec import WireCodec, MsgPackWireCodec, json_codec, \
+    msgpack_codec
 from plenum.common.exceptions import InvalidMessageExceedingSizeException
 from stp_core.validators.message_length_validator import MessageLenValidator
 
@@ -62,6 +65,18 @@ class ZStack(NetworkInterface):
     pongMessage = 'po'
     healthMessages = {pingMessage.encode(), pongMessage.encode()}
 
+    # Stacks advertise optional features they support with a message sent
+    # right after each ping and pong. A feature is used with a remote only
+    # when both sides support it. Stacks not knowing this message just
+    # discard it as a message of unknown type.
+    featuresOp = 'STACK_FEATURES'
+    featuresMessageStart = '{{"op":"{}"'.format(featuresOp)
+
+    # Several serialized messages sent as one length-prefixed binary frame
+    # instead of a JSON batch with each message escaped into a string
+    BINARY_BATCH_FEATURE = 'binary_batch'
+    binaryBatchPrefix = b'\x00bb'
+
     # TODO: This is not implemented, implement this
     messageTimeout = 3
 
@@ -127,6 +142,12 @@ class ZStack(NetworkInterface):
         self.rxMsgs = deque()
         self._created = time.perf_counter()
 
+        # Features advertised to remotes, see `featuresOp`
+        self.supported_features = set()
+        # Codecs used instead of JSON with remotes supporting them, in order
+        # of preference. Messages of any known codec are accepted regardless.
+        self.wire_codecs = OrderedDict()  # type: Dict[str, WireCodec]
+
         self.last_heartbeat_at = None
 
         self._stashed_to_disconnected = {}
@@ -475,16 +496,62 @@ class ZStack(NetworkInterface):
         try:
             self.metrics.add_event(self.mt_incoming_size, len(msg))
             self.msgLenVal.validate(msg)
-            decoded = msg.decode()
-        except (UnicodeDecodeError, InvalidMessageExceedingSizeException) as ex:
+            if msg.startswith(self.binaryBatchPrefix):
+                decoded = [self._decode_frame(frame)
+                           for frame in self.unpack_binary_batch(msg)]
+            else:
+                decoded = self._decode_frame(msg)
+        except (UnicodeDecodeError, InvalidMessageExceedingSizeException, ValueError) as ex:
             errstr = 'Message will be discarded due to {}'.format(ex)
             frm = self.remotesByKeys[ident].name if ident in self.remotesByKeys else ident
             logger.error("Got from {} {}".format(z85_to_friendly(frm), errstr))
             self.msgRejectHandler(errstr, frm)
             return False
-        self.rxMsgs.append((decoded, ident))
+        if isinstance(decoded, list):
+            self.rxMsgs.extend((m, ident) for m in decoded)
+        else:
+            self.rxMsgs.append((decoded, ident))
         return True
 
+    @staticmethod
+    def _decode_frame(frame: bytes):
+        # Msgpack encoded messages are deserialized right from the received
+        # bytes, without decoding them into a string first
+        if MsgPackWireCodec.is_encoded(frame):
+            return frame
+        return frame.decode()
+
+    @classmethod
+    def pack_binary_batch(cls, msgs):
+        """
+        Pack serialized messages into one binary batch
+        """
+        return cls.binaryBatchPrefix + msgpack.packb(msgs, use_bin_type=True)
+
+    @classmethod
+    def unpack_binary_batch(cls, batch: bytes):
+        """
+        Split a binary batch into serialized messages, messages themselves
+        are not parsed
+        """
+        try:
+            msgs = msgpack.unpackb(memoryview(batch)[len(cls.binaryBatchPrefix):])
+        except Exception as ex:
+            raise ValueError('invalid binary batch: {}'.format(ex)) from ex
+        if not isinstance(msgs, list) or \
+                not all(isinstance(m, bytes) for m in msgs):
+            raise ValueError('invalid binary batch: not a list of messages')
+        return msgs
+
+    @staticmethod
+    def binary_batch_len(msgs_len, msgs_num):
+        """
+        Upper bound of the size of a binary batch of `msgs_num` messages
+        of `msgs_len` bytes in total
+        """
+        # msgpack array and bin headers are at most 5 bytes each
+        return len(ZStack.binaryBatchPrefix) + 5 + msgs_len + 5 * msgs_num
+
     def _receiveFromListener(self, quota: Quota) -> int:
         """
         Receives messages from listener
@@ -572,6 +639,9 @@ class ZStack(NetworkInterface):
             if self.handlePingPong(msg, frm, ident):
                 continue
 
+            if self.handleFeatures(msg, ident):
+                continue
+
             if not self.onlyListener and ident not in self.remotesByKeys:
                 logger.warning('{} received message from unknown remote {}'
                                .format(self, z85_to_friendly(ident)))
@@ -695,6 +765,8 @@ class ZStack(NetworkInterface):
         action = 'ping' if is_ping else 'pong'
         name = remote if isinstance(remote, (str, bytes)) else remote.name
         r = self.send(msg, name)
+        if self.supported_features and not self.onlyListener:
+            self.send(self.features_message(), name)
         if r[0] is True:
             logger.debug('{} {}ed {}'.format(self.name, action, z85_to_friendly(name)))
         elif r[0] is False:
@@ -724,6 +796,48 @@ class ZStack(NetworkInterface):
             return True
         return False
 
+    def features_message(self):
+        # Built by hand so that it always starts with `featuresMessageStart`
+        return '{},"features":{}}}'.format(
+            self.featuresMessageStart, json.dumps(sorted(self.supported_features)))
+
+    def handleFeatures(self, msg, ident):
+        if not isinstance(msg, str) or \
+                not msg.startswith(self.featuresMessageStart):
+            return False
+        remote = self.remotesByKeys.get(ident)
+        if remote is None:
+            return True
+        try:
+            features = json.loads(msg).get('features', [])
+        except Exception as ex:
+            logger.warning('{} got invalid features message {} from {}: {}'
+                           .format(self, msg, remote, ex))
+            return True
+        remote.features = set(features) & self.supported_features
+        logger.debug('{} uses features {} with {}'
+                     .format(self, remote.features, remote))
+        return True
+
+    def add_wire_codec(self, codec: WireCodec):
+        """
+        Use `codec` instead of JSON with remotes supporting it
+        """
+        self.wire_codecs[codec.name] = codec
+        self.supported_features.add(codec.name)
+
+    def codec_for(self, uid) -> Optional[WireCodec]:
+        """
+        Codec to serialize messages to the remote with, None for JSON
+        """
+        remote = self.remotes.get(uid)
+        if remote is None or not remote.features:
+            return None
+        for name, codec in self.wire_codecs.items():
+            if name in remote.features:
+                return codec
+        return None
+
     def _can_resend_to_disconnected(self, to, ident):
         if to not in self._stashed_to_disconnected:
             return False
@@ -758,15 +872,18 @@ class ZStack(NetworkInterface):
                 r = []
                 e = []
                 # Serializing beforehand since to avoid serializing for each
-                # remote
-                try:
-                    msg = self.prepare_to_send(msg)
-                except InvalidMessageExceedingSizeException as ex:
-                    err_str = '{}Cannot send message. Error {}'.format(CONNECTION_PREFIX, ex)
-                    logger.warning(err_str)
-                    return False, err_str
+                # remote, once per codec in use
+                serialized = {}
                 for uid in self.remotes:
-                    res, err = self.transmit(msg, uid, serialized=True)
+                    codec = self.codec_for(uid)
+                    if codec not in serialized:
+                        try:
+                            serialized[codec] = self.prepare_to_send(msg, codec)
+                        except InvalidMessageExceedingSizeException as ex:
+                            err_str = '{}Cannot send message. Error {}'.format(CONNECTION_PREFIX, ex)
+                            logger.warning(err_str)
+                            return False, err_str
+                    res, err = self.transmit(serialized[codec], uid, serialized=True)
                     r.append(res)
                     e.append(err)
                 e = list(filter(lambda x: x is not None, e))
@@ -779,34 +896,34 @@ class ZStack(NetworkInterface):
         remote = self.remotes.get(uid)
         err_str = None
         if not remote:
-            logger.debug("Remote {} does not exist!".format(z85_to_friendly(uid)))
+            logger.debug("Remote %s does not exist!", z85_to_friendly(uid))
             return False, err_str
         socket = remote.socket
         if not socket:
-            logger.debug('{} has uninitialised socket '
-                         'for remote {}'.format(self, z85_to_friendly(uid)))
+            logger.debug('%s has uninitialised socket for remote %s', self, z85_to_friendly(uid))
             return False, err_str
         try:
             if not serialized:
-                msg = self.prepare_to_send(msg)
+                msg = self.prepare_to_send(msg, self.codec_for(uid))
 
-            logger.trace('{} transmitting message {} to {} by socket {} {}'
-                         .format(self, msg, z85_to_friendly(uid), socket.FD, socket.underlying))
+            if logger.isEnabledFor(TRACE_LOG_LEVEL):
+                logger.trace('%s transmitting message %s to %s by socket %s %s',
+                             self, msg, z85_to_friendly(uid), socket.FD, socket.underlying)
             socket.send(msg, flags=zmq.NOBLOCK)
 
             if remote.isConnected or msg in self.healthMessages:
                 self.metrics.add_event(self.mt_outgoing_size, len(msg))
             else:
-                logger.warning('Remote {} is not connected - message will not be sent immediately.'
-                               'If this problem does not resolve itself - check your firewall settings'
-                               .format(z85_to_friendly(uid)))
+                logger.warning('Remote %s is not connected - message will not be sent immediately.'
+                               'If this problem does not resolve itself - check your firewall settings',
+                               z85_to_friendly(uid))
                 self._stashed_to_disconnected \
                     .setdefault(uid, deque(maxlen=self.config.ZMQ_STASH_TO_NOT_CONNECTED_QUEUE_SIZE)) \
                     .append(msg)
 
             return True, err_str
         except zmq.Again:
-            logger.warning('{} could not transmit message to {}'.format(self, z85_to_friendly(uid)))
+            logger.warning('%s could not transmit message to %s', self, z85_to_friendly(uid))
         except InvalidMessageExceedingSizeException as ex:
             err_str = '{}Cannot transmit message. Error {}'.format(CONNECTION_PREFIX, ex)
             logger.warning(err_str)
@@ -814,19 +931,13 @@ class ZStack(NetworkInterface):
 
     @staticmethod
     def serializeMsg(msg):
-        if isinstance(msg, Mapping):
-            msg = json.dumps(msg)
-        if isinstance(msg, str):
-            msg = msg.encode()
-        assert isinstance(msg, bytes)
-        return msg
+        return json_codec.encode(msg)
 
     @staticmethod
     def deserializeMsg(msg):
-        if isinstance(msg, bytes):
-            msg = msg.decode()
-        msg = json.loads(msg)
-        return msg
+        if MsgPackWireCodec.is_encoded(msg):
+            return msgpack_codec.decode(msg)
+        return json_codec.decode(msg)
 
     def signedMsg(self, msg: bytes, signer: Signer = None):
         sig = self.signer.signature(msg)
@@ -972,8 +1083,8 @@ class ZStack(NetworkInterface):
     def clearAllDir(self):
         shutil.rmtree(self.homeDir)
 
-    def prepare_to_send(self, msg: Any):
-        msg_bytes = self.serializeMsg(msg)
+    def prepare_to_send(self, msg: Any, codec: WireCodec = None):
+        msg_bytes = codec.encode(msg) if codec else self.serializeMsg(msg)
         self.msgLenVal.validate(msg_bytes)
         return msg_bytes
 